@@ -0,0 +1,40 @@
+"""outbox table for the change feed
+
+Creates change_events, appended to by every campaign/payout write in the
+same transaction and tailed by the /api/events server-sent events stream.
+
+Revision ID: 00647f94a41d
+Revises: 4a4188239999
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '00647f94a41d'
+down_revision: Union[str, None] = '4a4188239999'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'change_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('type', sa.String(length=32), nullable=False),
+        sa.Column('campaign_id', sa.Integer(), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sqlite_autoincrement=True,
+    )
+    op.create_index(op.f('ix_change_events_created_at'), 'change_events', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_change_events_created_at'), table_name='change_events')
+    op.drop_table('change_events')
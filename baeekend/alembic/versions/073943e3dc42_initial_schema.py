@@ -0,0 +1,71 @@
+"""initial schema
+
+Tables as previously created by Base.metadata.create_all. Existing
+databases that were bootstrapped that way can be marked as being at this
+revision with ``alembic stamp 073943e3dc42`` before upgrading.
+
+Revision ID: 073943e3dc42
+Revises: 
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from database.database import Country
+
+
+# revision identifiers, used by Alembic.
+revision: str = '073943e3dc42'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('hashed_password', sa.String(length=60), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_id', 'users', ['id'], unique=False)
+
+    op.create_table(
+        'campaigns',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('landing_url', sa.String(), nullable=False),
+        sa.Column('is_running', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('country', sa.Enum(Country), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_campaigns_id', 'campaigns', ['id'], unique=False)
+
+    op.create_table(
+        'payouts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('country', sa.Enum(Country), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('campaign_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_payouts_id', 'payouts', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_payouts_id', table_name='payouts')
+    op.drop_table('payouts')
+    op.drop_index('ix_campaigns_id', table_name='campaigns')
+    op.drop_table('campaigns')
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_table('users')
@@ -0,0 +1,78 @@
+"""AUTOINCREMENT ids for campaigns and payouts
+
+SQLite otherwise numbers new rows max(id) + 1, which hands the ids of
+archived (or deleted) rows at the top of the table out again; archived
+campaigns keep their ids and must be able to come back under them.
+Rebuilds both tables in batch mode, puts back the search triggers the
+rebuild drops, and starts each sequence past the archived ids.
+
+Postgres sequences never reuse ids, so there is nothing to do there.
+
+Revision ID: 1f5f4f59e8de
+Revises: b7e2d41c9a06
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1f5f4f59e8de'
+down_revision: Union[str, None] = 'b7e2d41c9a06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Dropped along with the old campaigns table by the rebuild
+SEARCH_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS campaigns_fts_ai AFTER INSERT ON campaigns BEGIN
+        INSERT INTO campaigns_fts(rowid, title, landing_url) VALUES (new.id, new.title, new.landing_url);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS campaigns_fts_ad AFTER DELETE ON campaigns BEGIN
+        INSERT INTO campaigns_fts(campaigns_fts, rowid, title, landing_url)
+        VALUES ('delete', old.id, old.title, old.landing_url);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS campaigns_fts_au AFTER UPDATE OF title, landing_url ON campaigns BEGIN
+        INSERT INTO campaigns_fts(campaigns_fts, rowid, title, landing_url)
+        VALUES ('delete', old.id, old.title, old.landing_url);
+        INSERT INTO campaigns_fts(rowid, title, landing_url) VALUES (new.id, new.title, new.landing_url);
+    END""",
+    "INSERT INTO campaigns_fts(campaigns_fts) VALUES ('rebuild')",
+]
+
+
+def _rebuild(autoincrement: bool) -> None:
+    for table in ('campaigns', 'payouts'):
+        with op.batch_alter_table(table, recreate='always', table_kwargs={'sqlite_autoincrement': autoincrement}):
+            pass
+    for statement in SEARCH_TRIGGERS:
+        op.execute(sa.text(statement))
+
+
+def _seed_sequence(table: str, archive: str) -> None:
+    """Start the table's sequence past the highest id sitting in its archive"""
+    op.execute(sa.text(
+        f"UPDATE sqlite_sequence SET seq = max(seq, (SELECT coalesce(max(id), 0) FROM {archive})) "
+        f"WHERE name = '{table}'"
+    ))
+    op.execute(sa.text(
+        f"INSERT INTO sqlite_sequence (name, seq) SELECT '{table}', max(id) FROM {archive} "
+        f"HAVING max(id) IS NOT NULL AND NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = '{table}')"
+    ))
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    _rebuild(autoincrement=True)
+    _seed_sequence('campaigns', 'archived_campaigns')
+    _seed_sequence('payouts', 'archived_payouts')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    _rebuild(autoincrement=False)
@@ -0,0 +1,51 @@
+"""per-country payout summary for the analytics endpoint
+
+Creates payout_country_stats and fills it from the existing payouts, plus
+the (country, amount) payouts index used to find a new min/max when the
+current one is removed. Equivalent to ``python manage.py rebuild-payout-stats``
+on an empty summary.
+
+Revision ID: 4a4188239999
+Revises: e9533ac894dd
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from database.database import Country
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a4188239999'
+down_revision: Union[str, None] = 'e9533ac894dd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'payout_country_stats',
+        sa.Column('country', sa.Enum(Country), nullable=False),
+        sa.Column('is_running', sa.Boolean(), nullable=False),
+        sa.Column('payout_count', sa.Integer(), nullable=False),
+        sa.Column('total_amount', sa.Float(), nullable=False),
+        sa.Column('min_amount', sa.Float(), nullable=True),
+        sa.Column('max_amount', sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint('country', 'is_running')
+    )
+    op.create_index('ix_payouts_country_amount', 'payouts', ['country', 'amount'], unique=False)
+    op.execute(
+        """INSERT INTO payout_country_stats
+            (country, is_running, payout_count, total_amount, min_amount, max_amount)
+        SELECT payouts.country, campaigns.is_running, COUNT(payouts.id), SUM(payouts.amount),
+            MIN(payouts.amount), MAX(payouts.amount)
+        FROM payouts JOIN campaigns ON campaigns.id = payouts.campaign_id
+        GROUP BY payouts.country, campaigns.is_running"""
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_payouts_country_amount', table_name='payouts')
+    op.drop_table('payout_country_stats')
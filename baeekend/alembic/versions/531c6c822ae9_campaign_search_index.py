@@ -0,0 +1,73 @@
+"""campaign title/landing_url search index
+
+SQLite: FTS5 trigram table over campaigns, kept in sync by triggers and
+built from the existing rows. Postgres: pg_trgm GIN indexes.
+
+Revision ID: 531c6c822ae9
+Revises: 628d67ca5675
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '531c6c822ae9'
+down_revision: Union[str, None] = '628d67ca5675'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_UPGRADE = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS campaigns_fts USING fts5(
+        title, landing_url, content='campaigns', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS campaigns_fts_ai AFTER INSERT ON campaigns BEGIN
+        INSERT INTO campaigns_fts(rowid, title, landing_url) VALUES (new.id, new.title, new.landing_url);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS campaigns_fts_ad AFTER DELETE ON campaigns BEGIN
+        INSERT INTO campaigns_fts(campaigns_fts, rowid, title, landing_url)
+        VALUES ('delete', old.id, old.title, old.landing_url);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS campaigns_fts_au AFTER UPDATE OF title, landing_url ON campaigns BEGIN
+        INSERT INTO campaigns_fts(campaigns_fts, rowid, title, landing_url)
+        VALUES ('delete', old.id, old.title, old.landing_url);
+        INSERT INTO campaigns_fts(rowid, title, landing_url) VALUES (new.id, new.title, new.landing_url);
+    END""",
+    "INSERT INTO campaigns_fts(campaigns_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS campaigns_fts_au",
+    "DROP TRIGGER IF EXISTS campaigns_fts_ad",
+    "DROP TRIGGER IF EXISTS campaigns_fts_ai",
+    "DROP TABLE IF EXISTS campaigns_fts",
+]
+
+POSTGRES_UPGRADE = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_campaigns_title_trgm ON campaigns USING gin (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_campaigns_landing_url_trgm ON campaigns USING gin (landing_url gin_trgm_ops)",
+]
+
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_campaigns_landing_url_trgm",
+    "DROP INDEX IF EXISTS ix_campaigns_title_trgm",
+]
+
+
+def _run(statements_by_dialect) -> None:
+    dialect = op.get_bind().dialect.name
+    for statement in statements_by_dialect.get(dialect, []):
+        op.execute(sa.text(statement))
+
+
+def upgrade() -> None:
+    _run({"sqlite": SQLITE_UPGRADE, "postgresql": POSTGRES_UPGRADE})
+
+
+def downgrade() -> None:
+    _run({"sqlite": SQLITE_DOWNGRADE, "postgresql": POSTGRES_DOWNGRADE})
@@ -0,0 +1,41 @@
+"""indexes for payout lookups and filtered campaign listings
+
+Adds the unique (campaign_id, country) index on payouts, which also serves
+every campaign_id lookup, plus the campaigns indexes used by keyset
+pagination and the is_running/country/owner filters.
+
+Creating the unique index fails if a campaign already has two payouts for
+the same country; resolve those rows before upgrading.
+
+Revision ID: 628d67ca5675
+Revises: 073943e3dc42
+Create Date: 2026-10-18 10:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '628d67ca5675'
+down_revision: Union[str, None] = '073943e3dc42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('uq_payouts_campaign_country', 'payouts', ['campaign_id', 'country'], unique=True)
+    op.create_index('ix_campaigns_created_at_id', 'campaigns', ['created_at', 'id'], unique=False)
+    op.create_index('ix_campaigns_is_running_id', 'campaigns', ['is_running', 'id'], unique=False)
+    op.create_index('ix_campaigns_country_id', 'campaigns', ['country', 'id'], unique=False)
+    op.create_index('ix_campaigns_owner_id', 'campaigns', ['owner_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_campaigns_owner_id', table_name='campaigns')
+    op.drop_index('ix_campaigns_country_id', table_name='campaigns')
+    op.drop_index('ix_campaigns_is_running_id', table_name='campaigns')
+    op.drop_index('ix_campaigns_created_at_id', table_name='campaigns')
+    op.drop_index('uq_payouts_campaign_country', table_name='payouts')
@@ -0,0 +1,58 @@
+"""archive tables for long-stopped campaigns
+
+Creates archived_campaigns and archived_payouts, which the archive job
+(service/archive.py) moves stopped campaigns into, and the
+(is_running, updated_at) campaigns index it finds them with.
+
+Revision ID: b7e2d41c9a06
+Revises: 00647f94a41d
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from database.database import Country
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d41c9a06'
+down_revision: Union[str, None] = '00647f94a41d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'archived_campaigns',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('landing_url', sa.String(), nullable=False),
+        sa.Column('is_running', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('country', sa.Enum(Country), nullable=False),
+        sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'archived_payouts',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('country', sa.Enum(Country), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('campaign_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['campaign_id'], ['archived_campaigns.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_archived_payouts_campaign_id'), 'archived_payouts', ['campaign_id'], unique=False)
+    op.create_index('ix_campaigns_is_running_updated_at', 'campaigns', ['is_running', 'updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_campaigns_is_running_updated_at', table_name='campaigns')
+    op.drop_index(op.f('ix_archived_payouts_campaign_id'), table_name='archived_payouts')
+    op.drop_table('archived_payouts')
+    op.drop_table('archived_campaigns')
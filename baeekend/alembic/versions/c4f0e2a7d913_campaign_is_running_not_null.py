@@ -0,0 +1,76 @@
+"""campaigns.is_running NOT NULL
+
+A NULL is_running matched neither state: bulk start/stop (is_running !=
+x) never touched those rows, while analytics and routing counted them as
+stopped. Backfills NULLs as stopped and makes the column NOT NULL, in the
+archive too, since restore copies rows back. On SQLite the batch rebuild
+drops the search triggers and the AUTOINCREMENT high-water mark, so both
+are put back.
+
+Revision ID: c4f0e2a7d913
+Revises: 1f5f4f59e8de
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f0e2a7d913'
+down_revision: Union[str, None] = '1f5f4f59e8de'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Dropped along with the old campaigns table by the rebuild
+SEARCH_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS campaigns_fts_ai AFTER INSERT ON campaigns BEGIN
+        INSERT INTO campaigns_fts(rowid, title, landing_url) VALUES (new.id, new.title, new.landing_url);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS campaigns_fts_ad AFTER DELETE ON campaigns BEGIN
+        INSERT INTO campaigns_fts(campaigns_fts, rowid, title, landing_url)
+        VALUES ('delete', old.id, old.title, old.landing_url);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS campaigns_fts_au AFTER UPDATE OF title, landing_url ON campaigns BEGIN
+        INSERT INTO campaigns_fts(campaigns_fts, rowid, title, landing_url)
+        VALUES ('delete', old.id, old.title, old.landing_url);
+        INSERT INTO campaigns_fts(rowid, title, landing_url) VALUES (new.id, new.title, new.landing_url);
+    END""",
+]
+
+
+def _set_nullable(nullable: bool) -> None:
+    sqlite = op.get_bind().dialect.name == 'sqlite'
+    sequence = None
+    if sqlite:
+        sequence = op.get_bind().scalar(sa.text("SELECT seq FROM sqlite_sequence WHERE name = 'campaigns'"))
+    with op.batch_alter_table('campaigns', table_kwargs={'sqlite_autoincrement': True}) as batch_op:
+        batch_op.alter_column('is_running', existing_type=sa.Boolean(), nullable=nullable)
+    with op.batch_alter_table('archived_campaigns') as batch_op:
+        batch_op.alter_column('is_running', existing_type=sa.Boolean(), nullable=nullable)
+    if not sqlite:
+        return
+    for statement in SEARCH_TRIGGERS:
+        op.execute(sa.text(statement))
+    if sequence is not None:
+        # The rebuilt table's sequence only reaches max(id), not ids deleted above it
+        op.execute(sa.text(
+            f"UPDATE sqlite_sequence SET seq = max(seq, {int(sequence)}) WHERE name = 'campaigns'"
+        ))
+        op.execute(sa.text(
+            f"INSERT INTO sqlite_sequence (name, seq) SELECT 'campaigns', {int(sequence)} "
+            "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'campaigns')"
+        ))
+
+
+def upgrade() -> None:
+    op.execute(sa.text("UPDATE campaigns SET is_running = false WHERE is_running IS NULL"))
+    op.execute(sa.text("UPDATE archived_campaigns SET is_running = false WHERE is_running IS NULL"))
+    _set_nullable(False)
+
+
+def downgrade() -> None:
+    _set_nullable(True)
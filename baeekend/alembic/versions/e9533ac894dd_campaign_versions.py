@@ -0,0 +1,39 @@
+"""campaign and collection versions for conditional GETs
+
+Adds campaigns.version and the collection_versions counter table, seeded
+with the 'campaigns' row, both bumped by every campaign/payout write.
+
+Revision ID: e9533ac894dd
+Revises: 531c6c822ae9
+Create Date: 2026-10-18 13:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9533ac894dd'
+down_revision: Union[str, None] = '531c6c822ae9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('campaigns') as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    collection_versions = op.create_table(
+        'collection_versions',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(collection_versions, [{'name': 'campaigns', 'version': 1}])
+
+
+def downgrade() -> None:
+    op.drop_table('collection_versions')
+    with op.batch_alter_table('campaigns') as batch_op:
+        batch_op.drop_column('version')
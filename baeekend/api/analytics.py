@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from database.database import Country
+from database.replica import get_read_db
+from schemas.analytics import CountryPayoutStats
+from service.analytics import payout_analytics
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+
+@router.get("/payouts", response_model=List[CountryPayoutStats])
+def get_payout_stats(country: Optional[Country] = None, db: Session = Depends(get_read_db)):
+    """
+    Payout count, min, max and average per country, split by running and
+    paused campaigns.
+
+    Served from the payout_country_stats summary, so the cost doesn't grow
+    with the number of payouts. Rebuild it with
+    `python manage.py rebuild-payout-stats` if it is ever suspected stale.
+    """
+    return payout_analytics.get_payout_stats(db, country)
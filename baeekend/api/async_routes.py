@@ -0,0 +1,228 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
+from database.async_database import get_async_db
+from database.database import Country
+from database.replica import get_async_read_db
+from schemas.schema import Campaign as CampaignSchema, CampaignPage, CampaignCreate, CampaignImportResult, CampaignStateChange, CampaignStateResult, NormalizedCampaignPage, NormalizedPayouts, OfferRouting, Payout as PayoutSchema, PayoutCreate, PayoutUpdate
+from service.async_service import async_campaign_service, async_payout_service
+from api import routes
+from api.etag import make_etag, not_modified
+from api.responses import fast_json_response
+
+# Async twin of api.routes, mounted instead of it when ASYNC_DB is enabled.
+# Handlers await an AsyncSession rather than holding a threadpool slot for
+# the length of their queries.
+router = APIRouter(prefix="/api/campaigns", tags=["campaigns"])
+
+@router.post("/", response_model=CampaignSchema)
+async def create_campaign(campaign: CampaignCreate, db: AsyncSession = Depends(get_async_db)):
+    """Create a new campaign with payouts"""
+    try:
+        return await async_campaign_service.create_campaign(db, campaign)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Bulk import and export stream through their own sync sessions either way
+router.add_api_route(
+    "/import", routes.import_campaigns, methods=["POST"], response_model=CampaignImportResult
+)
+
+@router.get("/", response_model=List[CampaignSchema])
+async def list_campaigns(
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    skip: int = 0,
+    limit: int = 100,
+    title: Optional[str] = None,
+    landing_url: Optional[str] = None,
+    is_running: Optional[bool] = None,
+    country: Optional[Country] = None,
+    include_archived: bool = False
+):
+    """List campaigns; `include_archived` appends archived ones after the rest"""
+    filters = {
+        "title": title,
+        "landing_url": landing_url,
+        "is_running": is_running,
+        "country": country
+    }
+    etag = make_etag(await async_campaign_service.get_collection_version(db), request)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    rows = await async_campaign_service.get_campaign_rows(db, skip, limit, filters, include_archived)
+    return fast_json_response(request, rows, etag)
+
+@router.get("/page", response_model=CampaignPage)
+async def list_campaigns_page(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    sort: Literal["id", "created_at"] = "id",
+    title: Optional[str] = None,
+    landing_url: Optional[str] = None,
+    is_running: Optional[bool] = None,
+    country: Optional[Country] = None
+):
+    """Cursor-paginated campaign listing (see the sync route for details)"""
+    filters = {
+        "title": title,
+        "landing_url": landing_url,
+        "is_running": is_running,
+        "country": country
+    }
+    etag = make_etag(await async_campaign_service.get_collection_version(db), request)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers["ETag"] = etag
+    try:
+        items, next_cursor = await async_campaign_service.get_campaigns_page(db, limit, cursor, sort, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
+
+router.add_api_route("/export", routes.export_campaigns, methods=["GET"])
+# Currency conversion is CPU work on numpy arrays; it stays on the threadpool
+router.add_api_route(
+    "/by-payout", routes.list_campaigns_by_payout, methods=["GET"], response_model=NormalizedCampaignPage
+)
+# Lookups are in-memory; only the periodic version check touches the database
+router.add_api_route("/routing/{country}", routes.route_offers, methods=["GET"], response_model=OfferRouting)
+
+@router.patch("/state", response_model=CampaignStateResult)
+async def set_campaigns_state(change: CampaignStateChange, db: AsyncSession = Depends(get_async_db)):
+    """Start or stop many campaigns at once (see the sync route for details)"""
+    filters = {"country": change.country, "title": change.title, "owner_id": change.owner_id}
+    try:
+        campaign_ids = await async_campaign_service.set_campaigns_state(db, change.is_running, change.ids, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"updated": len(campaign_ids)}
+
+# The archive job runs batch by batch on its own sync session
+router.add_api_route("/archive", routes.archive_campaigns, methods=["POST"], status_code=202)
+
+@router.post("/{campaign_id}/restore", response_model=CampaignSchema)
+async def restore_campaign(campaign_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Move an archived campaign and its payouts back into the live tables"""
+    try:
+        campaign = await async_campaign_service.restore_campaign(db, campaign_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if campaign is None:
+        raise HTTPException(status_code=404, detail="Archived campaign not found")
+    return campaign
+
+@router.delete("/{campaign_id}")
+async def delete_campaign(campaign_id: int, db: AsyncSession = Depends(get_async_db)):
+    try:
+        success = await async_campaign_service.delete_campaign(db, campaign_id)
+        if not success:
+            raise HTTPException(status_code=404, detail="Campaign not found")
+        return {"message": "Campaign deleted successfully"}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.patch("/{campaign_id}/toggle", response_model=CampaignSchema)
+async def toggle_campaign(campaign_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Toggle campaign active status"""
+    try:
+        return await async_campaign_service.toggle_campaign(db, campaign_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+router.add_api_route(
+    "/countries", routes.get_available_countries, methods=["GET"], response_model=List[str]
+)
+
+@router.get("/{campaign_id}/payouts", response_model=List[PayoutSchema])
+async def get_campaign_payouts(campaign_id: int, request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    version = await async_campaign_service.get_campaign_version(db, campaign_id)
+    etag = None
+    if version is not None:
+        etag = make_etag(version, request)
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+    return fast_json_response(request, await async_payout_service.get_campaign_payout_rows(db, campaign_id), etag)
+
+router.add_api_route(
+    "/{campaign_id}/payouts/normalized", routes.get_normalized_payouts, methods=["GET"],
+    response_model=NormalizedPayouts
+)
+
+@router.get("/{campaign_id}/payouts/country/{country}", response_model=PayoutSchema)
+async def get_country_payout(
+    campaign_id: int,
+    country: Country,
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        payout = await async_payout_service.get_country_payout(db, campaign_id, country)
+        if not payout:
+            raise HTTPException(status_code=404, detail="Payout not found for country")
+        return payout
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/{campaign_id}/payouts", response_model=PayoutSchema)
+async def add_campaign_payout(
+    campaign_id: int,
+    payout: PayoutCreate = Body(
+        ...,
+        example={
+            "country": "US",
+            "amount": 100.00
+        }
+    ),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Add a new payout to a campaign
+    """
+    return await async_payout_service.create_payout(db, campaign_id, payout)
+
+@router.put("/{campaign_id}/payouts", response_model=List[PayoutSchema])
+async def replace_campaign_payouts(
+    campaign_id: int,
+    payouts: List[PayoutCreate],
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Replace the full payout set of a campaign (see the sync route for details)"""
+    try:
+        result = await async_payout_service.replace_payouts(db, campaign_id, payouts)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return result
+
+router.add_api_route("/payouts/cache", routes.get_payout_cache_stats, methods=["GET"])
+
+@router.put("/payouts/{payout_id}", response_model=PayoutSchema)
+async def update_payout(
+    payout_id: int,
+    payout: PayoutUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        updated_payout = await async_payout_service.update_payout(db, payout_id, payout)
+        if not updated_payout:
+            raise HTTPException(status_code=404, detail="Payout not found")
+        return updated_payout
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.delete("/payouts/{payout_id}")
+async def delete_payout(payout_id: int, db: AsyncSession = Depends(get_async_db)):
+    try:
+        success = await async_payout_service.delete_payout(db, payout_id)
+        if not success:
+            raise HTTPException(status_code=404, detail="Payout not found")
+        return {"message": "Payout deleted successfully"}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,21 +1,61 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from auth.jwt_handler import get_current_user, token_cache, user_cache
+from auth.passwords import PasswordHasherBusy, password_hasher
 from database.database import get_db
 from service.auth import auth_service
-from schemas.auth import UserCreate, UserLogin, Token
+from schemas.auth import CurrentUser, UserCreate, UserLogin, Token
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+# Handlers are async so bcrypt runs in the password_hasher's process pool
+# and only the short DB calls take a threadpool slot.
+
+def _busy():
+    return HTTPException(
+        status_code=503,
+        detail="Authentication is busy, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
 @router.post("/register", response_model=Token)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = auth_service.create_user(db, user)
+async def register(user: UserCreate, db: Session = Depends(get_db)):
+    try:
+        hashed_password = await password_hasher.hash(user.password)
+    except PasswordHasherBusy:
+        raise _busy()
+    db_user = await run_in_threadpool(auth_service.create_user, db, user, hashed_password)
     access_token = auth_service.create_access_token({"sub": db_user.email})
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/token", response_model=Token)
-def login(user_data: UserLogin, db: Session = Depends(get_db)):
-    user = auth_service.authenticate_user(db, user_data.email, user_data.password)
+async def login(user_data: UserLogin, db: Session = Depends(get_db)):
+    user = await run_in_threadpool(auth_service.get_user_by_email, db, user_data.email)
     if not user:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
+    try:
+        valid, new_hash = await password_hasher.verify(user_data.password, user.hashed_password)
+    except PasswordHasherBusy:
+        raise _busy()
+    if not valid:
+        raise HTTPException(status_code=400, detail="Incorrect email or password")
+    if new_hash:
+        # Work factor changed since this hash was made
+        await run_in_threadpool(auth_service.update_password_hash, db, user, new_hash)
     access_token = auth_service.create_access_token({"sub": user.email})
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@router.get("/me", response_model=CurrentUser)
+def read_current_user(user: CurrentUser = Depends(get_current_user)):
+    return user
+
+@router.get("/cache")
+def get_auth_cache_stats():
+    """Hit/miss counters of the verified-token and user caches"""
+    return {"tokens": token_cache.stats(), "users": user_cache.stats()}
+
+@router.get("/hashing")
+def get_password_hashing_stats():
+    """Queue depth and throughput of the password hashing pool"""
+    return password_hasher.stats()
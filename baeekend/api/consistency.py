@@ -0,0 +1,35 @@
+from database.replica import READ_AFTER_COOKIE, READ_YOUR_WRITES_TTL
+from service.versions import committed_version
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pure ASGI middleware: when a request commits a write, its response sets
+    the read_after cookie to the collection version that write produced, so
+    the client's later reads (get_read_db) skip a replica that is behind it.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        written: dict = {}
+        token = committed_version.set(written)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and "version" in written:
+                cookie = (
+                    f"{READ_AFTER_COOKIE}={written['version']}; Max-Age={READ_YOUR_WRITES_TTL}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            committed_version.reset(token)
@@ -0,0 +1,37 @@
+import hashlib
+from typing import Optional
+from fastapi import Request, Response
+
+GZIP_SUFFIX = "-gzip"
+
+
+def make_etag(version: int, request: Request) -> str:
+    """
+    Strong ETag for a read: the resource version plus the normalized query,
+    so each filter/page combination validates on its own.
+    """
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    digest = hashlib.sha1(f"{request.url.path}?{query}#{version}".encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def gzip_etag(etag: str) -> str:
+    """The ETag of the gzipped body: a strong tag names one exact byte sequence"""
+    return f'{etag[:-1]}{GZIP_SUFFIX}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    A 304 response if the client's If-None-Match already has etag, in either
+    encoding, else None. Comparison is weak (RFC 9110), so a W/ tag from a
+    proxy that re-encoded the body still matches.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    for candidate in (etag, gzip_etag(etag), "*"):
+        if candidate in candidates:
+            matched = etag if candidate == "*" else candidate
+            return Response(status_code=304, headers={"ETag": matched, "Vary": "Accept-Encoding"})
+    return None
@@ -0,0 +1,61 @@
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from database.database import get_db
+from service.outbox import change_feed, outbox
+
+# Seconds without events before a comment line keeps proxies from timing out
+SSE_HEARTBEAT = float(os.getenv("SSE_HEARTBEAT", "15"))
+# Reconnect delay suggested to EventSource clients, in milliseconds
+SSE_RETRY_MS = 2000
+
+router = APIRouter(prefix="/api/events", tags=["events"])
+
+
+def format_event(row) -> bytes:
+    event_id, event_type, payload = row
+    return f"id: {event_id}\nevent: {event_type}\ndata: {payload}\n\n".encode()
+
+
+@router.get("")
+async def stream_events(
+    after: Optional[int] = Query(None, ge=0),
+    follow: bool = True,
+    last_event_id: Optional[str] = Header(None),
+):
+    """
+    Campaign and payout changes as server-sent events.
+
+    Each event's id is its offset in the outbox. A reconnecting EventSource
+    sends Last-Event-ID and resumes right after it; `after` does the same for
+    other clients, and without either the stream starts from now. A client
+    that asks for events already pruned gets a `reset` event with the current
+    offset and should reload its data. `follow=false` returns the backlog and
+    ends instead of staying open.
+    """
+    if last_event_id is not None:
+        try:
+            after = int(last_event_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+
+    async def stream():
+        yield f"retry: {SSE_RETRY_MS}\n\n".encode()
+        async for row in change_feed.events(after, follow=follow, heartbeat=SSE_HEARTBEAT):
+            yield b": keepalive\n\n" if row is None else format_event(row)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/offset")
+def get_offset(db: Session = Depends(get_db)):
+    """Current end of the change feed and the highest offset already pruned"""
+    return {"offset": outbox.latest_offset(db), "pruned_through": outbox.pruned_through(db)}
@@ -0,0 +1,94 @@
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+
+from database.database import engine
+
+logger = logging.getLogger(__name__)
+
+# Liveness and readiness probes. /healthz only says the process is serving;
+# /readyz also needs the database and every startup warm-up to be done, so a
+# new worker gets traffic once it can answer it quickly.
+router = APIRouter(tags=["health"])
+
+
+class StartupState:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = False
+        self.pending: Dict[str, threading.Thread] = {}
+        self.errors: Dict[str, str] = {}
+
+    def warm_up(self, name: str, fn: Callable[[], None]) -> None:
+        """Run fn on a background thread; /readyz waits for it to finish"""
+        def run():
+            try:
+                fn()
+            except Exception as e:
+                # Warm-ups only front-load work that would otherwise happen on
+                # first use, so a failure is reported but doesn't block readiness
+                logger.warning("Startup warm-up %s failed: %s", name, e)
+                with self._lock:
+                    self.errors[name] = str(e)
+            finally:
+                with self._lock:
+                    self.pending.pop(name, None)
+
+        thread = threading.Thread(target=run, name=f"warm-up-{name}", daemon=True)
+        with self._lock:
+            self.pending[name] = thread
+        thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        with self._lock:
+            threads = list(self.pending.values())
+        for thread in threads:
+            thread.join(timeout)
+        return not self.pending
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = False
+            self.pending.clear()
+            self.errors.clear()
+
+
+startup_state = StartupState()
+
+
+def database_ok() -> bool:
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception as e:
+        logger.warning("Readiness database check failed: %s", e)
+        return False
+
+
+@router.get("/healthz", include_in_schema=False)
+async def healthz():
+    return {"status": "ok"}
+
+
+@router.get("/readyz", include_in_schema=False)
+def readyz():
+    with startup_state._lock:
+        warming = sorted(startup_state.pending)
+        errors = dict(startup_state.errors)
+    checks = {
+        "started": startup_state.started,
+        "warm": not warming,
+        "database": database_ok(),
+    }
+    ready = all(checks.values())
+    body = {"status": "ready" if ready else "not ready", "checks": checks}
+    if warming:
+        body["warming"] = warming
+    if errors:
+        body["warm_up_errors"] = errors
+    return JSONResponse(body, status_code=200 if ready else 503)
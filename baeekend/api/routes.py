@@ -1,13 +1,25 @@
+import csv
+import io
 import json
+import logging
 import os
-from fastapi import APIRouter, Depends, HTTPException, Query, Body
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Body, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from database.database import get_db, Country, CountryData
+from typing import List, Literal, Optional
+from database.database import get_db, Country, CountryData, SessionLocal
+from database.replica import get_read_db, read_after, replica
 from models.models import Campaign as CampaignModel
-from schemas.schema import Campaign as CampaignSchema, CampaignCreate, Payout as PayoutSchema, PayoutCreate, PayoutUpdate
+from schemas.schema import Campaign as CampaignSchema, CampaignPage, CampaignCreate, CampaignImportError, CampaignImportResult, CampaignStateChange, CampaignStateResult, NormalizedCampaignPage, NormalizedPayouts, OfferRouting, Payout as PayoutSchema, PayoutCreate, PayoutUpdate
+from service.archive import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE, archive_service
+from service.cache import payout_cache
+from service.currency import currency_service
+from service.routing import offer_index
 from service.service import campaign_service, payout_service
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
+from api.etag import make_etag, not_modified
+from api.responses import fast_json_response
 
 class CampaignBase(BaseModel):
     country: Country  # Required
@@ -15,8 +27,13 @@ class CampaignBase(BaseModel):
 class PayoutBase(BaseModel):
     country: Country  # Required
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/campaigns", tags=["campaigns"])
 
+# Campaigns per INSERT batch / transaction in the NDJSON import
+IMPORT_BATCH_SIZE = 1000
+
 @router.post("/", response_model=CampaignSchema)
 def create_campaign(campaign: CampaignCreate, db: Session = Depends(get_db)):
     """
@@ -48,23 +65,297 @@ def create_campaign(campaign: CampaignCreate, db: Session = Depends(get_db)):
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+async def _iter_lines(request: Request):
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+def _format_validation_error(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}"
+        for err in e.errors()
+    )
+
+@router.post("/import", response_model=CampaignImportResult)
+async def import_campaigns(request: Request, db: Session = Depends(get_db)):
+    """
+    Bulk-create campaigns from an NDJSON body (one `CampaignCreate` object per line).
+
+    Lines are validated individually; invalid lines are reported in `errors`
+    with their 1-based line number and do not stop the rest of the import.
+    Valid campaigns are inserted in batches of IMPORT_BATCH_SIZE.
+    """
+    result = CampaignImportResult()
+    batch = []
+
+    async def flush_batch():
+        try:
+            await run_in_threadpool(
+                campaign_service.import_campaigns, db, [campaign for _, campaign in batch]
+            )
+            result.imported += len(batch)
+        except ValueError as e:
+            for line_number, _ in batch:
+                result.failed += 1
+                result.errors.append(CampaignImportError(line=line_number, error=str(e)))
+        batch.clear()
+
+    line_number = 0
+    async for line in _iter_lines(request):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            campaign = CampaignCreate.model_validate_json(line)
+            campaign_service.validate_campaign(campaign)
+        except ValidationError as e:
+            error = _format_validation_error(e)
+        except ValueError as e:
+            error = str(e)
+        else:
+            batch.append((line_number, campaign))
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await flush_batch()
+            continue
+        result.failed += 1
+        result.errors.append(CampaignImportError(line=line_number, error=error))
+
+    if batch:
+        await flush_batch()
+    return result
+
 @router.get("/", response_model=List[CampaignSchema])
 def list_campaigns(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
     title: Optional[str] = None,
     landing_url: Optional[str] = None,
     is_running: Optional[bool] = None,
-    country: Optional[Country] = None
+    country: Optional[Country] = None,
+    include_archived: bool = False
 ):
+    """List campaigns; `include_archived` appends archived ones after the rest"""
     filters = {
         "title": title, 
         "landing_url": landing_url, 
         "is_running": is_running,
         "country": country
     }
-    return campaign_service.get_campaigns(db, skip, limit, filters)
+    etag = make_etag(campaign_service.get_collection_version(db), request)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    # Rows go straight from SQL to orjson; response_model only documents the shape
+    rows = campaign_service.get_campaign_rows(db, skip, limit, filters, include_archived)
+    return fast_json_response(request, rows, etag)
+
+@router.get("/page", response_model=CampaignPage)
+def list_campaigns_page(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    sort: Literal["id", "created_at"] = "id",
+    title: Optional[str] = None,
+    landing_url: Optional[str] = None,
+    is_running: Optional[bool] = None,
+    country: Optional[Country] = None
+):
+    """
+    Cursor-paginated campaign listing.
+
+    Pass the returned `next_cursor` back as `cursor` to fetch the next page;
+    it is `null` on the last page. Filters and `sort` must stay the same
+    while following a cursor.
+
+    Responses carry an ETag; send it back as If-None-Match to get a 304
+    while no campaign or payout has been written since.
+    """
+    filters = {
+        "title": title,
+        "landing_url": landing_url,
+        "is_running": is_running,
+        "country": country
+    }
+    etag = make_etag(campaign_service.get_collection_version(db), request)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers["ETag"] = etag
+    try:
+        items, next_cursor = campaign_service.get_campaigns_page(db, limit, cursor, sort, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get("/by-payout", response_model=NormalizedCampaignPage)
+def list_campaigns_by_payout(
+    db: Session = Depends(get_read_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    min_payout: Optional[float] = None,
+    max_payout: Optional[float] = None,
+    is_running: Optional[bool] = None,
+    order: Literal["desc", "asc"] = "desc"
+):
+    """
+    Campaigns sorted by their best payout converted to the base currency.
+
+    `min_payout`/`max_payout` filter on that converted value. Campaigns whose
+    payout currencies all lack a rate are left out. The ordering comes from an
+    in-memory index that writes update in place, so paging through it is cheap.
+    The index follows the primary and is shared by every reader; campaigns the
+    replica doesn't have yet are left off the page.
+    """
+    return currency_service.get_campaigns_by_payout(
+        db, skip, limit, min_payout, max_payout, is_running, ascending=order == "asc"
+    )
+
+@router.get("/routing/{country}", response_model=OfferRouting)
+def route_offers(country: Country, limit: int = Query(10, ge=1, le=100), db: Session = Depends(get_db)):
+    """
+    The best-paying running campaigns for a visitor's country, best first.
+
+    Served from an in-memory index kept current by the write endpoints;
+    writes from other processes are picked up within ROUTING_SYNC_INTERVAL.
+    The index follows the primary's versions, so its checks read the primary.
+    """
+    return {"country": country, "offers": offer_index.top(db, country, limit)}
+
+EXPORT_CSV_HEADER = [
+    "campaign_id", "title", "landing_url", "is_running", "campaign_country",
+    "payout_id", "payout_country", "amount",
+]
+
+def _ndjson_chunk(rows, payouts) -> str:
+    lines = []
+    for row in rows:
+        lines.append(json.dumps({
+            "id": row.id,
+            "title": row.title,
+            "landing_url": row.landing_url,
+            "is_running": row.is_running,
+            "country": row.country.value,
+            "payouts": [
+                {"id": p.id, "campaign_id": p.campaign_id, "country": p.country.value, "amount": p.amount}
+                for p in payouts.get(row.id, ())
+            ],
+        }))
+    return "\n".join(lines) + "\n"
+
+def _csv_chunk(rows, payouts) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        campaign = [row.id, row.title, row.landing_url, row.is_running, row.country.value]
+        campaign_payouts = payouts.get(row.id)
+        if not campaign_payouts:
+            writer.writerow(campaign + ["", "", ""])
+        for p in campaign_payouts or ():
+            writer.writerow(campaign + [p.id, p.country.value, p.amount])
+    return buffer.getvalue()
+
+def _export_stream(export_format: str, filters: dict, min_version: Optional[int] = None):
+    # The export outlives the request's session, so it owns its own
+    db = replica.session(min_version)
+    try:
+        if export_format == "csv":
+            buffer = io.StringIO()
+            csv.writer(buffer).writerow(EXPORT_CSV_HEADER)
+            yield buffer.getvalue()
+        encode = _csv_chunk if export_format == "csv" else _ndjson_chunk
+        for rows, payouts in campaign_service.iter_campaign_batches(db, filters):
+            yield encode(rows, payouts)
+    finally:
+        db.close()
+
+@router.get("/export")
+def export_campaigns(
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    title: Optional[str] = None,
+    landing_url: Optional[str] = None,
+    is_running: Optional[bool] = None,
+    country: Optional[Country] = None
+):
+    """
+    Stream every matching campaign with its payouts.
+
+    `ndjson` emits one campaign object per line; `csv` emits one row per
+    payout (campaigns without payouts get a single row with empty payout
+    columns).
+    """
+    filters = {
+        "title": title,
+        "landing_url": landing_url,
+        "is_running": is_running,
+        "country": country
+    }
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _export_stream(format, filters, read_after(request)),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="campaigns.{format}"'},
+    )
+
+@router.patch("/state", response_model=CampaignStateResult)
+def set_campaigns_state(change: CampaignStateChange, db: Session = Depends(get_db)):
+    """
+    Start or stop many campaigns at once.
+
+    Selects by `ids` and/or the `country`, `title` and `owner_id` filters
+    (combined with AND; at least one is required) and returns how many
+    campaigns actually changed state.
+    """
+    filters = {"country": change.country, "title": change.title, "owner_id": change.owner_id}
+    try:
+        campaign_ids = campaign_service.set_campaigns_state(db, change.is_running, change.ids, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"updated": len(campaign_ids)}
+
+def _archive_job(days: int, batch_size: int):
+    db = SessionLocal()
+    try:
+        archived = archive_service.archive_stale(db, days, batch_size)
+        logger.info("Archived %d campaigns stopped for %d days", archived, days)
+    except ValueError:
+        logger.exception("Campaign archive run failed")
+    finally:
+        db.close()
+
+@router.post("/archive", status_code=202)
+def archive_campaigns(
+    background_tasks: BackgroundTasks,
+    days: int = Query(ARCHIVE_AFTER_DAYS, ge=0),
+    batch_size: int = Query(ARCHIVE_BATCH_SIZE, ge=1, le=10000),
+):
+    """
+    Start moving campaigns stopped for `days` to the archive, `batch_size`
+    per transaction, after the response is sent. Cron-friendly equivalent:
+    `python manage.py archive-campaigns`.
+    """
+    background_tasks.add_task(_archive_job, days, batch_size)
+    return {"scheduled": True, "days": days, "batch_size": batch_size}
+
+@router.post("/{campaign_id}/restore", response_model=CampaignSchema)
+def restore_campaign(campaign_id: int, db: Session = Depends(get_db)):
+    """Move an archived campaign and its payouts back into the live tables"""
+    try:
+        campaign = archive_service.restore(db, campaign_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if campaign is None:
+        raise HTTPException(status_code=404, detail="Archived campaign not found")
+    return campaign
 
 @router.delete("/{campaign_id}")
 def delete_campaign(campaign_id: int, db: Session = Depends(get_db)):
@@ -90,9 +381,26 @@ def get_available_countries():
     return [country.value for country in Country]
 
 @router.get("/{campaign_id}/payouts", response_model=List[PayoutSchema])
-def get_campaign_payouts(campaign_id: int, db: Session = Depends(get_db)):
-    return payout_service.get_campaign_payouts(db, campaign_id)
+def get_campaign_payouts(campaign_id: int, request: Request, db: Session = Depends(get_read_db)):
+    version = campaign_service.get_campaign_version(db, campaign_id)
+    etag = None
+    if version is not None:
+        etag = make_etag(version, request)
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+    return fast_json_response(request, payout_service.get_campaign_payout_rows(db, campaign_id), etag)
+
+@router.get("/{campaign_id}/payouts/normalized", response_model=NormalizedPayouts)
+def get_normalized_payouts(campaign_id: int, db: Session = Depends(get_read_db)):
+    """A campaign's payouts with each amount also converted to the base currency"""
+    result = currency_service.get_normalized_payouts(db, campaign_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return result
 
+# Stays on the primary: a miss read from a lagging replica would refill
+# payout_cache with a value the write path has just invalidated
 @router.get("/{campaign_id}/payouts/country/{country}", response_model=PayoutSchema)
 def get_country_payout(
     campaign_id: int, 
@@ -124,6 +432,37 @@ def add_campaign_payout(
     """
     return payout_service.create_payout(db, campaign_id, payout)
 
+@router.put("/{campaign_id}/payouts", response_model=List[PayoutSchema])
+def replace_campaign_payouts(
+    campaign_id: int,
+    payouts: List[PayoutCreate] = Body(
+        ...,
+        example=[
+            {"country": "USA", "amount": 100.00},
+            {"country": "GBR", "amount": 80.00}
+        ]
+    ),
+    db: Session = Depends(get_db)
+):
+    """
+    Replace the full payout set of a campaign.
+
+    Countries missing from the body are deleted, new ones inserted and only
+    payouts whose amount changed are updated; unchanged rows keep their ids.
+    """
+    try:
+        result = payout_service.replace_payouts(db, campaign_id, payouts)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return result
+
+@router.get("/payouts/cache")
+def get_payout_cache_stats():
+    """Hit/miss counters of the in-process country payout cache"""
+    return payout_cache.stats()
+
 @router.put("/payouts/{payout_id}", response_model=PayoutSchema)
 def update_payout(
     payout_id: int, 
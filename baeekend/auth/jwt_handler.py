@@ -1,14 +1,32 @@
+import hashlib
+import os
+import time
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from fastapi import HTTPException, Security, Depends
+from fastapi import HTTPException, Depends
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
+from database.database import get_db
+from models.models import User
+from schemas.auth import CurrentUser
+from service.cache import MISSING, TTLCache
 
-SECRET_KEY = "your-secret-key"  # Change in production
+# The one place tokens are issued and verified
+SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key")  # Change in production
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+# How long a user looked up from a token's 'sub' is trusted without the DB
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+_cache_enabled = os.getenv("AUTH_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
+
+# Verified token payloads keyed by the token's SHA-256 digest, kept until the
+# token's own 'exp', so a repeat request skips the signature check
+token_cache = TTLCache(maxsize=int(os.getenv("TOKEN_CACHE_SIZE", "10000")), enabled=_cache_enabled)
+# CurrentUser snapshots keyed by email ('sub'); invalidated on user writes
+user_cache = TTLCache(maxsize=int(os.getenv("USER_CACHE_SIZE", "10000")), enabled=_cache_enabled)
 
 def create_access_token(data: dict):
     to_encode = data.copy()
@@ -16,9 +34,37 @@ def create_access_token(data: dict):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+def decode_token(token: str) -> dict:
+    """Verify a token, using the cache of already-verified tokens"""
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = token_cache.get(key)
+    if payload is not MISSING:
+        return payload
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    if "exp" in payload:
+        token_cache.set(key, payload, float(payload["exp"]))
+    return payload
+
 def verify_token(token: str = Depends(oauth2_scheme)):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        return decode_token(token)
     except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
\ No newline at end of file
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+def invalidate_user(email: str) -> None:
+    user_cache.invalidate(email)
+
+def get_current_user(payload: dict = Depends(verify_token), db: Session = Depends(get_db)) -> CurrentUser:
+    email = payload.get("sub")
+    if not email:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    user = user_cache.get(email)
+    if user is MISSING:
+        db_user = db.query(User).filter(User.email == email).first()
+        user = CurrentUser.model_validate(db_user) if db_user else None
+        user_cache.set(email, user, time.time() + USER_CACHE_TTL)
+    if user is None:
+        raise HTTPException(status_code=401, detail="User not found")
+    return user
@@ -0,0 +1,86 @@
+"""
+Hot-table queries before and after archiving long-stopped campaigns.
+
+Seeds campaigns of which only --running-ratio are running, ages every
+stopped one past the archive cutoff, then times a few listings whose cost
+grows with the rows they have to skip (running campaigns of one country,
+a title search), runs the archive job, and times them again.
+
+Run from the baeekend directory:
+    python -m benchmarks.bench_archive --campaigns 200000 --running-ratio 0.05
+"""
+import argparse
+from datetime import datetime, timedelta
+
+from benchmarks.common import Timer, use_temp_database
+from benchmarks.seed import seed_database
+
+use_temp_database()
+
+from sqlalchemy import func, select, update  # noqa: E402
+
+from database.database import Country, SessionLocal  # noqa: E402
+from models.models import Campaign  # noqa: E402
+from service.archive import ARCHIVE_BATCH_SIZE, archive_service  # noqa: E402
+from service.service import campaign_service  # noqa: E402
+
+QUERIES = {
+    "running in one country": {"country": Country.USA, "is_running": True},
+    "running, title search": {"title": "Campaign 1", "is_running": True},
+}
+
+
+def best_of(repeat, fn):
+    best = None
+    for _ in range(repeat):
+        with Timer() as t:
+            fn()
+        best = t.elapsed if best is None else min(best, t.elapsed)
+    return best * 1e3
+
+
+def time_queries(db, repeat):
+    return {
+        name: best_of(repeat, lambda: campaign_service.get_campaign_rows(db, 0, 100, filters))
+        for name, filters in QUERIES.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot queries before/after archiving")
+    parser.add_argument("--campaigns", type=int, default=200000)
+    parser.add_argument("--max-payouts", type=int, default=10)
+    parser.add_argument("--running-ratio", type=float, default=0.05)
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    campaigns, payouts = seed_database(args.campaigns, args.max_payouts, running_ratio=args.running_ratio)
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(Campaign)
+            .where(Campaign.is_running.is_(False))
+            .values(updated_at=datetime.utcnow() - timedelta(days=365))
+        )
+        db.commit()
+        print(f"{campaigns} campaigns, {payouts} payouts, {args.running_ratio:.0%} running")
+
+        before = time_queries(db, args.repeat)
+        with Timer() as t:
+            archived = archive_service.archive_stale(db, days=30, batch_size=args.batch_size)
+        hot = db.scalar(select(func.count(Campaign.id)))
+        print(
+            f"archived {archived} campaigns in {t.elapsed:.1f} s "
+            f"({archived / t.elapsed:,.0f}/s, batches of {args.batch_size}); {hot} left hot"
+        )
+        after = time_queries(db, args.repeat)
+    finally:
+        db.close()
+
+    for name in QUERIES:
+        print(f"{name:>24}: {before[name]:8.2f} ms -> {after[name]:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Sustained throughput of the sync and async (ASYNC_DB=1) route stacks.
+
+Starts uvicorn once per mode against the same seeded SQLite file and drives
+it with a fixed number of concurrent httpx clients, reporting requests/s and
+p50/p99 latency.
+
+Run from the baeekend directory:
+    python -m benchmarks.bench_async_load [concurrency] [seconds]
+"""
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+from benchmarks.common import Timer, reset_schema, summarize, use_temp_database
+
+DATABASE_URL = use_temp_database()
+
+import httpx  # noqa: E402
+
+from database.database import SessionLocal  # noqa: E402
+from schemas.schema import CampaignCreate  # noqa: E402
+from service.service import campaign_service  # noqa: E402
+
+CAMPAIGNS = 5000
+CODES = ("USA", "GBR", "DEU", "FRA", "ESP")
+BAEEKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def seed():
+    reset_schema()
+    db = SessionLocal()
+    try:
+        campaign_service.import_campaigns(db, [
+            CampaignCreate(
+                title=f"Campaign {i}",
+                landing_url=f"https://example.com/{i}",
+                is_running=i % 2 == 0,
+                country="USA",
+                payouts=[{"country": code, "amount": 1.0 + j} for j, code in enumerate(CODES)],
+            )
+            for i in range(CAMPAIGNS)
+        ])
+    finally:
+        db.close()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(async_db, port):
+    env = dict(os.environ, DATABASE_URL=DATABASE_URL, ASYNC_DB="1" if async_db else "0",
+               PAYOUT_CACHE_ENABLED="0")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "critical"],
+        cwd=BAEEKEND_DIR, env=env, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/").raise_for_status()
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("server did not start")
+
+
+def random_path():
+    if random.random() < 0.5:
+        return f"/api/campaigns/?limit=20&skip={random.randint(0, CAMPAIGNS - 20)}"
+    return f"/api/campaigns/{random.randint(1, CAMPAIGNS)}/payouts/country/{random.choice(CODES)}"
+
+
+async def drive(port, concurrency, seconds):
+    samples = []
+    errors = 0
+    deadline = time.monotonic() + seconds
+
+    async def worker(client):
+        nonlocal errors
+        while time.monotonic() < deadline:
+            with Timer() as t:
+                response = await client.get(random_path())
+            if response.is_success:
+                samples.append(t.elapsed)
+            else:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+        with Timer() as total:
+            await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return len(samples) / total.elapsed, summarize(samples), errors
+
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    seed()
+    for async_db in (False, True):
+        port = free_port()
+        process = start_server(async_db, port)
+        try:
+            rps, latency, errors = asyncio.run(drive(port, concurrency, seconds))
+        finally:
+            process.terminate()
+            process.wait()
+        label = "async" if async_db else "sync "
+        print(
+            f"{label}: {rps:8.1f} req/s, p50 {latency['p50_ms']:.1f} ms, "
+            f"p99 {latency['p99_ms']:.1f} ms, {errors} errors ({concurrency} concurrent clients)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Per-request authentication overhead (token verification + user lookup) with
+the verified-token and user caches on and off.
+
+Run from the baeekend directory:
+    python -m benchmarks.bench_auth_overhead [requests]
+"""
+import sys
+
+from benchmarks.common import Timer, reset_schema, summarize, use_temp_database
+
+use_temp_database()
+
+from auth.jwt_handler import create_access_token, get_current_user, token_cache, user_cache, verify_token  # noqa: E402
+from auth.passwords import hash_password  # noqa: E402
+from database.database import SessionLocal  # noqa: E402
+from models.models import User  # noqa: E402
+
+EMAIL = "bench@example.com"
+
+
+def authenticate(token, db):
+    return get_current_user(verify_token(token), db)
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    reset_schema()
+    db = SessionLocal()
+    db.add(User(email=EMAIL, hashed_password=hash_password("x", 4)))
+    db.commit()
+    token = create_access_token({"sub": EMAIL})
+
+    try:
+        for enabled in (False, True):
+            for cache in (token_cache, user_cache):
+                cache.clear()
+                cache.enabled = enabled
+            samples = []
+            for _ in range(requests):
+                with Timer() as t:
+                    authenticate(token, db)
+                samples.append(t.elapsed)
+            result = summarize(samples)
+            label = "caches on " if enabled else "caches off"
+            print(f"{label}: mean {result['mean_ms'] * 1e3:7.1f} us, p99 {result['p99_ms'] * 1e3:7.1f} us per request")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Campaign creation throughput: one POST /api/campaigns per campaign versus a
+single NDJSON POST /api/campaigns/import.
+
+Run from the baeekend directory:
+    python -m benchmarks.bench_bulk_import [campaigns] [payouts_per_campaign]
+"""
+import json
+import sys
+
+from benchmarks.common import Timer, reset_schema, use_temp_database
+
+use_temp_database()
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from database.database import COUNTRY_CODES  # noqa: E402
+from main import app  # noqa: E402
+
+CODES = sorted(COUNTRY_CODES)
+
+
+def make_campaign(i, payouts_per_campaign):
+    return {
+        "title": f"Campaign {i}",
+        "landing_url": f"https://example.com/{i}",
+        "country": CODES[i % len(CODES)],
+        "payouts": [
+            {"country": CODES[(i + j) % len(CODES)], "amount": 1.0 + j}
+            for j in range(payouts_per_campaign)
+        ],
+    }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    payouts_per_campaign = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    campaigns = [make_campaign(i, payouts_per_campaign) for i in range(count)]
+    client = TestClient(app)
+
+    reset_schema()
+    with Timer() as single:
+        for campaign in campaigns:
+            client.post("/api/campaigns/", json=campaign).raise_for_status()
+
+    reset_schema()
+    body = "\n".join(json.dumps(campaign) for campaign in campaigns)
+    with Timer() as bulk:
+        response = client.post("/api/campaigns/import", content=body)
+    response.raise_for_status()
+    assert response.json()["imported"] == count
+
+    print(f"campaigns: {count} x {payouts_per_campaign} payouts")
+    print(f"POST /api/campaigns:        {count / single.elapsed:10.0f} campaigns/s")
+    print(f"POST /api/campaigns/import: {count / bulk.elapsed:10.0f} campaigns/s")
+    print(f"speedup: {single.elapsed / bulk.elapsed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Cold start: time from spawning a uvicorn worker to its first successful
+request, and to /readyz reporting ready.
+
+The database is migrated once up front, the way a deploy step would, so
+each spawn measures only what a new worker does before it can serve.
+
+Run from the baeekend directory:
+    python -m benchmarks.bench_cold_start --runs 5 --campaigns 10000
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from benchmarks.common import use_temp_database
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+POLL_INTERVAL = 0.05
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def status(url):
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return None
+
+
+def cold_start(timeout):
+    """(seconds to first 200 from the campaign list, seconds to /readyz 200)"""
+    port = free_port()
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BASE_DIR,
+    )
+    first_request = ready = None
+    try:
+        while time.perf_counter() - started < timeout:
+            if first_request is None and status(f"{base}/api/campaigns/?limit=1") == 200:
+                first_request = time.perf_counter() - started
+            if first_request is not None and status(f"{base}/readyz") == 200:
+                ready = time.perf_counter() - started
+                break
+            time.sleep(POLL_INTERVAL)
+    finally:
+        process.terminate()
+        process.wait(10)
+    if ready is None:
+        raise RuntimeError(f"worker not ready within {timeout}s")
+    return first_request, ready
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker cold-start time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--campaigns", type=int, default=0, help="seed this many campaigns first")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    url = use_temp_database()
+    subprocess.run([sys.executable, "manage.py", "migrate"], cwd=BASE_DIR, check=True)
+    if args.campaigns:
+        from benchmarks.seed import seed_database
+        seed_database(args.campaigns, reset=False)
+    print(f"{url}: {args.campaigns} campaigns, {args.runs} runs")
+
+    results = [cold_start(args.timeout) for _ in range(args.runs)]
+    first = [r[0] * 1e3 for r in results]
+    ready = [r[1] * 1e3 for r in results]
+    print(f"spawn -> first request  median {statistics.median(first):8.1f} ms  max {max(first):8.1f} ms")
+    print(f"spawn -> ready          median {statistics.median(ready):8.1f} ms  max {max(ready):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Per-payout country validation cost.
+
+Compares the registry lookup used by the schemas against the linear scan over
+COUNTRIES_DATA that the old Country._missing_/get_country_details did.
+
+Run from the baeekend directory:
+    python -m benchmarks.bench_country_validation
+"""
+import timeit
+
+from database.database import COUNTRIES_DATA, COUNTRY_CODES, Country, get_country_details
+from schemas.schema import CampaignCreate
+
+CODES = sorted(COUNTRY_CODES)
+ROUNDS = 200
+
+
+def legacy_lookup(code):
+    for country in COUNTRIES_DATA:
+        if country['COUNTRY_CODE'] == code:
+            return country
+    raise ValueError(f"{code} is not a valid Country code")
+
+
+def registry_lookup(code):
+    if code not in COUNTRY_CODES:
+        raise ValueError(f"{code} is not a valid Country code")
+    return Country(code), get_country_details(code)
+
+
+def campaign_payload():
+    return {
+        "title": "Benchmark",
+        "landing_url": "https://example.com",
+        "country": "USA",
+        "payouts": [{"country": code, "amount": 1.0} for code in CODES],
+    }
+
+
+def per_payout_us(fn):
+    seconds = timeit.timeit(lambda: [fn(code) for code in CODES], number=ROUNDS)
+    return seconds / (ROUNDS * len(CODES)) * 1e6
+
+
+def main():
+    payload = campaign_payload()
+    full = timeit.timeit(lambda: CampaignCreate(**payload), number=ROUNDS)
+
+    print(f"countries: {len(CODES)}")
+    print(f"legacy linear scan:    {per_payout_us(legacy_lookup):8.3f} us/payout")
+    print(f"registry lookup:       {per_payout_us(registry_lookup):8.3f} us/payout")
+    print(f"CampaignCreate ({len(CODES)} payouts): {full / ROUNDS * 1e3:8.3f} ms/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Export memory and time-to-first-byte at different table sizes.
+
+Consumes the export stream chunk by chunk (the way the ASGI server does) and
+reports the first-chunk latency, total time and tracemalloc peak.
+
+Run from the baeekend directory:
+    python -m benchmarks.bench_export [size ...]
+"""
+import sys
+import tracemalloc
+
+from benchmarks.common import Timer, reset_schema, use_temp_database
+
+use_temp_database()
+
+from api.routes import _export_stream  # noqa: E402
+from database.database import SessionLocal  # noqa: E402
+from schemas.schema import CampaignCreate  # noqa: E402
+from service.service import campaign_service  # noqa: E402
+
+PAYOUTS_PER_CAMPAIGN = 3
+SEED_BATCH = 5000
+
+
+def seed(count):
+    reset_schema()
+    db = SessionLocal()
+    try:
+        for start in range(0, count, SEED_BATCH):
+            batch = [
+                CampaignCreate(
+                    title=f"Campaign {i}",
+                    landing_url=f"https://example.com/{i}",
+                    country="USA",
+                    payouts=[
+                        {"country": code, "amount": 1.0}
+                        for code in ("USA", "GBR", "DEU")[:PAYOUTS_PER_CAMPAIGN]
+                    ],
+                )
+                for i in range(start, min(start + SEED_BATCH, count))
+            ]
+            campaign_service.import_campaigns(db, batch)
+    finally:
+        db.close()
+
+
+def consume(stream):
+    total_bytes = 0
+    with Timer() as first:
+        total_bytes += len(next(stream))
+    with Timer() as rest:
+        for chunk in stream:
+            total_bytes += len(chunk)
+    return first.elapsed, first.elapsed + rest.elapsed, total_bytes
+
+
+def measure(export_format):
+    # Timed and memory-traced passes are separate; tracemalloc skews timings
+    ttfb, total, total_bytes = consume(_export_stream(export_format, {}))
+    tracemalloc.start()
+    consume(_export_stream(export_format, {}))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return ttfb, total, peak, total_bytes
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    for size in sizes:
+        seed(size)
+        for export_format in ("ndjson", "csv"):
+            ttfb, total, peak, total_bytes = measure(export_format)
+            print(
+                f"{size:>9} campaigns {export_format:>6}: first chunk {ttfb * 1e3:7.1f} ms, "
+                f"total {total:6.2f} s, {total_bytes / 1e6:7.1f} MB out, "
+                f"peak traced memory {peak / 1e6:6.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
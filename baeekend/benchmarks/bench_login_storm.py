@@ -0,0 +1,93 @@
+"""
+Campaign-read latency during a login storm, with bcrypt hashed inline on the
+shared threadpool (PASSWORD_HASH_WORKERS=0) versus the dedicated process pool.
+
+Run from the baeekend directory:
+    python -m benchmarks.bench_login_storm [login_clients] [seconds]
+"""
+import asyncio
+import os
+import sys
+import time
+
+from benchmarks.bench_async_load import free_port, seed
+from benchmarks.common import Timer, summarize, use_temp_database
+
+DATABASE_URL = use_temp_database()
+
+import httpx  # noqa: E402
+import subprocess  # noqa: E402
+
+BAEEKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+USERS = 20
+PASSWORD = "storm-password"
+
+
+def start_server(port, workers):
+    env = dict(os.environ, DATABASE_URL=DATABASE_URL, PASSWORD_HASH_WORKERS=str(workers))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "critical"],
+        cwd=BAEEKEND_DIR, env=env, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/").raise_for_status()
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("server did not start")
+
+
+async def run(port, login_clients, seconds):
+    base_url = f"http://127.0.0.1:{port}"
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        for i in range(USERS):
+            await client.post("/auth/register", json={"email": f"u{i}-{port}@example.com", "password": PASSWORD})
+
+        async def probe(samples, until):
+            while time.monotonic() < until:
+                with Timer() as t:
+                    (await client.get("/api/campaigns/?limit=20")).raise_for_status()
+                samples.append(t.elapsed)
+                await asyncio.sleep(0.01)
+
+        async def login(worker, until, counts):
+            while time.monotonic() < until:
+                email = f"u{worker % USERS}-{port}@example.com"
+                response = await client.post("/auth/token", json={"email": email, "password": PASSWORD})
+                counts[response.status_code] = counts.get(response.status_code, 0) + 1
+
+        quiet = []
+        await probe(quiet, time.monotonic() + 2)
+
+        storm, counts = [], {}
+        until = time.monotonic() + seconds
+        await asyncio.gather(probe(storm, until), *(login(i, until, counts) for i in range(login_clients)))
+        stats = (await client.get("/auth/hashing")).json()
+    return summarize(quiet), summarize(storm), counts, stats
+
+
+def main():
+    login_clients = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    seed()
+    for workers in (0, min(4, os.cpu_count() or 1)):
+        port = free_port()
+        process = start_server(port, workers)
+        try:
+            quiet, storm, counts, stats = asyncio.run(run(port, login_clients, seconds))
+        finally:
+            process.terminate()
+            process.wait()
+        label = "inline (threadpool)" if workers == 0 else f"process pool x{workers}"
+        print(
+            f"{label:>20}: campaign reads p50/p99 quiet {quiet['p50_ms']:.1f}/{quiet['p99_ms']:.1f} ms, "
+            f"during storm {storm['p50_ms']:.1f}/{storm['p99_ms']:.1f} ms; logins {counts}; "
+            f"max queue {stats['max_pending_seen']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
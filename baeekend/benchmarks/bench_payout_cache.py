@@ -0,0 +1,92 @@
+"""
+GET /api/campaigns/{id}/payouts/country/{country} latency with the payout
+cache enabled and disabled.
+
+Run from the baeekend directory:
+    python -m benchmarks.bench_payout_cache [campaigns] [requests]
+"""
+import random
+import sys
+
+from benchmarks.common import Timer, reset_schema, summarize, use_temp_database
+
+use_temp_database()
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from database.database import COUNTRY_CODES, SessionLocal  # noqa: E402
+from main import app  # noqa: E402
+from schemas.schema import CampaignCreate  # noqa: E402
+from service.cache import payout_cache  # noqa: E402
+from service.service import campaign_service, payout_service  # noqa: E402
+
+CODES = sorted(COUNTRY_CODES)[:20]
+HOT_KEYS = 200
+
+
+def seed(count):
+    reset_schema()
+    db = SessionLocal()
+    try:
+        campaign_service.import_campaigns(db, [
+            CampaignCreate(
+                title=f"Campaign {i}",
+                landing_url=f"https://example.com/{i}",
+                country=CODES[0],
+                payouts=[{"country": code, "amount": 1.0 + j} for j, code in enumerate(CODES)],
+            )
+            for i in range(count)
+        ])
+    finally:
+        db.close()
+
+
+def run_http(client, keys, requests):
+    samples = []
+    for _ in range(requests):
+        campaign_id, country = random.choice(keys)
+        with Timer() as t:
+            response = client.get(f"/api/campaigns/{campaign_id}/payouts/country/{country}")
+        response.raise_for_status()
+        samples.append(t.elapsed)
+    return summarize(samples)
+
+
+def run_service(keys, requests):
+    samples = []
+    db = SessionLocal()
+    try:
+        for _ in range(requests):
+            campaign_id, country = random.choice(keys)
+            with Timer() as t:
+                payout_service.get_country_payout(db, campaign_id, country)
+            samples.append(t.elapsed)
+    finally:
+        db.close()
+    return summarize(samples)
+
+
+def main():
+    campaigns = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    seed(campaigns)
+    client = TestClient(app)
+    random.seed(0)
+    keys = [(random.randint(1, campaigns), random.choice(CODES)) for _ in range(HOT_KEYS)]
+
+    for name, run in (("service", lambda: run_service(keys, requests)),
+                      ("http", lambda: run_http(client, keys, requests))):
+        for enabled in (False, True):
+            payout_cache.clear()
+            payout_cache.enabled = enabled
+            result = run()
+            label = "cache on " if enabled else "cache off"
+            print(
+                f"{name:>7} {label}: p50 {result['p50_ms']:.3f} ms, p99 {result['p99_ms']:.3f} ms "
+                f"({result['count']} lookups, {HOT_KEYS} hot keys)"
+            )
+    print(payout_cache.stats())
+
+
+if __name__ == "__main__":
+    main()
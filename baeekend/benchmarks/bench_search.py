@@ -0,0 +1,66 @@
+"""
+Title search latency as the campaigns table grows: FTS5 trigram index versus
+the plain ILIKE '%term%' scan it replaces.
+
+Run from the baeekend directory:
+    python -m benchmarks.bench_search [size ...]
+"""
+import random
+import sys
+
+from benchmarks.common import Timer, reset_schema, summarize, use_temp_database
+
+use_temp_database()
+
+from database.database import SessionLocal, engine  # noqa: E402
+from models.models import Campaign  # noqa: E402
+from service.search import apply_search  # noqa: E402
+
+WORDS = ["summer", "winter", "sale", "shoes", "boots", "promo", "black", "friday", "deal", "mega"]
+RARE = "zephyrine"
+QUERIES = 50
+
+
+def seed(size):
+    reset_schema()
+    random.seed(size)
+    rows = []
+    for i in range(size):
+        words = random.sample(WORDS, 3)
+        if i % 10_000 == 0:
+            words.append(RARE)
+        rows.append({"title": " ".join(words) + f" {i}", "landing_url": f"https://example.com/{i}",
+                     "is_running": True, "country": "USA"})
+    with engine.begin() as connection:
+        for start in range(0, size, 50_000):
+            connection.execute(Campaign.__table__.insert(), rows[start:start + 50_000])
+
+
+def measure(dialect):
+    db = SessionLocal()
+    samples = []
+    try:
+        for _ in range(QUERIES):
+            query = apply_search(db.query(Campaign.id), {"title": RARE}, ranked=True, dialect=dialect)
+            with Timer() as t:
+                query.limit(100).all()
+            samples.append(t.elapsed)
+    finally:
+        db.close()
+    return summarize(samples)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 500_000]
+    for size in sizes:
+        seed(size)
+        fts = measure("sqlite")
+        scan = measure("generic")
+        print(
+            f"{size:>9} campaigns: fts p50 {fts['p50_ms']:7.2f} ms p99 {fts['p99_ms']:7.2f} ms | "
+            f"ilike p50 {scan['p50_ms']:7.2f} ms p99 {scan['p99_ms']:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Serialization cost of a campaign list page, per 1,000 campaigns.
+
+Compares the response_model path (ORM objects with selectinload, validated
+from attributes, dumped to JSON by the stdlib) with the fast path used by
+GET /api/campaigns/ (Core rows as dicts, orjson, optional gzip). Fetch and
+encode are timed separately.
+
+Run from the baeekend directory:
+    python -m benchmarks.bench_serialization --campaigns 5000 --min-payouts 100 --max-payouts 200
+"""
+import argparse
+import gzip
+import json
+from typing import List
+
+from benchmarks.common import Timer, use_temp_database
+from benchmarks.seed import seed_database
+
+use_temp_database()
+
+import orjson  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from api.responses import GZIP_LEVEL  # noqa: E402
+from database.database import SessionLocal  # noqa: E402
+from schemas.schema import Campaign as CampaignSchema  # noqa: E402
+from service.service import campaign_service  # noqa: E402
+
+PAGE = 1000
+
+
+def best_of(repeat, fn):
+    """Fastest of `repeat` runs, in milliseconds, and the last result"""
+    best, result = None, None
+    for _ in range(repeat):
+        with Timer() as t:
+            result = fn()
+        best = t.elapsed if best is None else min(best, t.elapsed)
+    return best * 1e3, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Campaign list serialization cost")
+    parser.add_argument("--campaigns", type=int, default=PAGE)
+    parser.add_argument("--min-payouts", type=int, default=100)
+    parser.add_argument("--max-payouts", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    campaigns, payouts = seed_database(args.campaigns, args.max_payouts, args.min_payouts)
+    print(f"{campaigns} campaigns, {payouts} payouts; page of {PAGE}, best of {args.repeat}")
+
+    adapter = TypeAdapter(List[CampaignSchema])
+    db = SessionLocal()
+    try:
+        def orm_fetch():
+            db.expunge_all()
+            return campaign_service.get_campaigns(db, 0, PAGE)
+
+        fetch_orm, objects = best_of(args.repeat, orm_fetch)
+        validate, models = best_of(args.repeat, lambda: adapter.validate_python(objects, from_attributes=True))
+        dump, body = best_of(args.repeat, lambda: json.dumps(adapter.dump_python(models, mode="json")).encode())
+
+        fetch_rows, rows = best_of(args.repeat, lambda: campaign_service.get_campaign_rows(db, 0, PAGE))
+        encode, fast_body = best_of(args.repeat, lambda: orjson.dumps(rows))
+        compress, compressed = best_of(args.repeat, lambda: gzip.compress(fast_body, compresslevel=GZIP_LEVEL))
+    finally:
+        db.close()
+
+    # Same documents; only the incidental payout order of the ORM path differs
+    slow = json.loads(body)
+    for campaign in slow:
+        campaign["payouts"].sort(key=lambda payout: payout["id"])
+    assert orjson.loads(fast_body) == slow
+    scale = PAGE / max(1, len(rows))
+    print(f"\nper 1,000 campaigns ({len(body) / 1e6:.1f} MB JSON):")
+    print(f"  response_model: fetch {fetch_orm * scale:8.1f} ms  validate {validate * scale:8.1f} ms  "
+          f"dump {dump * scale:8.1f} ms  total {(fetch_orm + validate + dump) * scale:8.1f} ms")
+    print(f"  fast path:      fetch {fetch_rows * scale:8.1f} ms  orjson   {encode * scale:8.1f} ms  "
+          f"               total {(fetch_rows + encode) * scale:8.1f} ms")
+    print(f"  gzip level {GZIP_LEVEL}:   {compress * scale:8.1f} ms  "
+          f"{len(fast_body) / 1e6:.1f} MB -> {len(compressed) / 1e6:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
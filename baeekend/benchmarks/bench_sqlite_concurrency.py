@@ -0,0 +1,113 @@
+"""
+Concurrent readers and writers on SQLite with and without the pragma profile
+(WAL, synchronous=NORMAL, busy_timeout, cache_size, mmap_size).
+
+Run from the baeekend directory:
+    python -m benchmarks.bench_sqlite_concurrency [readers] [writers] [seconds]
+"""
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.common import Timer, summarize, use_temp_database
+
+use_temp_database()
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from database.database import Base, create_db_engine  # noqa: E402
+from models.models import Campaign, Payout  # noqa: E402
+
+CAMPAIGNS = 5000
+
+
+def build(sqlite_pragmas):
+    path = os.path.join(tempfile.mkdtemp(prefix="baeekend-bench-"), "concurrency.db")
+    # pysqlite's own 5s lock wait is disabled so busy_timeout is the only retry policy
+    engine = create_db_engine(
+        f"sqlite:///{path}", sqlite_pragmas=sqlite_pragmas, connect_args={"timeout": 0}
+    )
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(
+            Campaign.__table__.insert(),
+            [{"title": f"c{i}", "landing_url": "https://example.com", "is_running": True, "country": "USA"}
+             for i in range(CAMPAIGNS)],
+        )
+        connection.execute(
+            Payout.__table__.insert(),
+            [{"campaign_id": i + 1, "country": "USA", "amount": 1.0} for i in range(CAMPAIGNS)],
+        )
+    return engine
+
+
+def run(engine, readers, writers, seconds):
+    Session = sessionmaker(bind=engine)
+    deadline = time.monotonic() + seconds
+    read_samples, write_samples = [], []
+    errors = {"read": 0, "write": 0}
+    lock = threading.Lock()
+
+    def reader():
+        while time.monotonic() < deadline:
+            start = random.randint(1, CAMPAIGNS - 50)
+            try:
+                with Timer() as t, Session() as session:
+                    session.execute(
+                        text("SELECT c.id, p.amount FROM campaigns c JOIN payouts p ON p.campaign_id = c.id "
+                             "WHERE c.id BETWEEN :a AND :b"),
+                        {"a": start, "b": start + 50},
+                    ).all()
+                with lock:
+                    read_samples.append(t.elapsed)
+            except OperationalError:
+                with lock:
+                    errors["read"] += 1
+
+    def writer():
+        while time.monotonic() < deadline:
+            try:
+                with Timer() as t, Session() as session:
+                    session.execute(
+                        text("UPDATE payouts SET amount = amount + 1 WHERE campaign_id = :id"),
+                        {"id": random.randint(1, CAMPAIGNS)},
+                    )
+                    session.commit()
+                with lock:
+                    write_samples.append(t.elapsed)
+            except OperationalError:
+                with lock:
+                    errors["write"] += 1
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(read_samples), summarize(write_samples), errors
+
+
+def main():
+    readers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    writers = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 5
+    for sqlite_pragmas in (False, True):
+        engine = build(sqlite_pragmas)
+        reads, writes, errors = run(engine, readers, writers, seconds)
+        engine.dispose()
+        label = "pragma profile" if sqlite_pragmas else "defaults      "
+        print(
+            f"{label}: reads {reads['count'] / seconds:7.0f}/s p99 {reads['p99_ms']:6.1f} ms, "
+            f"writes {writes['count'] / seconds:6.0f}/s p99 {writes['p99_ms']:6.1f} ms, "
+            f"locked errors r={errors['read']} w={errors['write']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
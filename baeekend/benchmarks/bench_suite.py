@@ -0,0 +1,213 @@
+"""
+In-process load test of the main campaign/payout routes.
+
+Seeds a database with benchmarks.seed, then drives the real FastAPI app
+through TestClient for each scenario, reporting throughput and p50/p99
+latency. Results are written as JSON; --compare checks them against an
+earlier run and exits non-zero on a regression, for use in CI.
+
+Run from the baeekend directory:
+    python -m benchmarks.bench_suite --campaigns 10000 --output bench.json
+    python -m benchmarks.bench_suite --compare baseline.json --threshold 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import time
+
+from benchmarks.common import Timer, summarize, use_temp_database
+from benchmarks.seed import seed_database
+
+# --reuse benchmarks the database DATABASE_URL names, so it has to be set before the default kicks in
+REUSABLE_DATABASE = "DATABASE_URL" in os.environ
+use_temp_database()
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import func, select  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from database.database import COUNTRY_CODES, SessionLocal  # noqa: E402
+from main import app  # noqa: E402
+from models.models import Campaign, Payout  # noqa: E402
+
+CODES = sorted(COUNTRY_CODES)
+WARMUP = 20
+# Latencies compared by --compare
+COMPARED_KEYS = ("p50_ms", "p99_ms")
+
+
+def sample_payouts(count, rng):
+    """(payout_id, campaign_id, country) of random existing payouts"""
+    db = SessionLocal()
+    try:
+        max_id = db.scalar(select(func.max(Payout.id))) or 0
+        ids = [rng.randint(1, max_id) for _ in range(count)] if max_id else []
+        rows = db.execute(
+            select(Payout.id, Payout.campaign_id, Payout.country).where(Payout.id.in_(ids))
+        ).all()
+        return [(row.id, row.campaign_id, row.country.value) for row in rows]
+    finally:
+        db.close()
+
+
+def campaign_count():
+    db = SessionLocal()
+    try:
+        return db.scalar(select(func.count(Campaign.id)))
+    finally:
+        db.close()
+
+
+def scenario_list_campaigns(client, rng, context):
+    skip = rng.randint(0, max(0, min(context["campaigns"], 10000) - 100))
+    return client.get("/api/campaigns/", params={"skip": skip, "limit": 100})
+
+
+def scenario_get_country_payout(client, rng, context):
+    _, campaign_id, country = rng.choice(context["payouts"])
+    return client.get(f"/api/campaigns/{campaign_id}/payouts/country/{country}")
+
+
+def scenario_create_campaign(client, rng, context):
+    return client.post("/api/campaigns/", json={
+        "title": "Bench campaign",
+        "landing_url": "https://example.com/bench",
+        "is_running": True,
+        "country": rng.choice(CODES),
+        "payouts": [
+            {"country": country, "amount": round(rng.uniform(0.5, 50.0), 2)}
+            for country in rng.sample(CODES, 10)
+        ],
+    })
+
+
+def scenario_update_payout(client, rng, context):
+    payout_id, _, country = rng.choice(context["payouts"])
+    return client.put(
+        f"/api/campaigns/payouts/{payout_id}",
+        json={"country": country, "amount": round(rng.uniform(0.5, 50.0), 2)},
+    )
+
+
+SCENARIOS = {
+    "list_campaigns": scenario_list_campaigns,
+    "get_country_payout": scenario_get_country_payout,
+    "create_campaign": scenario_create_campaign,
+    "update_payout": scenario_update_payout,
+}
+
+
+def run_scenario(client, scenario, requests, rng, context):
+    for _ in range(WARMUP):
+        scenario(client, rng, context).raise_for_status()
+    samples = []
+    with Timer() as total:
+        for _ in range(requests):
+            with Timer() as t:
+                response = scenario(client, rng, context)
+            response.raise_for_status()
+            samples.append(t.elapsed)
+    result = summarize(samples)
+    result["throughput_rps"] = requests / total.elapsed
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """Print a comparison table and return the list of regressed scenario/metric pairs"""
+    regressions = []
+    print(f"\n{'scenario':<20} {'metric':<8} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        for key in COMPARED_KEYS:
+            change = result[key] / previous[key] - 1 if previous[key] else 0.0
+            flag = " !" if change > threshold else ""
+            print(f"{name:<20} {key:<8} {previous[key]:>10.3f} {result[key]:>10.3f} {change:>+7.1%}{flag}")
+            if change > threshold:
+                regressions.append((name, key))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process campaign/payout load test")
+    parser.add_argument("--campaigns", type=int, default=10000)
+    parser.add_argument("--max-payouts", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=500, help="timed requests per scenario")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reuse", action="store_true", help="benchmark the existing database without seeding")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed p50/p99 slowdown, e.g. 0.25 = 25%%")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    if args.reuse and not REUSABLE_DATABASE:
+        parser.error("--reuse needs DATABASE_URL pointing at a seeded database")
+
+    if not args.reuse:
+        with Timer() as t:
+            campaigns, payouts = seed_database(args.campaigns, args.max_payouts, seed=args.seed)
+        print(f"seeded {campaigns} campaigns / {payouts} payouts in {t.elapsed:.1f}s")
+
+    rng = random.Random(args.seed)
+    try:
+        context = {"campaigns": campaign_count(), "payouts": sample_payouts(1000, rng)}
+    except OperationalError as e:
+        sys.exit(f"can't read the benchmark database: {e.orig}")
+    if not context["payouts"]:
+        sys.exit("no payouts to benchmark against; seed the database or drop --reuse")
+    client = TestClient(app)
+
+    results = {}
+    for name in names:
+        results[name] = run_scenario(client, SCENARIOS[name], args.requests, rng, context)
+        r = results[name]
+        print(f"{name:<20} {r['throughput_rps']:>8.1f} req/s  p50 {r['p50_ms']:.3f} ms  p99 {r['p99_ms']:.3f} ms")
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "campaigns": context["campaigns"],
+            "max_payouts": args.max_payouts,
+            "requests": args.requests,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Fast synthetic data generator for the benchmarks.
+
+Campaigns and payouts go in as chunked Core executemany INSERTs, one
+transaction per chunk, with payout countries drawn from countries.json.
+The inserts bypass the services, so the payout analytics summary is
+rebuilt from the seeded rows at the end.
+
+Run from the baeekend directory:
+    python -m benchmarks.seed --campaigns 1000000 --max-payouts 238
+"""
+import argparse
+import random
+from datetime import datetime
+
+from benchmarks.common import Timer, reset_schema, use_temp_database
+
+CHUNK_SIZE = 10000
+
+
+def seed_database(campaigns, max_payouts=20, min_payouts=1, running_ratio=0.5, seed=0, reset=True):
+    """Fill the database with `campaigns` campaigns and return (campaigns, payouts) inserted"""
+    from sqlalchemy import func, insert, select
+
+    from database.database import COUNTRY_CODES, SessionLocal, engine
+    from models.models import Campaign, Payout
+    from service.analytics import payout_analytics
+
+    if reset:
+        reset_schema()
+    codes = sorted(COUNTRY_CODES)
+    max_payouts = min(max_payouts, len(codes))
+    min_payouts = min(min_payouts, max_payouts)
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    with engine.connect() as conn:
+        next_id = (conn.scalar(select(func.max(Campaign.id))) or 0) + 1
+
+    payout_total = 0
+    for start in range(0, campaigns, CHUNK_SIZE):
+        campaign_rows, payout_rows = [], []
+        for campaign_id in range(next_id + start, next_id + min(start + CHUNK_SIZE, campaigns)):
+            campaign_rows.append({
+                "id": campaign_id,
+                "title": f"Campaign {campaign_id}",
+                "landing_url": f"https://example.com/landing/{campaign_id}",
+                "is_running": rng.random() < running_ratio,
+                "country": rng.choice(codes),
+                "created_at": now,
+                "updated_at": now,
+            })
+            for country in rng.sample(codes, rng.randint(min_payouts, max_payouts)):
+                payout_rows.append({
+                    "campaign_id": campaign_id,
+                    "country": country,
+                    "amount": round(rng.uniform(0.5, 50.0), 2),
+                })
+        with engine.begin() as conn:
+            conn.execute(insert(Campaign), campaign_rows)
+            if payout_rows:
+                conn.execute(insert(Payout), payout_rows)
+        payout_total += len(payout_rows)
+
+    with SessionLocal() as db:
+        payout_analytics.rebuild(db)
+    return campaigns, payout_total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--campaigns", type=int, default=10000)
+    parser.add_argument("--max-payouts", type=int, default=20)
+    parser.add_argument("--min-payouts", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--append", action="store_true", help="keep existing rows instead of recreating the schema")
+    args = parser.parse_args()
+
+    url = use_temp_database()
+    with Timer() as t:
+        campaigns, payouts = seed_database(
+            args.campaigns, args.max_payouts, args.min_payouts, seed=args.seed, reset=not args.append
+        )
+    rows = campaigns + payouts
+    print(f"{url}: {campaigns} campaigns, {payouts} payouts in {t.elapsed:.1f}s ({rows / t.elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import os
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from database.database import SQLALCHEMY_DATABASE_URL, configure_engine, engine_options
+
+# Async driver used for each sync URL scheme when ASYNC_DATABASE_URL isn't set
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+psycopg",
+}
+
+def to_async_url(url: str) -> str:
+    """Swap the driver of a sync database URL for its async counterpart"""
+    scheme, separator, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    return f"{ASYNC_DRIVERS.get(dialect, scheme)}{separator}{rest}"
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(SQLALCHEMY_DATABASE_URL)
+
+def create_async_db_engine(url: str):
+    options = engine_options(url)
+    if options and url.startswith("sqlite"):
+        # aiosqlite defaults to NullPool, i.e. a new connection and thread per checkout
+        options["poolclass"] = AsyncAdaptedQueuePool
+    engine = create_async_engine(url, **options)
+    configure_engine(engine.sync_engine)
+    return engine
+
+def async_session_factory(engine):
+    # Objects must stay readable after commit: async code can't lazy-load expired attributes
+    return async_sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+async_engine = create_async_db_engine(ASYNC_DATABASE_URL)
+AsyncSessionLocal = async_session_factory(async_engine)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,8 +1,9 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 from enum import Enum
+from typing import Optional
 from pydantic import BaseModel
 import json
 import os
@@ -11,63 +12,120 @@ import logging
 logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
 
+COUNTRIES_FILE = os.path.join(os.path.dirname(__file__), 'countries.json')
+
 def load_countries():
     try:
-        filepath = os.path.join(os.path.dirname(__file__), 'countries.json')
-        logger.debug(f"Loading countries from: {filepath}")
-        
-        with open(filepath) as f:
-            data = json.load(f)
-            countries = data['countries']
-            logger.debug(f"Loaded {len(countries)} countries")
-            return countries
+        logger.debug("Loading countries from: %s", COUNTRIES_FILE)
+        with open(COUNTRIES_FILE) as f:
+            return json.load(f)['countries']
     except Exception as e:
-        logger.error(f"Failed to load countries: {e}")
+        logger.error("Failed to load countries: %s", e)
         raise
 
-# Load countries first
 COUNTRIES_DATA = load_countries()
-logger.debug(f"Countries data loaded: {COUNTRIES_DATA[:2]}")  # Show first two countries
-
-# Create Country enum with initial member to prevent empty enum
-class Country(str, Enum):
-    # Add initial member
-    AFG = "AFG"
-    
-    @classmethod
-    def _missing_(cls, value):
-        for country in COUNTRIES_DATA:
-            if country['COUNTRY_CODE'] == value:
-                return cls(value)
-        raise ValueError(f"{value} is not a valid Country code")
-
-# Add country codes to enum
-for country in COUNTRIES_DATA:
-    code = country['COUNTRY_CODE']
-    logger.debug(f"Adding country code: {code}")
-    if not hasattr(Country, code):
-        setattr(Country, code, code)
-
-logger.debug(f"Country enum members: {list(Country.__members__.keys())}")
+logger.debug("Loaded %d countries", len(COUNTRIES_DATA))
+
+# Country registry, built once at import. Entries without a real ISO code
+# (e.g. currency units listed with COUNTRY_CODE "-") are not countries.
+COUNTRIES_BY_CODE = {
+    country['COUNTRY_CODE']: country
+    for country in COUNTRIES_DATA
+    if country['COUNTRY_CODE'].isalpha()
+}
+COUNTRY_CODES = frozenset(COUNTRIES_BY_CODE)
+
+Country = Enum(
+    "Country",
+    {code: code for code in COUNTRIES_BY_CODE},
+    type=str,
+    module=__name__,
+)
 
 def get_country_details(country_code: str):
     """Get full country details by country code"""
-    return next(
-        (country for country in COUNTRIES_DATA 
-         if country['COUNTRY_CODE'] == country_code),
-        None
-    )
+    return COUNTRIES_BY_CODE.get(country_code)
+
+def get_country_currency(country_code: str) -> Optional[str]:
+    """Get the currency code for a country, or None if unknown"""
+    details = COUNTRIES_BY_CODE.get(country_code)
+    return details['CURRENCY_CODE'] if details else None
 
 # Database setup
 load_dotenv()
 
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./sql_app.db")
+# Read replica for GET routes (database/replica.py); reads use the primary when unset
+REPLICA_DATABASE_URL = os.getenv("REPLICA_DATABASE_URL") or None
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+# Serve the campaign API through AsyncSession (database/async_database.py)
+ASYNC_DB = _env_flag("ASYNC_DB", "false")
+
+# Connection pool profile. Ignored for in-memory SQLite, which keeps one
+# connection per thread (SingletonThreadPool).
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = _env_flag("DB_POOL_PRE_PING", "true")
+
+# Applied to every new SQLite connection: WAL lets readers run alongside a
+# writer, NORMAL sync is durable in WAL mode except on power loss, and the
+# busy timeout makes writers wait for the lock instead of failing at once.
+SQLITE_PRAGMAS_ENABLED = _env_flag("SQLITE_PRAGMAS", "true")
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536")),  # negative = KiB
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+}
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and (":memory:" in url or "mode=memory" in url or url.rstrip("/").endswith(":"))
+
+def engine_options(url: str) -> dict:
+    """Pool keyword arguments for create_engine/create_async_engine"""
+    if _is_memory_sqlite(url):
+        return {}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+def configure_engine(engine, sqlite_pragmas: bool = None):
+    """Install the SQLite connect hook on a sync engine (or an async engine's sync_engine)"""
+    if sqlite_pragmas is None:
+        sqlite_pragmas = SQLITE_PRAGMAS_ENABLED
+    if sqlite_pragmas and engine.dialect.name == "sqlite" and not _is_memory_sqlite(str(engine.url)):
+        event.listen(engine, "connect", set_sqlite_pragmas)
+    return engine
+
+def create_db_engine(url: str, sqlite_pragmas: bool = None, **kwargs):
+    options = engine_options(url)
+    options.update(kwargs)
+    return configure_engine(create_engine(url, **options), sqlite_pragmas)
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 def get_db():
+    """Session on the primary, for writes and reads that must see them (see get_read_db)"""
     db = SessionLocal()
     try:
         yield db
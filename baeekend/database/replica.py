@@ -0,0 +1,156 @@
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+
+from database.database import REPLICA_DATABASE_URL, SessionLocal, create_db_engine
+from service.versions import get_collection_version
+
+logger = logging.getLogger(__name__)
+
+# Seconds reads stay on the primary after the replica failed to connect
+REPLICA_RETRY_INTERVAL = float(os.getenv("REPLICA_RETRY_INTERVAL", "30"))
+# Cookie holding the collection version of the client's last write, and how
+# long it is kept; any replica should have caught up well within that
+READ_AFTER_COOKIE = "read_after"
+READ_YOUR_WRITES_TTL = int(os.getenv("READ_YOUR_WRITES_TTL", "300"))
+
+
+class ReadReplica:
+    """
+    Picks the engine a read-only request's session runs on.
+
+    Reads go to the replica unless it isn't configured, failed recently
+    (the primary takes over for REPLICA_RETRY_INTERVAL), or hasn't reached
+    the collection version of the client's last write yet, which is what
+    gives a client read-your-writes across a lagging replica.
+    """
+
+    def __init__(self, url: Optional[str] = None):
+        self._lock = threading.Lock()
+        self.url: Optional[str] = None
+        self.engine = None
+        self._sessionmaker: Optional[sessionmaker] = None
+        self._async_engine = None
+        self._async_sessionmaker = None
+        self._down_until = 0.0
+        # Sessions handed out by source: replica, lagging, down, primary
+        self.counts: Counter = Counter()
+        self.configure(url)
+
+    @property
+    def enabled(self) -> bool:
+        return self._sessionmaker is not None
+
+    def configure(self, url: Optional[str]) -> None:
+        """Point at a replica (or none); disposes the previous engines"""
+        self.dispose()
+        with self._lock:
+            self.url = url
+            self.engine = create_db_engine(url) if url else None
+            self._sessionmaker = (
+                sessionmaker(autocommit=False, autoflush=False, bind=self.engine) if url else None
+            )
+            # Rebuilt for the new URL on first async use
+            self._async_engine = self._async_sessionmaker = None
+            self._down_until = 0.0
+            self.counts.clear()
+
+    def dispose(self) -> None:
+        with self._lock:
+            if self.engine is not None:
+                self.engine.dispose()
+            self.engine = self._sessionmaker = None
+
+    async def dispose_async(self) -> None:
+        engine, self._async_engine, self._async_sessionmaker = self._async_engine, None, None
+        if engine is not None:
+            await engine.dispose()
+
+    def mark_down(self, error: Exception) -> None:
+        logger.warning("Read replica unavailable, reading from the primary for %.0fs: %s", REPLICA_RETRY_INTERVAL, error)
+        self._down_until = time.monotonic() + REPLICA_RETRY_INTERVAL
+
+    def _usable(self) -> bool:
+        if not self.enabled:
+            self.counts["primary"] += 1
+            return False
+        if time.monotonic() < self._down_until:
+            self.counts["down"] += 1
+            return False
+        return True
+
+    def _caught_up(self, version: int, min_version: Optional[int]) -> bool:
+        if min_version is not None and version < min_version:
+            self.counts["lagging"] += 1
+            return False
+        self.counts["replica"] += 1
+        return True
+
+    def session(self, min_version: Optional[int] = None) -> Session:
+        """A session for reads that must reflect collection version `min_version`"""
+        if self._usable():
+            db = self._sessionmaker()
+            try:
+                # Also a health check: a dead or empty replica falls back here
+                # rather than failing the request later
+                version = get_collection_version(db)
+                if self._caught_up(version, min_version):
+                    return db
+            except SQLAlchemyError as e:
+                self.mark_down(e)
+            db.close()
+        return SessionLocal()
+
+    async def async_session(self, min_version: Optional[int] = None):
+        """AsyncSession counterpart of session()"""
+        # Imported here so sync deployments never build the async engines
+        from database.async_database import AsyncSessionLocal, async_session_factory, create_async_db_engine, to_async_url
+
+        if self._usable():
+            if self._async_sessionmaker is None:
+                self._async_engine = create_async_db_engine(to_async_url(self.url))
+                self._async_sessionmaker = async_session_factory(self._async_engine)
+            db = self._async_sessionmaker()
+            try:
+                version = await db.run_sync(get_collection_version)
+                if self._caught_up(version, min_version):
+                    return db
+            except SQLAlchemyError as e:
+                self.mark_down(e)
+            await db.close()
+        return AsyncSessionLocal()
+
+
+replica = ReadReplica(REPLICA_DATABASE_URL)
+
+
+def read_after(request: Request) -> Optional[int]:
+    """Collection version the client last wrote, from the read-your-writes cookie"""
+    try:
+        return int(request.cookies[READ_AFTER_COOKIE])
+    except (KeyError, ValueError):
+        return None
+
+
+def get_read_db(request: Request):
+    """Session for GET routes: the replica when it is up and current for this client, else the primary"""
+    db = replica.session(read_after(request))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    db = await replica.async_session(read_after(request))
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -1,11 +1,68 @@
 import json
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from database.database import engine, Base
-from api.routes import router as campaign_router
+from fastapi.responses import PlainTextResponse
+from database.database import engine, Base, ASYNC_DB, SessionLocal
+from api.analytics import router as analytics_router
+from api.auth import router as auth_router
+from api.consistency import ReadYourWritesMiddleware
+from api.events import router as events_router
+from api.health import router as health_router, startup_state
+from api.metrics import MetricsMiddleware, instrument_engine, metrics
+from auth.passwords import password_hasher
+from database.replica import replica
+from service.currency import get_rate_table
+from service.outbox import change_feed
+from service.routing import offer_index
 
-app = FastAPI(title="Campaign Management API")
+# Adds per-request query count / DB time headers to every response
+DEBUG = os.getenv("DEBUG", "false").lower() in ("1", "true", "yes")
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+# Schema changes belong to `python manage.py migrate`; this is for throwaway local databases
+CREATE_SCHEMA_ON_STARTUP = os.getenv("CREATE_SCHEMA_ON_STARTUP", "false").lower() in ("1", "true", "yes")
+
+if ASYNC_DB:
+    from api.async_routes import router as campaign_router
+    from database.async_database import async_engine
+else:
+    from api.routes import router as campaign_router
+
+def build_offer_index():
+    db = SessionLocal()
+    try:
+        offer_index.build(db)
+    finally:
+        db.close()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Nothing touches the database at import time. Startup only queues the
+    # warm-ups and the app serves (/healthz) at once; /readyz turns green
+    # when they are done.
+    if CREATE_SCHEMA_ON_STARTUP:
+        await run_in_threadpool(Base.metadata.create_all, engine)
+    startup_state.warm_up("offer_index", build_offer_index)
+    startup_state.warm_up("exchange_rates", get_rate_table)
+    startup_state.started = True
+    try:
+        yield
+    finally:
+        startup_state.started = False
+        await change_feed.close()
+        password_hasher.shutdown()
+        engine.dispose()
+        replica.dispose()
+        if ASYNC_DB:
+            await async_engine.dispose()
+            await replica.dispose_async()
+
+app = FastAPI(title="Campaign Management API", lifespan=lifespan)
+
+# Sets the read-your-writes cookie on responses to writes (database/replica.py)
+app.add_middleware(ReadYourWritesMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -15,9 +72,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-Base.metadata.create_all(bind=engine)
+if METRICS_ENABLED:
+    instrument_engine(engine)
+    if ASYNC_DB:
+        instrument_engine(async_engine.sync_engine)
+    # Added last so it wraps CORS too and times the whole request
+    app.add_middleware(MetricsMiddleware, registry=metrics, debug_headers=DEBUG)
+
+app.include_router(health_router)
 app.include_router(campaign_router)
+app.include_router(analytics_router)
+app.include_router(auth_router)
+app.include_router(events_router)
 
 @app.get("/")
 async def root():
-    return {"status": "healthy", "message": "Campaign Management API"}
\ No newline at end of file
+    return {"status": "healthy", "message": "Campaign Management API"}
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics():
+    """Per-route request, latency, query count and DB time metrics for Prometheus"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
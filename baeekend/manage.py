@@ -0,0 +1,135 @@
+"""
+Maintenance commands.
+
+Run from the baeekend directory:
+    python manage.py migrate [revision]
+    python manage.py rebuild-payout-stats
+    python manage.py prune-change-events [--days N]
+    python manage.py archive-campaigns [--days N] [--batch-size N] [--pause SECONDS]
+    python manage.py sync-replica
+"""
+import argparse
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def migrate(args):
+    # Schema changes run here (or in a deploy step), never at app startup
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(os.path.join(os.path.dirname(BASE_DIR), "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BASE_DIR, "alembic"))
+    if args.url:
+        config.set_main_option("sqlalchemy.url", args.url)
+    command.upgrade(config, args.revision)
+
+
+def rebuild_payout_stats(args):
+    from database.database import SessionLocal
+    from service.analytics import payout_analytics
+
+    db = SessionLocal()
+    try:
+        rows = payout_analytics.rebuild(db)
+    finally:
+        db.close()
+    print(f"payout_country_stats rebuilt: {rows} rows")
+
+
+def prune_change_events(args):
+    from datetime import datetime, timedelta
+
+    from database.database import SessionLocal
+    from service.outbox import outbox
+
+    db = SessionLocal()
+    try:
+        deleted = outbox.prune(db, datetime.utcnow() - timedelta(days=args.days))
+    finally:
+        db.close()
+    print(f"change_events pruned: {deleted} rows older than {args.days} days")
+
+
+def archive_campaigns(args):
+    from database.database import SessionLocal
+    from service.archive import archive_service
+
+    db = SessionLocal()
+    try:
+        archived = archive_service.archive_stale(db, args.days, args.batch_size, args.pause)
+    finally:
+        db.close()
+    print(f"campaigns archived: {archived} stopped for {args.days} days")
+
+
+def sync_replica(args):
+    # Local stand-in for replication: copy the primary SQLite file over the
+    # replica file with SQLite's online backup, which is consistent even
+    # while the app is writing
+    import sqlite3
+
+    from sqlalchemy.engine import make_url
+
+    from database.database import REPLICA_DATABASE_URL, SQLALCHEMY_DATABASE_URL
+
+    replica_url = args.url or REPLICA_DATABASE_URL
+    if not replica_url:
+        raise SystemExit("No replica configured: set REPLICA_DATABASE_URL or pass --url")
+    primary, replica = make_url(SQLALCHEMY_DATABASE_URL), make_url(replica_url)
+    if primary.get_backend_name() != "sqlite" or replica.get_backend_name() != "sqlite":
+        raise SystemExit("sync-replica copies SQLite files; point DATABASE_URL and REPLICA_DATABASE_URL at sqlite")
+    source, target = sqlite3.connect(primary.database), sqlite3.connect(replica.database)
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+        target.close()
+    print(f"replica {replica.database} synced from {primary.database}")
+
+
+def migrate_arguments(parser):
+    parser.add_argument("revision", nargs="?", default="head")
+    parser.add_argument("--url", help="database URL (defaults to DATABASE_URL)")
+
+
+def prune_arguments(parser):
+    parser.add_argument("--days", type=int, default=7, help="keep events this many days old (default 7)")
+
+
+def archive_arguments(parser):
+    from service.archive import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE
+
+    parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS, help="archive campaigns stopped this many days")
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE, help="campaigns per transaction")
+    parser.add_argument("--pause", type=float, default=0.0, help="seconds to sleep between batches")
+
+
+def sync_replica_arguments(parser):
+    parser.add_argument("--url", help="replica database URL (defaults to REPLICA_DATABASE_URL)")
+
+
+COMMANDS = {
+    "migrate": (migrate, "upgrade the database schema with alembic", migrate_arguments),
+    "rebuild-payout-stats": (rebuild_payout_stats, "recompute the per-country payout summary from scratch", None),
+    "prune-change-events": (prune_change_events, "delete change feed events older than --days", prune_arguments),
+    "archive-campaigns": (archive_campaigns, "move long-stopped campaigns to the archive tables", archive_arguments),
+    "sync-replica": (sync_replica, "copy the primary SQLite database to the local stand-in replica", sync_replica_arguments),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="baeekend maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, (handler, help_text, arguments) in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=help_text)
+        if arguments is not None:
+            arguments(subparser)
+        subparser.set_defaults(handler=handler)
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,10 @@ import json
 import os
 import hashlib
 import secrets
-import bcrypt
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean, Enum as SQLAlchemyEnum, DateTime
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean, Enum as SQLAlchemyEnum, DateTime, Index, DDL, Text, event
 from sqlalchemy.orm import relationship
 from database.database import Base, Country
+from auth.passwords import BCRYPT_ROUNDS, check_password, hash_password
 from datetime import datetime
 
 class User(Base):
@@ -17,15 +17,10 @@ class User(Base):
     campaigns = relationship("Campaign", back_populates="owner")
     
     def set_password(self, password: str):
-        password_bytes = password.encode('utf-8')
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password_bytes, salt)
-        self.hashed_password = hashed.decode('utf-8')
+        self.hashed_password = hash_password(password, BCRYPT_ROUNDS)
         
     def check_password(self, password: str) -> bool:
-        password_bytes = password.encode('utf-8')
-        hashed_bytes = self.hashed_password.encode('utf-8')
-        return bcrypt.checkpw(password_bytes, hashed_bytes)
+        return check_password(password, self.hashed_password)
 
 class Campaign(Base):
     __tablename__ = "campaigns"
@@ -33,14 +28,70 @@ class Campaign(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     landing_url = Column(String, nullable=False)
-    is_running = Column(Boolean, default=False)
+    is_running = Column(Boolean, nullable=False, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     country = Column(SQLAlchemyEnum(Country), nullable=False)
+    # Bumped by every write to the campaign or its payouts; drives ETags
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     owner_id = Column(Integer, ForeignKey("users.id"))
     owner = relationship("User", back_populates="campaigns")
     payouts = relationship("Payout", back_populates="campaign", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Serves keyset pagination ordered by (created_at, id)
+        Index("ix_campaigns_created_at_id", "created_at", "id"),
+        # Filtered listings walk these in id order (offset and keyset pages, export)
+        Index("ix_campaigns_is_running_id", "is_running", "id"),
+        Index("ix_campaigns_country_id", "country", "id"),
+        Index("ix_campaigns_owner_id", "owner_id"),
+        # Lets the archive job range-scan stopped campaigns by last change
+        Index("ix_campaigns_is_running_updated_at", "is_running", "updated_at"),
+        # AUTOINCREMENT so SQLite never hands out an archived or deleted id again
+        {"sqlite_autoincrement": True},
+    )
+
+# Text search over campaigns.title / landing_url (see service/search.py).
+# SQLite: an external-content FTS5 table with the trigram tokenizer, so
+# MATCH behaves like a case-insensitive substring search, kept in sync by
+# triggers (which also cover bulk Core inserts). Postgres: pg_trgm GIN
+# indexes, which serve the plain ILIKE '%...%' filters directly.
+CAMPAIGN_SEARCH_TABLE = "campaigns_fts"
+
+SQLITE_SEARCH_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS campaigns_fts USING fts5(
+        title, landing_url, content='campaigns', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS campaigns_fts_ai AFTER INSERT ON campaigns BEGIN
+        INSERT INTO campaigns_fts(rowid, title, landing_url) VALUES (new.id, new.title, new.landing_url);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS campaigns_fts_ad AFTER DELETE ON campaigns BEGIN
+        INSERT INTO campaigns_fts(campaigns_fts, rowid, title, landing_url)
+        VALUES ('delete', old.id, old.title, old.landing_url);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS campaigns_fts_au AFTER UPDATE OF title, landing_url ON campaigns BEGIN
+        INSERT INTO campaigns_fts(campaigns_fts, rowid, title, landing_url)
+        VALUES ('delete', old.id, old.title, old.landing_url);
+        INSERT INTO campaigns_fts(rowid, title, landing_url) VALUES (new.id, new.title, new.landing_url);
+    END""",
+    "INSERT INTO campaigns_fts(campaigns_fts) VALUES ('rebuild')",
+]
+
+POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_campaigns_title_trgm ON campaigns USING gin (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_campaigns_landing_url_trgm ON campaigns USING gin (landing_url gin_trgm_ops)",
+]
+
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(Campaign.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(Campaign.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+event.listen(
+    Campaign.__table__, "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {CAMPAIGN_SEARCH_TABLE}").execute_if(dialect="sqlite"),
+)
+
 class Payout(Base):
     __tablename__ = "payouts"
     
@@ -48,4 +99,75 @@ class Payout(Base):
     country = Column(SQLAlchemyEnum(Country), nullable=False)
     amount = Column(Float, nullable=False)
     campaign_id = Column(Integer, ForeignKey("campaigns.id"))
-    campaign = relationship("Campaign", back_populates="payouts")
\ No newline at end of file
+    campaign = relationship("Campaign", back_populates="payouts")
+
+    __table_args__ = (
+        # One payout per country per campaign. Also serves every lookup by
+        # campaign_id alone (payout lists, the IN loads for campaign pages).
+        Index("uq_payouts_campaign_country", "campaign_id", "country", unique=True),
+        # Lets the analytics summary find a country's new min/max by an ordered scan
+        Index("ix_payouts_country_amount", "country", "amount"),
+        {"sqlite_autoincrement": True},
+    )
+
+class CollectionVersion(Base):
+    """Version counters for whole collections (e.g. the campaign list), bumped on every write"""
+    __tablename__ = "collection_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+class PayoutCountryStats(Base):
+    """
+    Per-country payout summary, split by campaign state. Maintained
+    incrementally by the campaign/payout writes (see service.analytics).
+    """
+    __tablename__ = "payout_country_stats"
+
+    country = Column(SQLAlchemyEnum(Country), primary_key=True)
+    is_running = Column(Boolean, primary_key=True)
+    payout_count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Float, nullable=False, default=0.0)
+    min_amount = Column(Float)
+    max_amount = Column(Float)
+
+class ChangeEvent(Base):
+    """
+    Outbox of campaign/payout changes, written in the same transaction as
+    the change. The id is the offset change-feed clients resume from.
+    """
+    __tablename__ = "change_events"
+    # AUTOINCREMENT so SQLite never hands out an id again once pruned
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True)
+    type = Column(String(32), nullable=False)
+    # No foreign key: deletion events outlive their campaign
+    campaign_id = Column(Integer, nullable=False)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+# Cold storage for long-stopped campaigns (see service.archive). Rows keep
+# their original ids so a restore puts them back unchanged; no foreign keys
+# to the hot tables, which the archived rows have left.
+class ArchivedCampaign(Base):
+    __tablename__ = "archived_campaigns"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String, nullable=False)
+    landing_url = Column(String, nullable=False)
+    is_running = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    country = Column(SQLAlchemyEnum(Country), nullable=False)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    owner_id = Column(Integer)
+    archived_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+class ArchivedPayout(Base):
+    __tablename__ = "archived_payouts"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    country = Column(SQLAlchemyEnum(Country), nullable=False)
+    amount = Column(Float, nullable=False)
+    campaign_id = Column(Integer, ForeignKey("archived_campaigns.id"), nullable=False, index=True)
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class PayoutStats(BaseModel):
+    count: int
+    min: Optional[float] = None
+    max: Optional[float] = None
+    avg: Optional[float] = None
+
+class CountryPayoutStats(BaseModel):
+    country: str
+    running: PayoutStats
+    paused: PayoutStats
@@ -2,7 +2,7 @@ import json
 import os
 from pydantic import BaseModel, Field, validator
 from typing import List, Optional
-from database.database import Country
+from database.database import Country, COUNTRY_CODES
 
 class PayoutBase(BaseModel):
     country: str = Field(
@@ -18,10 +18,9 @@ class PayoutBase(BaseModel):
 
     @validator('country')
     def validate_country(cls, v):
-        try:
-            return Country(v)
-        except ValueError:
+        if v not in COUNTRY_CODES:
             raise ValueError(f"Invalid country code: {v}")
+        return Country(v)
 
     class Config:
         json_schema_extra = {
@@ -66,10 +65,9 @@ class CampaignBase(BaseModel):
 
     @validator('country')
     def validate_country(cls, v):
-        try:
-            return Country(v)
-        except ValueError:
+        if v not in COUNTRY_CODES:
             raise ValueError(f"Invalid country code: {v}")
+        return Country(v)
 
 class CampaignCreate(CampaignBase):
     payouts: List[PayoutCreate]
@@ -82,6 +80,70 @@ class Campaign(CampaignBase):
         "from_attributes": True
     }
 
+class CampaignPage(BaseModel):
+    items: List[Campaign]
+    next_cursor: Optional[str] = None
+
+class CampaignImportError(BaseModel):
+    line: int
+    error: str
+
+class CampaignImportResult(BaseModel):
+    imported: int = 0
+    failed: int = 0
+    errors: List[CampaignImportError] = []
+
+class NormalizedPayout(BaseModel):
+    id: int
+    campaign_id: int
+    country: str
+    amount: float
+    currency: Optional[str] = None
+    amount_base: Optional[float] = None  # None when the currency has no rate
+
+class NormalizedPayouts(BaseModel):
+    base: str
+    rates_version: str
+    payouts: List[NormalizedPayout]
+
+class NormalizedCampaign(BaseModel):
+    campaign: Campaign
+    best_payout_base: float
+
+class NormalizedCampaignPage(BaseModel):
+    base: str
+    rates_version: str
+    total: int
+    items: List[NormalizedCampaign]
+
+class RoutedOffer(BaseModel):
+    campaign_id: int
+    landing_url: str
+    amount: float
+
+class OfferRouting(BaseModel):
+    country: Country
+    offers: List[RoutedOffer]
+
+class CampaignStateChange(BaseModel):
+    """Start/stop every campaign matching ids and/or the filters"""
+    is_running: bool
+    ids: Optional[List[int]] = None
+    country: Optional[Country] = None
+    title: Optional[str] = None
+    owner_id: Optional[int] = None
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "is_running": False,
+                "country": "USA"
+            }
+        }
+
+class CampaignStateResult(BaseModel):
+    updated: int
+
 class CampaignUpdate(BaseModel):
     title: Optional[str] = None
     landing_url: Optional[str] = None
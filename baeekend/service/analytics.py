@@ -0,0 +1,195 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from database.database import Country
+from models.models import Campaign, Payout, PayoutCountryStats
+
+# Campaign ids per IN query when collecting the payouts of many campaigns
+STATS_ID_CHUNK = 5000
+
+
+class PayoutStatsDelta:
+    """
+    Pending changes to payout_country_stats, accumulated per
+    (country, is_running) while a write is being prepared.
+    """
+
+    def __init__(self):
+        # key -> [count, total, added_low, added_high, removed_low, removed_high]
+        self.entries: Dict[Tuple[Country, bool], list] = {}
+
+    def __bool__(self):
+        return bool(self.entries)
+
+    def _entry(self, country, is_running) -> list:
+        return self.entries.setdefault((Country(country), bool(is_running)), [0, 0.0, None, None, None, None])
+
+    def add_group(self, country, is_running, count: int, total: float, low: float, high: float) -> None:
+        entry = self._entry(country, is_running)
+        entry[0] += count
+        entry[1] += total
+        entry[2] = low if entry[2] is None else min(entry[2], low)
+        entry[3] = high if entry[3] is None else max(entry[3], high)
+
+    def remove_group(self, country, is_running, count: int, total: float, low: float, high: float) -> None:
+        entry = self._entry(country, is_running)
+        entry[0] -= count
+        entry[1] -= total
+        entry[4] = low if entry[4] is None else min(entry[4], low)
+        entry[5] = high if entry[5] is None else max(entry[5], high)
+
+    def add(self, country, is_running, amount: float) -> None:
+        self.add_group(country, is_running, 1, amount, amount, amount)
+
+    def remove(self, country, is_running, amount: float) -> None:
+        self.remove_group(country, is_running, 1, amount, amount, amount)
+
+    def move(self, payouts: Iterable, from_running: bool, to_running: bool) -> None:
+        """Payouts (anything with .country/.amount) whose campaign changed state"""
+        for payout in payouts:
+            self.remove(payout.country, from_running, payout.amount)
+            self.add(payout.country, to_running, payout.amount)
+
+
+class PayoutAnalyticsService:
+    def campaign_payout_groups(self, db: Session, campaign_ids: List[int]):
+        """(country, count, total, min, max) over the payouts of the given campaigns"""
+        groups = []
+        for start in range(0, len(campaign_ids), STATS_ID_CHUNK):
+            chunk = campaign_ids[start:start + STATS_ID_CHUNK]
+            groups.extend(db.execute(
+                select(
+                    Payout.country,
+                    func.count(Payout.id),
+                    func.sum(Payout.amount),
+                    func.min(Payout.amount),
+                    func.max(Payout.amount),
+                )
+                .where(Payout.campaign_id.in_(chunk))
+                .group_by(Payout.country)
+            ).all())
+        return groups
+
+    def apply(self, db: Session, delta: PayoutStatsDelta) -> None:
+        """
+        Fold a delta into payout_country_stats inside the caller's transaction.
+
+        The affected summary rows are read once (locked on backends that
+        support it) and written back with one bulk UPDATE by primary key
+        plus one INSERT for new buckets. Added amounts can only widen
+        min/max; when a removed amount was a bucket's min or max, the new
+        one is looked up through ix_payouts_country_amount. Call this after
+        the write itself is in the session, since it flushes first.
+        """
+        if not delta:
+            return
+        db.flush()
+        countries = {country for country, _ in delta.entries}
+        existing = {
+            (row.country, row.is_running): row
+            for row in db.execute(
+                select(PayoutCountryStats.__table__)
+                .where(PayoutCountryStats.country.in_(countries))
+                .with_for_update()
+            )
+        }
+
+        updates, inserts = [], []
+        for (country, is_running), (count, total, low, high, removed_low, removed_high) in delta.entries.items():
+            row = existing.get((country, is_running))
+            if row is None:
+                if count > 0:
+                    inserts.append({
+                        "country": country, "is_running": is_running, "payout_count": count,
+                        "total_amount": total, "min_amount": low, "max_amount": high,
+                    })
+                continue
+            payout_count = row.payout_count + count
+            if payout_count <= 0:
+                db.execute(delete(PayoutCountryStats).where(
+                    PayoutCountryStats.country == country, PayoutCountryStats.is_running == is_running
+                ))
+                continue
+
+            # The removed rows are already flushed, so a lookup sees the added ones too
+            min_amount, max_amount = row.min_amount, row.max_amount
+            if removed_low is not None and (min_amount is None or removed_low <= min_amount):
+                min_amount = self._boundary(db, country, is_running, Payout.amount)
+            elif low is not None and (min_amount is None or low < min_amount):
+                min_amount = low
+            if removed_high is not None and (max_amount is None or removed_high >= max_amount):
+                max_amount = self._boundary(db, country, is_running, Payout.amount.desc())
+            elif high is not None and (max_amount is None or high > max_amount):
+                max_amount = high
+            updates.append({
+                "country": country, "is_running": is_running, "payout_count": payout_count,
+                "total_amount": row.total_amount + total, "min_amount": min_amount, "max_amount": max_amount,
+            })
+
+        if updates:
+            db.execute(update(PayoutCountryStats), updates)
+        if inserts:
+            db.execute(insert(PayoutCountryStats), inserts)
+
+    def _boundary(self, db: Session, country: Country, is_running: bool, order) -> Optional[float]:
+        return db.scalar(
+            select(Payout.amount)
+            .join(Campaign, Campaign.id == Payout.campaign_id)
+            .where(Payout.country == country, Campaign.is_running == is_running)
+            .order_by(order)
+            .limit(1)
+        )
+
+    def get_payout_stats(self, db: Session, country: Optional[Country] = None) -> List[dict]:
+        """Per-country running/paused summaries, read straight from the summary table"""
+        query = select(PayoutCountryStats).order_by(PayoutCountryStats.country)
+        if country is not None:
+            query = query.where(PayoutCountryStats.country == country)
+
+        by_country: Dict[Country, dict] = {}
+        for stats in db.scalars(query):
+            entry = by_country.setdefault(stats.country, {
+                "country": stats.country.value,
+                "running": _summary(None),
+                "paused": _summary(None),
+            })
+            entry["running" if stats.is_running else "paused"] = _summary(stats)
+        return list(by_country.values())
+
+    def rebuild(self, db: Session) -> int:
+        """Recompute the whole summary from payouts/campaigns; returns the rows written"""
+        db.execute(delete(PayoutCountryStats))
+        aggregate = (
+            select(
+                Payout.country,
+                Campaign.is_running,
+                func.count(Payout.id),
+                func.sum(Payout.amount),
+                func.min(Payout.amount),
+                func.max(Payout.amount),
+            )
+            .join(Campaign, Campaign.id == Payout.campaign_id)
+            .group_by(Payout.country, Campaign.is_running)
+        )
+        result = db.execute(insert(PayoutCountryStats).from_select(
+            ["country", "is_running", "payout_count", "total_amount", "min_amount", "max_amount"],
+            aggregate,
+        ))
+        db.commit()
+        return result.rowcount
+
+
+def _summary(stats: Optional[PayoutCountryStats]) -> dict:
+    if stats is None or not stats.payout_count:
+        return {"count": 0, "min": None, "max": None, "avg": None}
+    return {
+        "count": stats.payout_count,
+        "min": stats.min_amount,
+        "max": stats.max_amount,
+        "avg": stats.total_amount / stats.payout_count,
+    }
+
+
+payout_analytics = PayoutAnalyticsService()
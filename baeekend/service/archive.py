@@ -0,0 +1,238 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from models.models import ArchivedCampaign, ArchivedPayout, Campaign, Payout
+from service.analytics import PayoutStatsDelta, payout_analytics
+from service.cache import payout_cache
+from service.indexing import sync_indexes
+from service.outbox import CAMPAIGN_ARCHIVED, CAMPAIGN_RESTORED, campaign_fields, outbox, payout_fields
+from service.versions import bump_versions
+
+# Campaigns stopped (and otherwise untouched) this long are moved to the archive
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+# Campaigns moved per transaction; each batch commits, so writers only ever
+# wait for one batch
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+# Times a batch is retried after losing a lock to another writer, and the
+# base delay (seconds) between tries
+ARCHIVE_BATCH_RETRIES = int(os.getenv("ARCHIVE_BATCH_RETRIES", "3"))
+ARCHIVE_RETRY_DELAY = float(os.getenv("ARCHIVE_RETRY_DELAY", "0.2"))
+
+CAMPAIGN_COLUMNS = ("id", "title", "landing_url", "is_running", "created_at", "updated_at", "country", "version", "owner_id")
+PAYOUT_COLUMNS = ("id", "country", "amount", "campaign_id")
+
+
+def _columns(model, names):
+    return [getattr(model, name) for name in names]
+
+
+def apply_archived_filters(query, filters: Optional[Dict[str, Any]]):
+    """apply_campaign_filters for archived_campaigns; text filters scan with LIKE"""
+    if not filters:
+        return query
+    for field in ("title", "landing_url"):
+        if filters.get(field):
+            query = query.filter(getattr(ArchivedCampaign, field).ilike(f"%{filters[field]}%"))
+    for field in ("is_running", "country", "owner_id"):
+        if filters.get(field) is not None:
+            query = query.filter(getattr(ArchivedCampaign, field) == filters[field])
+    return query
+
+
+class ArchiveService:
+    """
+    Moves campaigns that have been stopped for a while, with their payouts,
+    out of campaigns/payouts into archived_campaigns/archived_payouts, so the
+    hot tables and their indexes only hold the working set.
+
+    Archived campaigns are gone from every regular read (lookups, payouts,
+    routing, analytics) until restored; listings can append them with
+    include_archived.
+    """
+
+    def __init__(self):
+        # One archive run at a time per process; two would pick the same rows
+        self._lock = threading.Lock()
+
+    def archive_batch(self, db: Session, cutoff: datetime, batch_size: int = ARCHIVE_BATCH_SIZE) -> List[int]:
+        """
+        Archive up to batch_size campaigns stopped and unchanged since cutoff,
+        in one transaction; returns the ids actually moved.
+
+        A candidate started or edited after it was picked no longer matches,
+        so every move and delete repeats the predicates, and everything after
+        the first move (payout summary, events, caches) only covers the rows
+        it returned. Postgres also locks the candidates until commit.
+        """
+        stale = (Campaign.is_running.is_(False), Campaign.updated_at < cutoff)
+        candidates = db.scalars(
+            select(Campaign.id)
+            .where(*stale)
+            .order_by(Campaign.updated_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not candidates:
+            return []
+
+        try:
+            campaign_ids = db.scalars(
+                insert(ArchivedCampaign)
+                .from_select(
+                    CAMPAIGN_COLUMNS + ("archived_at",),
+                    select(*_columns(Campaign, CAMPAIGN_COLUMNS), literal(datetime.utcnow()))
+                    .where(Campaign.id.in_(candidates), *stale),
+                )
+                .returning(ArchivedCampaign.id)
+            ).all()
+            if not campaign_ids:
+                db.rollback()
+                return []
+            # Still stopped and stale: the moved rows, re-checked in each statement
+            moved = select(Campaign.id).where(Campaign.id.in_(campaign_ids), *stale)
+            stats = PayoutStatsDelta()
+            for country, count, total, low, high in payout_analytics.campaign_payout_groups(db, campaign_ids):
+                stats.remove_group(country, False, count, total, low, high)
+            db.execute(insert(ArchivedPayout).from_select(
+                PAYOUT_COLUMNS,
+                select(*_columns(Payout, PAYOUT_COLUMNS)).where(Payout.campaign_id.in_(moved)),
+            ))
+            db.execute(
+                delete(Payout).where(Payout.campaign_id.in_(moved)),
+                execution_options={"synchronize_session": False},
+            )
+            db.execute(
+                delete(Campaign).where(Campaign.id.in_(campaign_ids), *stale),
+                execution_options={"synchronize_session": False},
+            )
+            payout_analytics.apply(db, stats)
+            version = bump_versions(db)
+            outbox.record(db, [(CAMPAIGN_ARCHIVED, campaign_id, {"id": campaign_id}) for campaign_id in campaign_ids])
+            db.commit()
+        except OperationalError:
+            # Lock timeouts and conflicts with other writers; archive_stale retries
+            db.rollback()
+            raise
+        except Exception as e:
+            db.rollback()
+            raise ValueError(f"Error archiving campaigns: {str(e)}")
+        for campaign_id in campaign_ids:
+            payout_cache.invalidate(campaign_id)
+        sync_indexes(db, campaign_ids, version)
+        return campaign_ids
+
+    def _archive_batch_with_retries(self, db: Session, cutoff: datetime, batch_size: int) -> List[int]:
+        for attempt in range(ARCHIVE_BATCH_RETRIES + 1):
+            try:
+                return self.archive_batch(db, cutoff, batch_size)
+            except OperationalError as e:
+                if attempt == ARCHIVE_BATCH_RETRIES:
+                    raise ValueError(f"Error archiving campaigns: {str(e)}")
+                time.sleep(ARCHIVE_RETRY_DELAY * (attempt + 1))
+
+    def archive_stale(
+        self,
+        db: Session,
+        days: int = ARCHIVE_AFTER_DAYS,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+        pause: float = 0.0,
+    ) -> int:
+        """
+        Archive every campaign stopped for `days`, batch by batch; returns how
+        many were moved. `pause` seconds between batches leave room for other
+        writers on a busy database. A batch that loses a lock to another
+        writer is rolled back and retried, up to ARCHIVE_BATCH_RETRIES times.
+        """
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        archived = 0
+        with self._lock:
+            while True:
+                campaign_ids = self._archive_batch_with_retries(db, cutoff, batch_size)
+                if not campaign_ids:
+                    return archived
+                archived += len(campaign_ids)
+                if pause:
+                    time.sleep(pause)
+
+    def restore(self, db: Session, campaign_id: int) -> Optional[Campaign]:
+        """Move an archived campaign and its payouts back; None if it isn't archived"""
+        archived = db.get(ArchivedCampaign, campaign_id)
+        if archived is None:
+            return None
+
+        try:
+            db.execute(insert(Campaign).from_select(
+                CAMPAIGN_COLUMNS,
+                select(*_columns(ArchivedCampaign, CAMPAIGN_COLUMNS)).where(ArchivedCampaign.id == campaign_id),
+            ))
+            db.execute(insert(Payout).from_select(
+                PAYOUT_COLUMNS,
+                select(*_columns(ArchivedPayout, PAYOUT_COLUMNS)).where(ArchivedPayout.campaign_id == campaign_id),
+            ))
+            db.execute(delete(ArchivedPayout).where(ArchivedPayout.campaign_id == campaign_id))
+            db.delete(archived)
+            stats = PayoutStatsDelta()
+            for country, count, total, low, high in payout_analytics.campaign_payout_groups(db, [campaign_id]):
+                stats.add_group(country, archived.is_running, count, total, low, high)
+            payout_analytics.apply(db, stats)
+            # Also moves updated_at, so the next archive run doesn't take it straight back
+            version = bump_versions(db, [campaign_id])
+            campaign = db.get(Campaign, campaign_id)
+            restored = campaign_fields(campaign)
+            restored["payouts"] = [payout_fields(payout) for payout in campaign.payouts]
+            outbox.record(db, [(CAMPAIGN_RESTORED, campaign_id, restored)])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise ValueError(f"Error restoring campaign: {str(e)}")
+        payout_cache.invalidate(campaign_id)
+        sync_indexes(db, [campaign_id], version)
+        db.refresh(campaign)
+        return campaign
+
+    def count_archived(self, db: Session) -> int:
+        return db.scalar(select(func.count(ArchivedCampaign.id)))
+
+    def get_archived_rows(self, db: Session, skip: int, limit: int, filters: Dict[str, Any] = None) -> List[dict]:
+        """Archived campaigns in the Campaign schema's shape, by id"""
+        query = select(
+            ArchivedCampaign.title,
+            ArchivedCampaign.landing_url,
+            ArchivedCampaign.is_running,
+            ArchivedCampaign.country,
+            ArchivedCampaign.id,
+        )
+        query = apply_archived_filters(query, filters).order_by(ArchivedCampaign.id).offset(skip).limit(limit)
+        conn = db.connection()
+        campaigns = []
+        by_id = {}
+        for title, landing_url, is_running, country, campaign_id in conn.execute(query):
+            campaign = {
+                "title": title,
+                "landing_url": landing_url,
+                "is_running": is_running,
+                "country": country,
+                "id": campaign_id,
+                "payouts": [],
+            }
+            campaigns.append(campaign)
+            by_id[campaign_id] = campaign["payouts"]
+        if by_id:
+            payouts = conn.execute(
+                select(ArchivedPayout.country, ArchivedPayout.amount, ArchivedPayout.id, ArchivedPayout.campaign_id)
+                .where(ArchivedPayout.campaign_id.in_(list(by_id)))
+                .order_by(ArchivedPayout.campaign_id, ArchivedPayout.id)
+            )
+            for country, amount, payout_id, campaign_id in payouts:
+                by_id[campaign_id].append({"country": country, "amount": amount, "id": payout_id, "campaign_id": campaign_id})
+        return campaigns
+
+
+archive_service = ArchiveService()
@@ -0,0 +1,129 @@
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import Country
+from schemas.schema import Campaign as CampaignSchema, CampaignCreate, CampaignUpdate, Payout as PayoutSchema, PayoutCreate, PayoutUpdate
+from service.archive import archive_service
+from service.service import campaign_service, payout_service
+
+# The async services run the sync ones inside AsyncSession.run_sync: queries
+# go through the async driver, while validation, cache invalidation and the
+# rest of the write rules stay in service.py. ORM results are turned into
+# schemas before leaving run_sync, because lazy loads can't happen from async
+# code once the greenlet has returned.
+
+def _campaign(campaign) -> Optional[CampaignSchema]:
+    return CampaignSchema.model_validate(campaign) if campaign is not None else None
+
+def _payout(payout) -> Optional[PayoutSchema]:
+    return PayoutSchema.model_validate(payout) if payout is not None else None
+
+class AsyncCampaignService:
+    async def create_campaign(self, db: AsyncSession, campaign: CampaignCreate) -> CampaignSchema:
+        return await db.run_sync(
+            lambda session: _campaign(campaign_service.create_campaign(session, campaign))
+        )
+
+    async def get_campaigns(self, db: AsyncSession, skip: int = 0, limit: int = 100, filters: Dict[str, Any] = None) -> List[CampaignSchema]:
+        return await db.run_sync(
+            lambda session: [_campaign(c) for c in campaign_service.get_campaigns(session, skip, limit, filters)]
+        )
+
+    async def get_campaign_rows(
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Dict[str, Any] = None,
+        include_archived: bool = False
+    ) -> List[dict]:
+        return await db.run_sync(
+            lambda session: campaign_service.get_campaign_rows(session, skip, limit, filters, include_archived)
+        )
+
+    async def get_campaigns_page(
+        self,
+        db: AsyncSession,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        filters: Dict[str, Any] = None
+    ) -> Tuple[List[CampaignSchema], Optional[str]]:
+        def page(session):
+            items, next_cursor = campaign_service.get_campaigns_page(session, limit, cursor, sort, filters)
+            return [_campaign(c) for c in items], next_cursor
+        return await db.run_sync(page)
+
+    async def get_collection_version(self, db: AsyncSession) -> int:
+        return await db.run_sync(campaign_service.get_collection_version)
+
+    async def get_campaign_version(self, db: AsyncSession, campaign_id: int) -> Optional[int]:
+        return await db.run_sync(lambda session: campaign_service.get_campaign_version(session, campaign_id))
+
+    async def get_campaign(self, db: AsyncSession, campaign_id: int) -> Optional[CampaignSchema]:
+        return await db.run_sync(
+            lambda session: _campaign(campaign_service.get_campaign(session, campaign_id))
+        )
+
+    async def update_campaign(self, db: AsyncSession, campaign_id: int, campaign_update: CampaignUpdate) -> Optional[CampaignSchema]:
+        return await db.run_sync(
+            lambda session: _campaign(campaign_service.update_campaign(session, campaign_id, campaign_update))
+        )
+
+    async def restore_campaign(self, db: AsyncSession, campaign_id: int) -> Optional[CampaignSchema]:
+        return await db.run_sync(lambda session: _campaign(archive_service.restore(session, campaign_id)))
+
+    async def delete_campaign(self, db: AsyncSession, campaign_id: int) -> bool:
+        return await db.run_sync(lambda session: campaign_service.delete_campaign(session, campaign_id))
+
+    async def toggle_campaign(self, db: AsyncSession, campaign_id: int) -> Optional[CampaignSchema]:
+        return await db.run_sync(
+            lambda session: _campaign(campaign_service.toggle_campaign(session, campaign_id))
+        )
+
+    async def set_campaigns_state(
+        self,
+        db: AsyncSession,
+        is_running: bool,
+        ids: Optional[List[int]] = None,
+        filters: Dict[str, Any] = None
+    ) -> List[int]:
+        return await db.run_sync(
+            lambda session: campaign_service.set_campaigns_state(session, is_running, ids, filters)
+        )
+
+class AsyncPayoutService:
+    async def create_payout(self, db: AsyncSession, campaign_id: int, payout: PayoutCreate) -> PayoutSchema:
+        return await db.run_sync(
+            lambda session: _payout(payout_service.create_payout(session, campaign_id, payout))
+        )
+
+    async def update_payout(self, db: AsyncSession, payout_id: int, payout_update: PayoutUpdate) -> Optional[PayoutSchema]:
+        return await db.run_sync(
+            lambda session: _payout(payout_service.update_payout(session, payout_id, payout_update))
+        )
+
+    async def replace_payouts(self, db: AsyncSession, campaign_id: int, payouts: List[PayoutCreate]) -> Optional[List[PayoutSchema]]:
+        def replace(session):
+            result = payout_service.replace_payouts(session, campaign_id, payouts)
+            return [_payout(p) for p in result] if result is not None else None
+        return await db.run_sync(replace)
+
+    async def get_campaign_payouts(self, db: AsyncSession, campaign_id: int) -> List[PayoutSchema]:
+        return await db.run_sync(
+            lambda session: [_payout(p) for p in payout_service.get_campaign_payouts(session, campaign_id)]
+        )
+
+    async def get_campaign_payout_rows(self, db: AsyncSession, campaign_id: int) -> List[dict]:
+        return await db.run_sync(lambda session: payout_service.get_campaign_payout_rows(session, campaign_id))
+
+    async def get_country_payout(self, db: AsyncSession, campaign_id: int, country: Country) -> Optional[PayoutSchema]:
+        return await db.run_sync(
+            lambda session: payout_service.get_country_payout(session, campaign_id, country)
+        )
+
+    async def delete_payout(self, db: AsyncSession, payout_id: int) -> bool:
+        return await db.run_sync(lambda session: payout_service.delete_payout(session, payout_id))
+
+# Create singleton instances
+async_campaign_service = AsyncCampaignService()
+async_payout_service = AsyncPayoutService()
@@ -1,36 +1,36 @@
-from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
+from auth.jwt_handler import create_access_token, invalidate_user
 from models.models import User
 from schemas.auth import UserCreate, Token
 
-SECRET_KEY = "your-secret-key"
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
-
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
-
 class AuthService:
-    def create_user(self, db: Session, user: UserCreate):
+    def create_user(self, db: Session, user: UserCreate, hashed_password: Optional[str] = None):
         db_user = User(email=user.email)
-        db_user.set_password(user.password)
+        if hashed_password is None:
+            db_user.set_password(user.password)
+        else:
+            db_user.hashed_password = hashed_password
         db.add(db_user)
         db.commit()
+        invalidate_user(db_user.email)
         return db_user
+
+    def get_user_by_email(self, db: Session, email: str) -> Optional[User]:
+        return db.query(User).filter(User.email == email).first()
+
+    def update_password_hash(self, db: Session, user: User, hashed_password: str) -> None:
+        user.hashed_password = hashed_password
+        db.commit()
+        invalidate_user(user.email)
         
     def authenticate_user(self, db: Session, email: str, password: str):
-        user = db.query(User).filter(User.email == email).first()
+        user = self.get_user_by_email(db, email)
         if not user or not user.check_password(password):
             return False
         return user
         
     def create_access_token(self, data: dict):
-        to_encode = data.copy()
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-        to_encode.update({"exp": expire})
-        return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+        return create_access_token(data)
 
 auth_service = AuthService()
\ No newline at end of file
@@ -0,0 +1,175 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set
+
+MISSING = object()
+
+
+class PayoutCache:
+    """
+    Bounded LRU + TTL cache for (campaign_id, country) -> payout lookups.
+
+    The cache is per process; writes in PayoutService/CampaignService
+    invalidate it after commit, and the TTL bounds how long another worker's
+    writes can stay invisible here. A generation counter stops a reader that
+    started before an invalidation from storing the value it read.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 60.0, enabled: bool = True):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._by_campaign: Dict[int, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, campaign_id: int, country: str) -> Any:
+        """Return the cached value, or MISSING"""
+        if not self.enabled:
+            return MISSING
+        key = (campaign_id, country)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, campaign_id: int, country: str, value: Any, generation: int) -> None:
+        if not self.enabled:
+            return
+        key = (campaign_id, country)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            self._by_campaign.setdefault(campaign_id, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, campaign_id: int, country: Optional[str] = None) -> None:
+        """Drop one (campaign, country) entry, or every entry of the campaign"""
+        with self._lock:
+            self._generation += 1
+            if country is not None:
+                self._remove((campaign_id, country))
+                return
+            for key in list(self._by_campaign.get(campaign_id, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._by_campaign.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        if self._entries.pop(key, None) is None:
+            return
+        campaign_keys = self._by_campaign.get(key[0])
+        if campaign_keys is not None:
+            campaign_keys.discard(key)
+            if not campaign_keys:
+                del self._by_campaign[key[0]]
+
+
+class TTLCache:
+    """
+    Bounded LRU cache where every entry carries its own expiry time
+    (time.time() based, so it can be set straight from a JWT 'exp').
+    """
+
+    def __init__(self, maxsize: int = 10000, enabled: bool = True):
+        self.maxsize = maxsize
+        self.enabled = enabled
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or MISSING"""
+        if not self.enabled:
+            return MISSING
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, expires_at: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+payout_cache = PayoutCache(
+    maxsize=int(os.getenv("PAYOUT_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("PAYOUT_CACHE_TTL", "60")),
+    enabled=os.getenv("PAYOUT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes"),
+)
@@ -0,0 +1,355 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import String, select, type_coerce
+from sqlalchemy.orm import Session, selectinload
+
+from database.database import COUNTRIES_BY_CODE, COUNTRY_CODES
+from models.models import Campaign, Payout
+from service.cache import MISSING, TTLCache
+from service.indexing import CampaignIndex, register
+from service.versions import get_campaign_version
+
+EXCHANGE_RATES_FILE = os.getenv(
+    "EXCHANGE_RATES_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database", "exchange_rates.json"),
+)
+# Campaigns whose payouts are converted per numpy batch when building the index
+NORMALIZE_BATCH_SIZE = 2000
+NORMALIZED_CACHE_TTL = float(os.getenv("NORMALIZED_CACHE_TTL", "300"))
+# Seconds between checks for writes made by other processes (see CampaignIndex)
+NORMALIZED_SYNC_INTERVAL = float(os.getenv("NORMALIZED_SYNC_INTERVAL", "1.0"))
+
+# Stable country -> position mapping shared by every rate table
+COUNTRY_INDEX = {code: i for i, code in enumerate(sorted(COUNTRY_CODES))}
+
+
+def _currency_alternatives(currency_code: str) -> List[str]:
+    """'HTG / USD' -> ['HTG', 'USD']; countries.json lists some dual currencies that way"""
+    return [code.strip() for code in currency_code.split("/") if code.strip() and code.strip() != "-"]
+
+
+class RateTable:
+    """
+    Exchange rates from a local JSON file, as currency units per one unit
+    of `base`, plus the per-country rate vector used to convert whole
+    result sets at once.
+    """
+
+    def __init__(self, base: str, rates: Dict[str, float], version: str):
+        self.base = base
+        self.rates = rates
+        self.version = version
+        self.country_currency: Dict[str, Optional[str]] = {}
+        # NaN where the country's currency has no rate
+        self.country_rates = np.full(len(COUNTRY_INDEX), np.nan)
+        for code, position in COUNTRY_INDEX.items():
+            currency = next(
+                (c for c in _currency_alternatives(COUNTRIES_BY_CODE[code]["CURRENCY_CODE"]) if c in rates),
+                None,
+            )
+            self.country_currency[code] = currency
+            if currency is not None:
+                self.country_rates[position] = rates[currency]
+
+    @classmethod
+    def from_file(cls, path: str) -> "RateTable":
+        with open(path, "rb") as f:
+            raw = f.read()
+        data = json.loads(raw)
+        rates = {code: float(rate) for code, rate in data["rates"].items() if float(rate) > 0}
+        # The digest catches edits that forgot to bump "version"
+        version = f"{data.get('version', 'unversioned')}-{hashlib.sha256(raw).hexdigest()[:8]}"
+        return cls(data["base"], rates, version)
+
+    def country_positions(self, countries: Sequence) -> np.ndarray:
+        return np.fromiter((COUNTRY_INDEX[c] for c in countries), dtype=np.intp, count=len(countries))
+
+    def normalize(self, countries: Sequence, amounts: Sequence[float]) -> np.ndarray:
+        """Convert amounts paid in each country's currency to the base currency (NaN if unknown)"""
+        return np.asarray(amounts, dtype=np.float64) / self.country_rates[self.country_positions(countries)]
+
+
+_rate_lock = threading.Lock()
+_rate_table: Optional[RateTable] = None
+_rate_mtime: Optional[float] = None
+
+
+def get_rate_table() -> RateTable:
+    """The current rate table, loaded on first use and reloaded when the file changes"""
+    global _rate_table, _rate_mtime
+    mtime = os.stat(EXCHANGE_RATES_FILE).st_mtime
+    if _rate_table is not None and mtime == _rate_mtime:
+        return _rate_table
+    with _rate_lock:
+        if _rate_table is None or mtime != _rate_mtime:
+            _rate_table = RateTable.from_file(EXCHANGE_RATES_FILE)
+            _rate_mtime = mtime
+        return _rate_table
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+class NormalizedPayoutIndex:
+    """
+    Best (highest) normalized payout of every campaign, sorted best first,
+    for one rate table. Immutable: updates build a new instance, so lookups
+    holding the old one are never disturbed.
+    """
+
+    def __init__(self, campaign_ids: np.ndarray, best: np.ndarray, is_running: np.ndarray, presorted: bool = False):
+        if presorted:
+            self.campaign_ids, self.best, self.is_running = campaign_ids, best, is_running
+            return
+        order = np.lexsort((campaign_ids, -best))
+        self.campaign_ids = campaign_ids[order]
+        self.best = best[order]
+        self.is_running = is_running[order]
+
+    @staticmethod
+    def _best_per_campaign(campaigns, rows, rates: RateTable) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (campaign ids, best normalized payout, is_running) for `campaigns`
+        ((id, is_running) by id) from their payout `rows` ((campaign_id,
+        country, amount) grouped by campaign); NaN best where no payout has
+        a known rate, campaigns without payouts left out.
+        """
+        if not rows:
+            return np.empty(0, np.int64), np.empty(0), np.empty(0, bool)
+        row_campaigns, row_countries, row_amounts = zip(*rows)
+        campaign_ids = np.array(row_campaigns, dtype=np.int64)
+        amounts = rates.normalize(row_countries, row_amounts)
+        # Rows are grouped by campaign, so reduceat over group starts gives
+        # per-campaign maxima; fmax ignores payouts with no known rate
+        starts = np.flatnonzero(np.r_[True, campaign_ids[1:] != campaign_ids[:-1]])
+        group_ids = campaign_ids[starts]
+        batch_ids, batch_running = (np.array(column) for column in zip(*campaigns))
+        running = batch_running.astype(bool)[np.searchsorted(batch_ids, group_ids)]
+        return group_ids, np.fmax.reduceat(amounts, starts), running
+
+    @staticmethod
+    def _payout_rows():
+        return select(Payout.campaign_id, type_coerce(Payout.country, String), Payout.amount)
+
+    @classmethod
+    def build(cls, db: Session, rates: RateTable) -> "NormalizedPayoutIndex":
+        # Plain Core rows on the session's connection: ORM row handling and
+        # enum conversion would cost more than the conversion itself
+        conn = db.connection()
+        ids_parts, best_parts, running_parts = [], [], []
+        last_id = 0
+        while True:
+            campaigns = conn.execute(
+                select(Campaign.id, Campaign.is_running)
+                .where(Campaign.id > last_id)
+                .order_by(Campaign.id)
+                .limit(NORMALIZE_BATCH_SIZE)
+            ).all()
+            if not campaigns:
+                break
+            last_id = campaigns[-1][0]
+            rows = conn.execute(
+                cls._payout_rows()
+                .where(Payout.campaign_id.between(campaigns[0][0], last_id))
+                .order_by(Payout.campaign_id)
+            ).all()
+            group_ids, best, running = cls._best_per_campaign(campaigns, rows, rates)
+            ids_parts.append(group_ids)
+            best_parts.append(best)
+            running_parts.append(running)
+
+        if not ids_parts:
+            return cls(np.empty(0, np.int64), np.empty(0), np.empty(0, bool))
+        campaign_ids = np.concatenate(ids_parts)
+        best = np.concatenate(best_parts)
+        running = np.concatenate(running_parts)
+        known = ~np.isnan(best)
+        return cls(campaign_ids[known], best[known], running[known])
+
+    def reloaded(self, db: Session, rates: RateTable, campaign_ids: List[int]) -> "NormalizedPayoutIndex":
+        """A copy with the given campaigns re-read from the database (dropped if gone)"""
+        conn = db.connection()
+        campaigns = conn.execute(
+            select(Campaign.id, Campaign.is_running).where(Campaign.id.in_(campaign_ids)).order_by(Campaign.id)
+        ).all()
+        rows = []
+        if campaigns:
+            rows = conn.execute(
+                self._payout_rows()
+                .where(Payout.campaign_id.in_([campaign_id for campaign_id, _ in campaigns]))
+                .order_by(Payout.campaign_id)
+            ).all()
+        new_ids, new_best, new_running = self._best_per_campaign(campaigns, rows, rates)
+        known = ~np.isnan(new_best)
+        new_ids, new_best, new_running = new_ids[known], new_best[known], new_running[known]
+        order = np.lexsort((new_ids, -new_best))
+        new_ids, new_best, new_running = new_ids[order], new_best[order], new_running[order]
+
+        keep = ~np.isin(self.campaign_ids, campaign_ids)
+        ids, best, running = self.campaign_ids[keep], self.best[keep], self.is_running[keep]
+        # Insert points in (-best, id) order: the run of equal best values,
+        # then by id within it
+        negated = -best
+        low = np.searchsorted(negated, -new_best, "left")
+        high = np.searchsorted(negated, -new_best, "right")
+        positions = [
+            start + int(np.searchsorted(ids[start:end], campaign_id))
+            for start, end, campaign_id in zip(low.tolist(), high.tolist(), new_ids.tolist())
+        ]
+        return NormalizedPayoutIndex(
+            np.insert(ids, positions, new_ids),
+            np.insert(best, positions, new_best),
+            np.insert(running, positions, new_running),
+            presorted=True,
+        )
+
+    def select(
+        self,
+        min_payout: Optional[float] = None,
+        max_payout: Optional[float] = None,
+        is_running: Optional[bool] = None,
+        ascending: bool = False,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        mask = np.ones(len(self.best), dtype=bool)
+        if min_payout is not None:
+            mask &= self.best >= min_payout
+        if max_payout is not None:
+            mask &= self.best <= max_payout
+        if is_running is not None:
+            mask &= self.is_running == is_running
+        ids, best = self.campaign_ids[mask], self.best[mask]
+        if ascending:
+            ids, best = ids[::-1], best[::-1]
+        return ids, best
+
+
+class NormalizedPayoutTracker(CampaignIndex):
+    """
+    Keeps a NormalizedPayoutIndex current: writes swap in a copy with the
+    touched campaigns re-read, other processes' writes are caught up from
+    the outbox (see CampaignIndex), and a new rate table is picked up by a
+    background rebuild, with the old (rates, index) pair served meanwhile.
+
+    Always built and caught up from the primary, whatever session the
+    request reads with, so replica and primary readers share one index.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.current: Optional[Tuple[RateTable, NormalizedPayoutIndex]] = None
+
+    def sync_interval(self) -> float:
+        return NORMALIZED_SYNC_INTERVAL
+
+    def stale(self) -> bool:
+        current = self.current
+        return current is not None and current[0].version != get_rate_table().version
+
+    def _load(self, db: Session):
+        rates = get_rate_table()
+        return rates, NormalizedPayoutIndex.build(db, rates)
+
+    def _install(self, state) -> None:
+        self.current = state
+
+    def _reload(self, db: Session, campaign_ids: List[int]) -> None:
+        rates, index = self.current
+        self.current = (rates, index.reloaded(db, rates, campaign_ids))
+
+    def _reset(self) -> None:
+        self.current = None
+
+
+normalized_index = register(NormalizedPayoutTracker())
+
+
+class CurrencyService:
+    def __init__(self):
+        # (rates version, campaign id, campaign version) -> normalized payout list
+        self.payout_cache = TTLCache(maxsize=int(os.getenv("NORMALIZED_CACHE_SIZE", "10000")))
+
+    def get_normalized_payouts(self, db: Session, campaign_id: int) -> Optional[Dict[str, Any]]:
+        """A campaign's payouts converted to the base currency, or None if it doesn't exist"""
+        version = get_campaign_version(db, campaign_id)
+        if version is None:
+            return None
+        rates = get_rate_table()
+        key = (rates.version, campaign_id, version)
+        cached = self.payout_cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+        payouts = db.execute(
+            select(Payout.id, Payout.campaign_id, Payout.country, Payout.amount)
+            .where(Payout.campaign_id == campaign_id)
+            .order_by(Payout.id)
+        ).all()
+        converted = rates.normalize([p.country for p in payouts], [p.amount for p in payouts])
+        result = {
+            "base": rates.base,
+            "rates_version": rates.version,
+            "payouts": [
+                {
+                    "id": p.id,
+                    "campaign_id": p.campaign_id,
+                    "country": p.country.value,
+                    "amount": p.amount,
+                    "currency": rates.country_currency[p.country.value],
+                    "amount_base": _optional(value),
+                }
+                for p, value in zip(payouts, converted)
+            ],
+        }
+        self.payout_cache.set(key, result, time.time() + NORMALIZED_CACHE_TTL)
+        return result
+
+    def get_index(self) -> Tuple[RateTable, NormalizedPayoutIndex]:
+        """The current (rate table, index) pair, following the primary"""
+        normalized_index.ensure_current()
+        return normalized_index.current
+
+    def get_campaigns_by_payout(
+        self,
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        min_payout: Optional[float] = None,
+        max_payout: Optional[float] = None,
+        is_running: Optional[bool] = None,
+        ascending: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Campaigns ordered and filtered by their best payout in the base
+        currency. The order comes from the index (the primary's state); the
+        campaigns themselves are read with `db`, and any it doesn't have yet
+        are left off the page.
+        """
+        rates, index = self.get_index()
+        ids, best = index.select(min_payout, max_payout, is_running, ascending)
+        page_ids = ids[skip:skip + limit].tolist()
+        page_best = best[skip:skip + limit].tolist()
+
+        campaigns = {
+            campaign.id: campaign
+            for campaign in db.query(Campaign).options(selectinload(Campaign.payouts)).filter(Campaign.id.in_(page_ids))
+        }
+        items = []
+        for campaign_id, value in zip(page_ids, page_best):
+            campaign = campaigns.get(campaign_id)
+            if campaign is not None:
+                items.append({"campaign": campaign, "best_payout_base": value})
+        return {"base": rates.base, "rates_version": rates.version, "total": len(ids), "items": items}
+
+    def clear(self) -> None:
+        self.payout_cache.clear()
+        normalized_index.clear()
+
+
+currency_service = CurrencyService()
@@ -0,0 +1,231 @@
+import logging
+from abc import ABC, abstractmethod
+import threading
+import time
+from typing import Any, Iterable, List, Optional, Set
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from database.database import SessionLocal
+from models.models import ChangeEvent
+from service.outbox import outbox
+from service.versions import get_collection_version
+
+logger = logging.getLogger(__name__)
+
+# Campaign ids per IN query when reloading campaigns after a write
+RELOAD_CHUNK = 5000
+
+
+class CampaignIndex(ABC):
+    """
+    Base for in-memory indexes over campaigns that follow the primary
+    without rebuilding on every write (see service.routing, service.currency).
+
+    Write paths call sync_indexes() after committing with the collection
+    version their bump produced; each index reloads the touched campaigns
+    and, when that version directly follows its own, moves along. Anything
+    else (writes from another worker, two local writers syncing out of
+    order) leaves a gap the next check fills from the outbox: only the
+    campaigns with change events past the index's outbox position are
+    reloaded. A full rebuild is left for when those events were pruned, a
+    write bypassed the outbox, or stale() says so, and runs on a background
+    thread while lookups keep serving the current index.
+
+    Subclasses implement the four hooks below; all but _load() run under
+    the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.version: Optional[int] = None
+        # Highest change_events id the index reflects
+        self.position = 0
+        self._checked_at = 0.0
+        # Campaigns synced while a build is loading, reloaded once it swaps in
+        self._replay: Optional[Set[int]] = None
+        self._rebuilding: Optional[threading.Thread] = None
+        # Bumped by clear(), so a build started before it is thrown away
+        self._generation = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.version is not None
+
+    def sync_interval(self) -> float:
+        """Seconds between checks for writes made by other processes"""
+        return 1.0
+
+    def stale(self) -> bool:
+        """Whether the index needs a full rebuild for reasons of its own (checked on every lookup)"""
+        return False
+
+    @abstractmethod
+    def _load(self, db: Session) -> Any:
+        """Read every campaign the index covers; runs without the lock"""
+
+    @abstractmethod
+    def _install(self, state: Any) -> None:
+        """Swap in what _load() returned"""
+
+    @abstractmethod
+    def _reload(self, db: Session, campaign_ids: List[int]) -> None:
+        """Replace the given campaigns' entries with their current rows, dropping ones that are gone"""
+
+    @abstractmethod
+    def _reset(self) -> None:
+        """Drop everything, back to an empty index"""
+
+    def build(self, db: Session) -> None:
+        """(Re)load every campaign; lookups use the old index until it swaps in"""
+        with self._lock:
+            generation = self._generation
+            self._replay = set()
+        # Read the outbox end and version first: a write committed after them
+        # is either in the load or caught up from the outbox later
+        position = outbox.latest_offset(db)
+        version = get_collection_version(db)
+        state = self._load(db)
+        with self._lock:
+            replay, self._replay = self._replay, None
+            if generation != self._generation:
+                return
+            self._install(state)
+            self.version, self.position = version, position
+            self._checked_at = time.monotonic()
+            if replay:
+                self._reload_all(db, list(replay))
+
+    def ensure_current(self, db: Optional[Session] = None) -> None:
+        """
+        Bring the index up to date before a lookup. `db` must be a primary
+        session; without one, a session is opened only if a check is due.
+        """
+        if self.ready and self.stale():
+            self._rebuild_in_background()
+        if self.ready and time.monotonic() - self._checked_at < self.sync_interval():
+            return
+        if not self.ready:
+            # Nothing to serve yet, so this lookup waits for the build
+            with self._lock:
+                if not self.ready:
+                    self._with_session(db, self.build)
+            return
+        # Someone else is syncing or catching up: serve the index as it is
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._with_session(db, self._catch_up)
+        finally:
+            self._lock.release()
+
+    def sync(self, db: Session, campaign_ids: Iterable[int], version: Optional[int]) -> None:
+        """Reload the given campaigns after a committed write that bumped to `version`"""
+        if not self.ready:
+            return
+        campaign_ids = list(campaign_ids)
+        with self._lock:
+            if self._replay is not None:
+                self._replay.update(campaign_ids)
+            try:
+                self._reload_all(db, campaign_ids)
+            except Exception:
+                # The write itself is committed and in the outbox; the next
+                # lookup catches up from there
+                self._checked_at = 0.0
+                return
+            if version is not None and self.version is not None and version == self.version + 1:
+                self.version = version
+            elif version is None or self.version is None or version > self.version:
+                self._checked_at = 0.0
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a background rebuild, if one is running; False on timeout"""
+        thread = self._rebuilding
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+            self.version = None
+            self.position = 0
+            self._checked_at = 0.0
+            self._replay = None
+            self._generation += 1
+
+    def _with_session(self, db: Optional[Session], action) -> None:
+        if db is not None:
+            action(db)
+            return
+        with SessionLocal() as session:
+            action(session)
+
+    def _catch_up(self, db: Session) -> None:
+        """Reload the campaigns changed since the index's version, from the outbox"""
+        # Outbox end before version: events up to it belong to commits the
+        # version covers, since events are numbered in commit order
+        pruned = outbox.pruned_through(db)
+        latest = max(db.scalar(select(func.max(ChangeEvent.id))) or 0, pruned)
+        version = get_collection_version(db)
+        self._checked_at = time.monotonic()
+        if version == self.version:
+            self.position = max(self.position, latest)
+            return
+        if pruned > self.position:
+            self._rebuild_in_background()
+            return
+        changed = db.execute(
+            select(ChangeEvent.campaign_id, func.max(ChangeEvent.id))
+            .where(ChangeEvent.id > self.position)
+            .group_by(ChangeEvent.campaign_id)
+        ).all()
+        if not changed:
+            # The version moved without events: a write that bypassed the outbox
+            self._rebuild_in_background()
+            return
+        self._reload_all(db, [campaign_id for campaign_id, _ in changed])
+        self.position = max(self.position, max(event_id for _, event_id in changed))
+        if self.version is None or version > self.version:
+            self.version = version
+
+    def _rebuild_in_background(self) -> None:
+        with self._lock:
+            if self._rebuilding is not None and self._rebuilding.is_alive():
+                return
+            self._rebuilding = threading.Thread(
+                target=self._rebuild, name=f"{type(self).__name__}-rebuild", daemon=True
+            )
+            self._rebuilding.start()
+
+    def _rebuild(self) -> None:
+        try:
+            with SessionLocal() as db:
+                self.build(db)
+        except Exception:
+            logger.exception("%s rebuild failed", type(self).__name__)
+            with self._lock:
+                self._checked_at = 0.0
+
+    def _reload_all(self, db: Session, campaign_ids: List[int]) -> None:
+        for start in range(0, len(campaign_ids), RELOAD_CHUNK):
+            self._reload(db, campaign_ids[start:start + RELOAD_CHUNK])
+
+
+_indexes: List[CampaignIndex] = []
+
+
+def register(index: CampaignIndex) -> CampaignIndex:
+    """Have sync_indexes() keep `index` current"""
+    _indexes.append(index)
+    return index
+
+
+def sync_indexes(db: Session, campaign_ids: Iterable[int], version: Optional[int]) -> None:
+    """Apply a committed write to every registered index; call after commit"""
+    campaign_ids = list(campaign_ids)
+    for index in _indexes:
+        index.sync(db, campaign_ids, version)
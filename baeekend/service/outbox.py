@@ -0,0 +1,311 @@
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import AsyncIterator, Iterable, List, Optional, Set, Tuple
+
+import orjson
+from sqlalchemy import delete, event, func, insert, select, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from database.database import SessionLocal
+from models.models import ChangeEvent, CollectionVersion
+
+logger = logging.getLogger(__name__)
+
+CAMPAIGN_CREATED = "campaign.created"
+CAMPAIGN_UPDATED = "campaign.updated"
+CAMPAIGN_DELETED = "campaign.deleted"
+# Moved to / back from the archive tables (service.archive)
+CAMPAIGN_ARCHIVED = "campaign.archived"
+CAMPAIGN_RESTORED = "campaign.restored"
+PAYOUT_CREATED = "payout.created"
+PAYOUT_UPDATED = "payout.updated"
+PAYOUT_DELETED = "payout.deleted"
+PAYOUTS_REPLACED = "payouts.replaced"
+# Sent instead of events the client missed because they were pruned
+RESET = "reset"
+
+# Fallback poll for events written by other processes; writes in this
+# process wake the tail as soon as they commit
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "1.0"))
+OUTBOX_BATCH_SIZE = 500
+# Events buffered per subscriber before a slow client is disconnected
+SSE_CLIENT_BUFFER = int(os.getenv("SSE_CLIENT_BUFFER", "1000"))
+# collection_versions row holding the highest pruned event id
+PRUNED_THROUGH = "change_events.pruned_through"
+
+# Session.info flag: this transaction recorded events
+_PENDING = "outbox_pending"
+
+# (id, type, payload JSON)
+EventRow = Tuple[int, str, str]
+
+
+def campaign_fields(campaign) -> dict:
+    return {
+        "id": campaign.id,
+        "title": campaign.title,
+        "landing_url": campaign.landing_url,
+        "is_running": campaign.is_running,
+        "country": campaign.country,
+    }
+
+
+def payout_fields(payout) -> dict:
+    return {"id": payout.id, "campaign_id": payout.campaign_id, "country": payout.country, "amount": payout.amount}
+
+
+class Outbox:
+    """The change_events table: appended by writes, read by the change feed"""
+
+    def record(self, db: Session, events: Iterable[Tuple[str, int, dict]]) -> None:
+        """
+        Queue (type, campaign_id, payload) events in the caller's transaction.
+
+        Call after bump_versions(): its collection_versions row lock is held
+        until commit, so writers take event ids one transaction at a time and
+        ids commit in order, on Postgres as well as SQLite.
+        """
+        rows = [
+            {"type": event_type, "campaign_id": campaign_id, "payload": orjson.dumps(payload).decode()}
+            for event_type, campaign_id, payload in events
+        ]
+        if rows:
+            db.execute(insert(ChangeEvent), rows)
+            db.info[_PENDING] = True
+
+    def read(self, db: Session, after: int, limit: int = OUTBOX_BATCH_SIZE) -> List[EventRow]:
+        return [
+            tuple(row) for row in db.execute(
+                select(ChangeEvent.id, ChangeEvent.type, ChangeEvent.payload)
+                .where(ChangeEvent.id > after)
+                .order_by(ChangeEvent.id)
+                .limit(limit)
+            )
+        ]
+
+    def latest_offset(self, db: Session) -> int:
+        return max(db.scalar(select(func.max(ChangeEvent.id))) or 0, self.pruned_through(db))
+
+    def pruned_through(self, db: Session) -> int:
+        return db.scalar(select(CollectionVersion.version).where(CollectionVersion.name == PRUNED_THROUGH)) or 0
+
+    def prune(self, db: Session, before: datetime) -> int:
+        """Delete events created before `before`; returns the number deleted"""
+        last = db.scalar(select(func.max(ChangeEvent.id)).where(ChangeEvent.created_at < before))
+        if last is None:
+            return 0
+        deleted = db.execute(delete(ChangeEvent).where(ChangeEvent.id <= last)).rowcount
+        result = db.execute(
+            update(CollectionVersion)
+            .where(CollectionVersion.name == PRUNED_THROUGH)
+            .values(version=last)
+        )
+        if result.rowcount == 0:
+            db.execute(insert(CollectionVersion).values(name=PRUNED_THROUGH, version=last))
+        db.commit()
+        return deleted
+
+
+outbox = Outbox()
+
+
+def _read(after: int, limit: int = OUTBOX_BATCH_SIZE) -> List[EventRow]:
+    with SessionLocal() as db:
+        return outbox.read(db, after, limit)
+
+
+def _offsets() -> Tuple[int, int]:
+    """(latest offset, pruned through)"""
+    with SessionLocal() as db:
+        return outbox.latest_offset(db), outbox.pruned_through(db)
+
+
+class Subscription:
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+        try:
+            # Wakes a reader blocked on get(); a full queue is drained first anyway
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+
+class ChangeFeed:
+    """
+    One outbox tail per process, fanned out to every subscriber.
+
+    The tail runs on the event loop while anyone is subscribed, reading new
+    rows after each local commit that recorded events (and every
+    OUTBOX_POLL_INTERVAL for other processes' writes) and pushing them into
+    per-subscriber queues. A queue that fills up closes its subscription
+    instead of growing: the client reconnects with Last-Event-ID and catches
+    up from the table, so slow clients cost memory only up to the buffer.
+
+    Offsets are ids, so the tail relies on events committing in id order.
+    SQLite's single writer guarantees that; elsewhere it holds because every
+    write records its events after bump_versions() (see Outbox.record).
+    """
+
+    def __init__(self, buffer_size: int = SSE_CLIENT_BUFFER):
+        self.buffer_size = buffer_size
+        self.subscriptions: Set[Subscription] = set()
+        self.position: Optional[int] = None
+        self.disconnected_slow = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        # Set once the running tail knows its starting offset
+        self._positioned: Optional[asyncio.Event] = None
+
+    def notify(self) -> None:
+        """Wake the tail; safe to call from any thread"""
+        loop, wake = self._loop, self._wake
+        if loop is None or wake is None:
+            return
+        try:
+            loop.call_soon_threadsafe(wake.set)
+        except RuntimeError:
+            # Loop already closed
+            pass
+
+    def subscribe(self) -> Subscription:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Subscriptions of a previous loop can't be fed from this one
+            self.subscriptions.clear()
+            self._loop, self._wake, self._task = loop, asyncio.Event(), None
+        subscription = Subscription(self.buffer_size)
+        self.subscriptions.add(subscription)
+        if self._task is None or self._task.done():
+            self.position = None
+            self._positioned = asyncio.Event()
+            self._task = loop.create_task(self._tail(self._positioned))
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.subscriptions.discard(subscription)
+
+    async def close(self) -> None:
+        """End every stream and stop the tail (app shutdown)"""
+        for subscription in list(self.subscriptions):
+            subscription.close()
+        self.subscriptions.clear()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def clear(self) -> None:
+        """Forget subscribers and the tail without awaiting it (tests)"""
+        self.subscriptions.clear()
+        self.position = None
+        self.disconnected_slow = 0
+        self._loop = self._wake = self._task = self._positioned = None
+
+    def _publish(self, row: EventRow) -> None:
+        for subscription in list(self.subscriptions):
+            try:
+                subscription.queue.put_nowait(row)
+            except asyncio.QueueFull:
+                subscription.close()
+                self.subscriptions.discard(subscription)
+                self.disconnected_slow += 1
+
+    async def _tail(self, positioned: asyncio.Event) -> None:
+        try:
+            self.position, _ = await run_in_threadpool(_offsets)
+            positioned.set()
+            # Checked and left without an await in between, so subscribe()
+            # can't add a subscriber to a tail that is about to stop
+            while self.subscriptions:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), OUTBOX_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                while self.subscriptions:
+                    rows = await run_in_threadpool(_read, self.position)
+                    for row in rows:
+                        self.position = row[0]
+                        self._publish(row)
+                    if len(rows) < OUTBOX_BATCH_SIZE:
+                        break
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Change feed tail failed; closing subscriptions")
+            for subscription in list(self.subscriptions):
+                subscription.close()
+            self.subscriptions.clear()
+        finally:
+            positioned.set()
+
+    async def events(
+        self, after: Optional[int] = None, follow: bool = True, heartbeat: float = 15.0
+    ) -> AsyncIterator[Optional[EventRow]]:
+        """
+        Events after offset `after` (from now when None), then live ones if
+        `follow`. Yields None when `heartbeat` seconds pass without events.
+        """
+        # Subscribe, and let the tail fix its starting offset, before catching
+        # up: anything committed later reaches the queue, anything earlier is
+        # read below, and rows seen both ways are skipped by id
+        subscription = self.subscribe() if follow else None
+        try:
+            if subscription is not None:
+                await self._positioned.wait()
+            latest, pruned = await run_in_threadpool(_offsets)
+            if after is None:
+                after = latest
+            elif after < pruned:
+                yield (latest, RESET, orjson.dumps({"offset": latest}).decode())
+                after = latest
+
+            last = after
+            while True:
+                rows = await run_in_threadpool(_read, last)
+                for row in rows:
+                    last = row[0]
+                    yield row
+                if len(rows) < OUTBOX_BATCH_SIZE:
+                    break
+            if subscription is None:
+                return
+
+            while not (subscription.closed and subscription.queue.empty()):
+                try:
+                    row = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if row is None or row[0] <= last:
+                    continue
+                last = row[0]
+                yield row
+        finally:
+            if subscription is not None:
+                self.unsubscribe(subscription)
+
+
+change_feed = ChangeFeed()
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_feed(session):
+    if session.info.pop(_PENDING, False):
+        change_feed.notify()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_pending(session):
+    session.info.pop(_PENDING, None)
@@ -0,0 +1,90 @@
+import bisect
+import os
+from typing import Dict, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database.database import Country
+from models.models import Campaign, Payout
+from service.indexing import CampaignIndex, register
+
+# Seconds between checks of the collection version for writes made by other
+# processes; writes through this process's services are applied immediately
+ROUTING_SYNC_INTERVAL = float(os.getenv("ROUTING_SYNC_INTERVAL", "1.0"))
+
+
+class OfferRoutingIndex(CampaignIndex):
+    """
+    In-memory index of the payouts of running campaigns, kept per country as
+    a list of (-amount, campaign_id) sorted best first, so the top K offers
+    for a country are a slice. Kept current as described on CampaignIndex.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._by_country: Dict[Country, List[Tuple[float, int]]] = {}
+        # campaign id -> (landing_url, {country: amount}) for running campaigns
+        self._campaigns: Dict[int, Tuple[str, Dict[Country, float]]] = {}
+
+    def sync_interval(self) -> float:
+        return ROUTING_SYNC_INTERVAL
+
+    def top(self, db: Session, country: Country, limit: int) -> List[dict]:
+        """The `limit` best-paying running campaigns for a country"""
+        self.ensure_current(db)
+        entries = self._by_country.get(country, ())[:limit]
+        campaigns = self._campaigns
+        offers = []
+        for negative_amount, campaign_id in entries:
+            campaign = campaigns.get(campaign_id)
+            if campaign is not None:
+                offers.append({"campaign_id": campaign_id, "landing_url": campaign[0], "amount": -negative_amount})
+        return offers
+
+    def _load(self, db: Session):
+        by_country: Dict[Country, List[Tuple[float, int]]] = {}
+        campaigns: Dict[int, Tuple[str, Dict[Country, float]]] = {}
+        # Core rows on the session's connection skip ORM row handling
+        for campaign_id, landing_url, country, amount in db.connection().execute(self._running_payouts()):
+            by_country.setdefault(country, []).append((-amount, campaign_id))
+            campaigns.setdefault(campaign_id, (landing_url, {}))[1][country] = amount
+        for entries in by_country.values():
+            entries.sort()
+        return by_country, campaigns
+
+    def _install(self, state) -> None:
+        self._by_country, self._campaigns = state
+
+    def _reset(self) -> None:
+        self._by_country = {}
+        self._campaigns = {}
+
+    def _running_payouts(self):
+        return (
+            select(Campaign.id, Campaign.landing_url, Payout.country, Payout.amount)
+            .join(Payout, Payout.campaign_id == Campaign.id)
+            .where(Campaign.is_running.is_(True))
+        )
+
+    def _reload(self, db: Session, campaign_ids: List[int]) -> None:
+        current: Dict[int, Tuple[str, Dict[Country, float]]] = {}
+        for campaign_id, landing_url, country, amount in db.execute(
+            self._running_payouts().where(Campaign.id.in_(campaign_ids))
+        ):
+            current.setdefault(campaign_id, (landing_url, {}))[1][country] = amount
+
+        for campaign_id in campaign_ids:
+            previous = self._campaigns.pop(campaign_id, None)
+            if previous is not None:
+                for country, amount in previous[1].items():
+                    entries = self._by_country[country]
+                    del entries[bisect.bisect_left(entries, (-amount, campaign_id))]
+            campaign = current.get(campaign_id)
+            if campaign is not None:
+                for country, amount in campaign[1].items():
+                    bisect.insort(self._by_country.setdefault(country, []), (-amount, campaign_id))
+                self._campaigns[campaign_id] = campaign
+
+
+offer_index = register(OfferRoutingIndex())
@@ -0,0 +1,69 @@
+from typing import Any, Dict, Optional
+from sqlalchemy import column, func, select, table
+from database.database import engine
+from models.models import Campaign, CAMPAIGN_SEARCH_TABLE
+
+# Text filters on these columns go through the search index
+SEARCH_FIELDS = ("title", "landing_url")
+# The trigram tokenizer can't match anything shorter than one trigram
+MIN_TRIGRAM_LENGTH = 3
+
+campaigns_fts = table(
+    CAMPAIGN_SEARCH_TABLE,
+    column("rowid"),
+    column("rank"),
+    column(CAMPAIGN_SEARCH_TABLE),
+)
+
+def search_terms(filters: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    if not filters:
+        return {}
+    return {field: filters[field] for field in SEARCH_FIELDS if filters.get(field)}
+
+def _fts_query(terms: Dict[str, str]) -> Optional[str]:
+    """FTS5 query string for the terms long enough to use the trigram index"""
+    clauses = [
+        f'{field} : "{term.replace(chr(34), chr(34) * 2)}"'
+        for field, term in terms.items()
+        if len(term) >= MIN_TRIGRAM_LENGTH
+    ]
+    return " AND ".join(clauses) or None
+
+def _ilike(field: str, term: str):
+    return getattr(Campaign, field).ilike(f"%{term}%")
+
+def apply_search(query, filters: Optional[Dict[str, Any]], ranked: bool = False, dialect: str = None):
+    """
+    Apply the title/landing_url filters to a Campaign Query or select().
+
+    With ranked=True the best matches come first (bm25 on SQLite, trigram
+    similarity on Postgres); otherwise the caller's ordering is untouched.
+    """
+    terms = search_terms(filters)
+    if not terms:
+        return query
+    dialect = dialect or engine.dialect.name
+
+    if dialect == "sqlite":
+        fts_query = _fts_query(terms)
+        for field, term in terms.items():
+            if len(term) < MIN_TRIGRAM_LENGTH:
+                query = query.filter(_ilike(field, term))
+        if fts_query is None:
+            return query
+        match = campaigns_fts.c[CAMPAIGN_SEARCH_TABLE].op("MATCH")(fts_query)
+        if ranked:
+            return (
+                query.join(campaigns_fts, campaigns_fts.c.rowid == Campaign.id)
+                .filter(match)
+                .order_by(campaigns_fts.c.rank, Campaign.id)
+            )
+        return query.filter(Campaign.id.in_(select(campaigns_fts.c.rowid).where(match)))
+
+    for field, term in terms.items():
+        query = query.filter(_ilike(field, term))
+    if ranked and dialect == "postgresql":
+        similarity = [func.similarity(getattr(Campaign, field), term) for field, term in terms.items()]
+        score = similarity[0] if len(similarity) == 1 else func.greatest(*similarity)
+        query = query.order_by(score.desc(), Campaign.id)
+    return query
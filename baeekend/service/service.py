@@ -1,19 +1,193 @@
+import base64
 import json
 import os
-from sqlalchemy.orm import Session
-from typing import List, Dict, Any, Optional
+from collections import defaultdict
+from datetime import datetime
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Dict, Any, Optional, Tuple
 from models.models import Campaign, Payout
-from schemas.schema import CampaignCreate, Campaign as CampaignSchema, CampaignUpdate, PayoutCreate, PayoutUpdate
+from schemas.schema import CampaignCreate, Campaign as CampaignSchema, CampaignUpdate, Payout as PayoutSchema, PayoutCreate, PayoutUpdate
+from service.cache import MISSING, payout_cache
+from service.outbox import (
+    CAMPAIGN_CREATED, CAMPAIGN_DELETED, CAMPAIGN_UPDATED, PAYOUT_CREATED, PAYOUT_DELETED,
+    PAYOUT_UPDATED, PAYOUTS_REPLACED, campaign_fields, outbox, payout_fields,
+)
+from service.analytics import PayoutStatsDelta, payout_analytics
+from service.archive import archive_service
+from service.indexing import sync_indexes
+from service.search import apply_search
+from service.versions import bump_versions, get_campaign_version, get_collection_version
 from database.database import get_country_details, Country
-from sqlalchemy import and_
+from sqlalchemy import and_, delete, func, insert, select, tuple_, update
+
+CURSOR_SORT_KEYS = ("id", "created_at")
+
+# Campaigns fetched per round trip when streaming an export
+EXPORT_BATCH_SIZE = 1000
+
+
+def encode_cursor(sort: str, campaign: Campaign) -> str:
+    """Build an opaque cursor pointing just after the given campaign"""
+    if sort == "created_at":
+        position = [campaign.created_at.isoformat(), campaign.id]
+    else:
+        position = [campaign.id]
+    raw = json.dumps({"s": sort, "p": position}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> list:
+    """Return the (created_at, id) / (id,) position stored in a cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        cursor_sort, position = data["s"], data["p"]
+        if cursor_sort == "created_at":
+            position = [datetime.fromisoformat(position[0]), int(position[1])]
+        else:
+            position = [int(position[0])]
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort:
+        raise ValueError(f"Cursor was issued for sort '{cursor_sort}', not '{sort}'")
+    return position
+
+def apply_keyset(query, cursor: Optional[str], sort: str, limit: int):
+    """Order a campaign Query/select() by the sort key and resume after the cursor.
+
+    Fetches one row more than the page so split_page can tell whether
+    another page exists without a COUNT.
+    """
+    if sort not in CURSOR_SORT_KEYS:
+        raise ValueError(f"Invalid sort key: {sort}")
+
+    if sort == "created_at":
+        key = (Campaign.created_at, Campaign.id)
+    else:
+        key = (Campaign.id,)
+
+    if cursor:
+        position = decode_cursor(cursor, sort)
+        if len(key) == 1:
+            query = query.filter(key[0] > position[0])
+        else:
+            query = query.filter(tuple_(*key) > tuple_(*position))
+
+    return query.order_by(*key).limit(limit + 1)
+
+
+def split_page(rows: List[Campaign], limit: int, sort: str) -> Tuple[List[Campaign], Optional[str]]:
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit and items:
+        next_cursor = encode_cursor(sort, items[-1])
+    return items, next_cursor
+
+
+def apply_campaign_filters(query, filters: Optional[Dict[str, Any]], ranked: bool = False):
+    """Apply the list filters to a Query or a select() over Campaign"""
+    if not filters:
+        return query
+    query = apply_search(query, filters, ranked=ranked)
+    if filters.get("is_running") is not None:
+        query = query.filter(Campaign.is_running == filters["is_running"])
+    if filters.get("country") is not None:
+        query = query.filter(Campaign.country == filters["country"])
+    if filters.get("owner_id") is not None:
+        query = query.filter(Campaign.owner_id == filters["owner_id"])
+    return query
+
+
+def reconcile_payouts(db: Session, campaign_id: int, payouts: List[PayoutCreate], is_running: bool) -> List[Country]:
+    """
+    Make a campaign's stored payouts match `payouts`, touching only what differs.
+
+    Removed countries go out in one DELETE, changed amounts in one
+    executemany UPDATE by primary key and new countries in one INSERT,
+    and the payout summary is adjusted for the same rows; nothing is
+    committed. Returns the countries whose payout changed.
+    """
+    incoming = {}
+    for payout in payouts:
+        if not isinstance(payout.country, Country):
+            raise ValueError(f"Invalid payout country: {payout.country}")
+        if payout.country in incoming:
+            raise ValueError(f"Duplicate payout country: {payout.country}")
+        incoming[payout.country] = payout.amount
+    if not incoming:
+        raise ValueError("Cannot delete the last payout from a campaign")
+
+    stored = {
+        row.country: row
+        for row in db.execute(
+            select(Payout.id, Payout.country, Payout.amount).where(Payout.campaign_id == campaign_id)
+        )
+    }
+    removed_ids, changed, added, touched = [], [], [], []
+    stats = PayoutStatsDelta()
+    for country, row in stored.items():
+        if country not in incoming:
+            removed_ids.append(row.id)
+            touched.append(country)
+            stats.remove(country, is_running, row.amount)
+    for country, amount in incoming.items():
+        row = stored.get(country)
+        if row is None:
+            added.append({"campaign_id": campaign_id, "country": country, "amount": amount})
+            touched.append(country)
+            stats.add(country, is_running, amount)
+        elif row.amount != amount:
+            changed.append({"id": row.id, "amount": amount})
+            touched.append(country)
+            stats.remove(country, is_running, row.amount)
+            stats.add(country, is_running, amount)
+
+    # Deletes first so a country can't collide with the unique index
+    if removed_ids:
+        db.execute(
+            delete(Payout).where(Payout.id.in_(removed_ids)),
+            execution_options={"synchronize_session": False},
+        )
+    if changed:
+        db.execute(update(Payout), changed)
+    if added:
+        db.execute(insert(Payout), added)
+    payout_analytics.apply(db, stats)
+    return touched
+
+
+def _payout_rows():
+    return select(Payout.country, Payout.amount, Payout.id, Payout.campaign_id).order_by(Payout.campaign_id, Payout.id)
+
+
+def _payout_dict(row) -> dict:
+    return {"country": row[0], "amount": row[1], "id": row[2], "campaign_id": row[3]}
+
+
+def payouts_replaced_event(db: Session, campaign_id: int) -> Tuple[str, int, dict]:
+    """Outbox event carrying a campaign's whole payout set as it now stands"""
+    rows = db.execute(_payout_rows().where(Payout.campaign_id == campaign_id))
+    return PAYOUTS_REPLACED, campaign_id, {"campaign_id": campaign_id, "payouts": [_payout_dict(row) for row in rows]}
+
 
 class CampaignService:
    
-    def create_campaign(self, db: Session, campaign: CampaignCreate) -> CampaignSchema:
-        # Validate country enum
+    def validate_campaign(self, campaign: CampaignCreate) -> None:
+        """Enforce the campaign/payout country rules shared by single and bulk creation"""
         if not isinstance(campaign.country, Country):
             raise ValueError(f"Invalid campaign country: {campaign.country}")
-            
+
+        seen_countries = set()
+        for payout in campaign.payouts:
+            if not isinstance(payout.country, Country):
+                raise ValueError(f"Invalid payout country: {payout.country}")
+            if payout.country in seen_countries:
+                raise ValueError(f"Duplicate payout country: {payout.country}")
+            seen_countries.add(payout.country)
+
+    def create_campaign(self, db: Session, campaign: CampaignCreate) -> CampaignSchema:
+        self.validate_campaign(campaign)
+
         # Create campaign with country
         db_campaign = Campaign(
             title=campaign.title,
@@ -24,71 +198,264 @@ class CampaignService:
         db.add(db_campaign)
         db.flush()
 
-        # Validate and process payouts
-        seen_countries = set()
+        stats = PayoutStatsDelta()
+        db_payouts = []
         for payout in campaign.payouts:
-            if not isinstance(payout.country, Country):
-                raise ValueError(f"Invalid payout country: {payout.country}")
-            if payout.country in seen_countries:
-                raise ValueError(f"Duplicate payout country: {payout.country}")
-            seen_countries.add(payout.country)
-            
             db_payout = Payout(
                 country=payout.country,
                 amount=payout.amount,
                 campaign_id=db_campaign.id
             )
             db.add(db_payout)
+            db_payouts.append(db_payout)
+            stats.add(payout.country, db_campaign.is_running, payout.amount)
 
         try:
+            payout_analytics.apply(db, stats)
+            db.flush()
+            created = campaign_fields(db_campaign)
+            created["payouts"] = [payout_fields(payout) for payout in db_payouts]
+            version = bump_versions(db)
+            outbox.record(db, [(CAMPAIGN_CREATED, db_campaign.id, created)])
             db.commit()
             db.refresh(db_campaign)
+            payout_cache.invalidate(db_campaign.id)
+            sync_indexes(db, [db_campaign.id], version)
             return db_campaign
         except Exception as e:
             db.rollback()
             raise ValueError(f"Error creating campaign: {str(e)}")
 
+    def import_campaigns(self, db: Session, campaigns: List[CampaignCreate]) -> List[int]:
+        """
+        Insert a batch of already validated campaigns in one transaction.
+
+        Campaigns and payouts each go out as multi-row INSERT statements
+        rather than one flush per object.
+        """
+        if not campaigns:
+            return []
+
+        try:
+            campaign_ids = db.scalars(
+                insert(Campaign).returning(Campaign.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "title": campaign.title,
+                        "landing_url": campaign.landing_url,
+                        "is_running": campaign.is_running,
+                        "country": campaign.country,
+                    }
+                    for campaign in campaigns
+                ],
+            ).all()
+            payout_rows = [
+                {"campaign_id": campaign_id, "country": payout.country, "amount": payout.amount}
+                for campaign_id, campaign in zip(campaign_ids, campaigns)
+                for payout in campaign.payouts
+            ]
+            payout_ids = []
+            if payout_rows:
+                payout_ids = db.scalars(
+                    insert(Payout).returning(Payout.id, sort_by_parameter_order=True), payout_rows
+                ).all()
+            payouts_by_campaign = defaultdict(list)
+            for payout_id, row in zip(payout_ids, payout_rows):
+                payouts_by_campaign[row["campaign_id"]].append(dict(row, id=payout_id))
+            stats = PayoutStatsDelta()
+            for campaign in campaigns:
+                for payout in campaign.payouts:
+                    stats.add(payout.country, campaign.is_running, payout.amount)
+            payout_analytics.apply(db, stats)
+            version = bump_versions(db)
+            outbox.record(db, [
+                (CAMPAIGN_CREATED, campaign_id, {
+                    "id": campaign_id,
+                    "title": campaign.title,
+                    "landing_url": campaign.landing_url,
+                    "is_running": campaign.is_running,
+                    "country": campaign.country,
+                    "payouts": payouts_by_campaign[campaign_id],
+                })
+                for campaign_id, campaign in zip(campaign_ids, campaigns)
+            ])
+            db.commit()
+            for campaign_id in campaign_ids:
+                payout_cache.invalidate(campaign_id)
+            sync_indexes(db, campaign_ids, version)
+            return campaign_ids
+        except Exception as e:
+            db.rollback()
+            raise ValueError(f"Error importing campaigns: {str(e)}")
+
     def get_campaigns(self, db: Session, skip: int = 0, limit: int = 100, filters: Dict[str, Any] = None) -> List[Campaign]:
-        query = db.query(Campaign)
-        if filters:
-            if filters.get("title"):
-                query = query.filter(Campaign.title.ilike(f"%{filters['title']}%"))
-            if filters.get("landing_url"):
-                query = query.filter(Campaign.landing_url.ilike(f"%{filters['landing_url']}%"))
-            if filters.get("is_running") is not None:
-                query = query.filter(Campaign.is_running == filters["is_running"])
-        
+        # Payouts for the whole page are fetched in one extra IN query instead of one per campaign
+        query = db.query(Campaign).options(selectinload(Campaign.payouts))
+        # Text searches come back best match first
+        query = apply_campaign_filters(query, filters, ranked=True)
         return query.offset(skip).limit(limit).all()
 
+    def get_campaign_rows(
+        self,
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Dict[str, Any] = None,
+        include_archived: bool = False
+    ) -> List[dict]:
+        """
+        Same page as get_campaigns, as plain dicts in the Campaign schema's shape.
+
+        Two Core queries on the session's connection, no ORM objects; meant
+        for responses that are encoded without revalidation. With
+        include_archived, archived campaigns follow every hot one, so pages
+        that don't reach past the hot rows cost exactly what they did before.
+        """
+        query = select(
+            Campaign.title,
+            Campaign.landing_url,
+            Campaign.is_running,
+            Campaign.country,
+            Campaign.id,
+        )
+        query = apply_campaign_filters(query, filters, ranked=True).offset(skip).limit(limit)
+        conn = db.connection()
+        campaigns = []
+        by_id = {}
+        for title, landing_url, is_running, country, campaign_id in conn.execute(query):
+            campaign = {
+                "title": title,
+                "landing_url": landing_url,
+                "is_running": is_running,
+                "country": country,
+                "id": campaign_id,
+                "payouts": [],
+            }
+            campaigns.append(campaign)
+            by_id[campaign_id] = campaign["payouts"]
+        if by_id:
+            for payout in conn.execute(_payout_rows().where(Payout.campaign_id.in_(list(by_id)))):
+                by_id[payout[3]].append(_payout_dict(payout))
+
+        if include_archived and len(campaigns) < limit:
+            if campaigns:
+                archived_skip = 0
+            else:
+                # The page starts past the hot rows; only now is counting them worth it
+                hot_count = db.scalar(
+                    select(func.count()).select_from(apply_campaign_filters(select(Campaign.id), filters).subquery())
+                )
+                archived_skip = max(skip - hot_count, 0)
+            campaigns.extend(archive_service.get_archived_rows(db, archived_skip, limit - len(campaigns), filters))
+        return campaigns
+
+    def get_campaigns_page(
+        self,
+        db: Session,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        filters: Dict[str, Any] = None
+    ) -> Tuple[List[Campaign], Optional[str]]:
+        """Keyset pagination: resume after the last (id) or (created_at, id) seen"""
+        query = db.query(Campaign).options(selectinload(Campaign.payouts))
+        query = apply_campaign_filters(query, filters)
+        rows = apply_keyset(query, cursor, sort, limit).all()
+        return split_page(rows, limit, sort)
+
+    def iter_campaign_batches(
+        self,
+        db: Session,
+        filters: Dict[str, Any] = None,
+        batch_size: Optional[int] = None
+    ):
+        """
+        Yield (campaign_rows, payouts_by_campaign_id) in id order, one batch at a time.
+
+        Rows are plain column tuples rather than ORM objects and each batch is
+        two queries (campaigns by keyset, then their payouts by IN), so memory
+        stays bounded by batch_size regardless of table size.
+        """
+        batch_size = batch_size or EXPORT_BATCH_SIZE
+        last_id = 0
+        while True:
+            query = db.query(
+                Campaign.id,
+                Campaign.title,
+                Campaign.landing_url,
+                Campaign.is_running,
+                Campaign.country,
+            )
+            query = apply_campaign_filters(query, filters)
+            rows = query.filter(Campaign.id > last_id).order_by(Campaign.id).limit(batch_size).all()
+            if not rows:
+                return
+
+            campaign_ids = [row.id for row in rows]
+            payouts = defaultdict(list)
+            payout_rows = (
+                db.query(Payout.id, Payout.campaign_id, Payout.country, Payout.amount)
+                .filter(Payout.campaign_id.in_(campaign_ids))
+                .order_by(Payout.campaign_id, Payout.id)
+            )
+            for payout in payout_rows:
+                payouts[payout.campaign_id].append(payout)
+
+            yield rows, payouts
+            if len(rows) < batch_size:
+                return
+            last_id = campaign_ids[-1]
+
+    def get_collection_version(self, db: Session) -> int:
+        return get_collection_version(db)
+
+    def get_campaign_version(self, db: Session, campaign_id: int) -> Optional[int]:
+        return get_campaign_version(db, campaign_id)
+
     def get_campaign(self, db: Session, campaign_id: int) -> Optional[Campaign]:
-        return db.query(Campaign).filter(Campaign.id == campaign_id).first()
+        return (
+            db.query(Campaign)
+            .options(selectinload(Campaign.payouts))
+            .filter(Campaign.id == campaign_id)
+            .first()
+        )
 
     def update_campaign(self, db: Session, campaign_id: int, campaign_update: CampaignUpdate) -> Optional[Campaign]:
         db_campaign = self.get_campaign(db, campaign_id)
         if not db_campaign:
             return None
             
+        was_running = db_campaign.is_running
         update_data = campaign_update.dict(exclude_unset=True)
         for field, value in update_data.items():
             if field != "payouts":
                 setattr(db_campaign, field, value)
         
-        if campaign_update.payouts:
-            # Clear existing payouts
-            db_campaign.payouts = []
-            # Add new payouts
-            for payout in campaign_update.payouts:
-                db_payout = Payout(
-                    country=payout.country,
-                    amount=payout.amount,
-                    campaign_id=db_campaign.id
-                )
-                db.add(db_payout)
-        
         try:
+            if db_campaign.is_running != was_running:
+                stats = PayoutStatsDelta()
+                stats.move(db_campaign.payouts, was_running, db_campaign.is_running)
+                payout_analytics.apply(db, stats)
+            changed_countries = []
+            events = [(CAMPAIGN_UPDATED, campaign_id, campaign_fields(db_campaign))]
+            if campaign_update.payouts:
+                changed_countries = reconcile_payouts(
+                    db, campaign_id, campaign_update.payouts, db_campaign.is_running
+                )
+                db.expire(db_campaign, ["payouts"])
+                if changed_countries:
+                    events.append(payouts_replaced_event(db, campaign_id))
+            version = bump_versions(db, [campaign_id])
+            outbox.record(db, events)
             db.commit()
             db.refresh(db_campaign)
+            for country in changed_countries:
+                payout_cache.invalidate(campaign_id, country)
+            sync_indexes(db, [campaign_id], version)
             return db_campaign
+        except ValueError:
+            db.rollback()
+            raise
         except Exception as e:
             db.rollback()
             raise ValueError(f"Error updating campaign: {str(e)}")
@@ -97,8 +464,16 @@ class CampaignService:
         db_campaign = self.get_campaign(db, campaign_id)
         if not db_campaign:
             return False
+        stats = PayoutStatsDelta()
+        for payout in db_campaign.payouts:
+            stats.remove(payout.country, db_campaign.is_running, payout.amount)
         db.delete(db_campaign)
+        payout_analytics.apply(db, stats)
+        version = bump_versions(db)
+        outbox.record(db, [(CAMPAIGN_DELETED, campaign_id, {"id": campaign_id})])
         db.commit()
+        payout_cache.invalidate(campaign_id)
+        sync_indexes(db, [campaign_id], version)
         return True
 
     def toggle_campaign(self, db: Session, campaign_id: int) -> Optional[Campaign]:
@@ -108,15 +483,67 @@ class CampaignService:
             raise ValueError("Campaign not found")
             
         db_campaign.is_running = not db_campaign.is_running
+        stats = PayoutStatsDelta()
+        stats.move(db_campaign.payouts, not db_campaign.is_running, db_campaign.is_running)
         
         try:
+            payout_analytics.apply(db, stats)
+            version = bump_versions(db, [campaign_id])
+            outbox.record(db, [(CAMPAIGN_UPDATED, campaign_id, campaign_fields(db_campaign))])
             db.commit()
             db.refresh(db_campaign)
+            sync_indexes(db, [campaign_id], version)
             return db_campaign
         except Exception as e:
             db.rollback()
             raise ValueError(f"Error toggling campaign: {str(e)}")
 
+    def set_campaigns_state(
+        self,
+        db: Session,
+        is_running: bool,
+        ids: Optional[List[int]] = None,
+        filters: Dict[str, Any] = None
+    ) -> List[int]:
+        """
+        Start or stop every campaign matching ids and/or filters in one UPDATE.
+
+        Campaigns already in the requested state are left untouched, so
+        updated_at and version only move for rows that really changed.
+        Returns the ids of those rows.
+        """
+        if ids is None and not any(value is not None for value in (filters or {}).values()):
+            raise ValueError("Select campaigns by ids or at least one filter")
+
+        statement = update(Campaign).where(Campaign.is_running != is_running)
+        if ids is not None:
+            statement = statement.where(Campaign.id.in_(ids))
+        statement = apply_campaign_filters(statement, filters)
+        statement = statement.values(
+            is_running=is_running,
+            updated_at=datetime.utcnow(),
+            version=Campaign.version + 1,
+        ).returning(Campaign.id, Campaign.title, Campaign.landing_url, Campaign.is_running, Campaign.country)
+
+        try:
+            rows = db.execute(statement, execution_options={"synchronize_session": False}).all()
+            campaign_ids = [row.id for row in rows]
+            if campaign_ids:
+                stats = PayoutStatsDelta()
+                for country, count, total, low, high in payout_analytics.campaign_payout_groups(db, campaign_ids):
+                    stats.remove_group(country, not is_running, count, total, low, high)
+                    stats.add_group(country, is_running, count, total, low, high)
+                payout_analytics.apply(db, stats)
+                version = bump_versions(db)
+                outbox.record(db, [(CAMPAIGN_UPDATED, row.id, campaign_fields(row)) for row in rows])
+            db.commit()
+            if campaign_ids:
+                sync_indexes(db, campaign_ids, version)
+            return campaign_ids
+        except Exception as e:
+            db.rollback()
+            raise ValueError(f"Error changing campaign state: {str(e)}")
+
 class PayoutService:
     def create_payout(self, db: Session, campaign_id: int, payout: PayoutCreate) -> Payout:
         if not payout.country:
@@ -130,8 +557,18 @@ class PayoutService:
         db.add(db_payout)
         
         try:
+            is_running = db.scalar(select(Campaign.is_running).where(Campaign.id == campaign_id))
+            if is_running is not None:
+                stats = PayoutStatsDelta()
+                stats.add(payout.country, is_running, payout.amount)
+                payout_analytics.apply(db, stats)
+            db.flush()
+            version = bump_versions(db, [campaign_id])
+            outbox.record(db, [(PAYOUT_CREATED, campaign_id, payout_fields(db_payout))])
             db.commit()
             db.refresh(db_payout)
+            payout_cache.invalidate(campaign_id, db_payout.country)
+            sync_indexes(db, [campaign_id], version)
             return db_payout
         except Exception as e:
             db.rollback()
@@ -157,23 +594,80 @@ class PayoutService:
             if existing:
                 raise ValueError(f"Payout for country {payout_update.country} already exists")
 
+        previous_country, previous_amount = db_payout.country, db_payout.amount
         db_payout.country = payout_update.country
         db_payout.amount = payout_update.amount
         
         try:
+            is_running = db.scalar(select(Campaign.is_running).where(Campaign.id == db_payout.campaign_id))
+            if is_running is not None:
+                stats = PayoutStatsDelta()
+                stats.remove(previous_country, is_running, previous_amount)
+                stats.add(db_payout.country, is_running, db_payout.amount)
+                payout_analytics.apply(db, stats)
+            version = bump_versions(db, [db_payout.campaign_id])
+            outbox.record(db, [(PAYOUT_UPDATED, db_payout.campaign_id, payout_fields(db_payout))])
             db.commit()
             db.refresh(db_payout)
+            payout_cache.invalidate(db_payout.campaign_id, previous_country)
+            payout_cache.invalidate(db_payout.campaign_id, db_payout.country)
+            sync_indexes(db, [db_payout.campaign_id], version)
             return db_payout
         except Exception as e:
             db.rollback()
             raise ValueError(f"Error updating payout: {str(e)}")
 
+    def replace_payouts(self, db: Session, campaign_id: int, payouts: List[PayoutCreate]) -> Optional[List[Payout]]:
+        """Replace a campaign's payout set, writing only the rows that differ"""
+        campaign = db.get(Campaign, campaign_id)
+        if campaign is None:
+            return None
+
+        try:
+            changed_countries = reconcile_payouts(db, campaign_id, payouts, campaign.is_running)
+            version = None
+            if changed_countries:
+                version = bump_versions(db, [campaign_id])
+                outbox.record(db, [payouts_replaced_event(db, campaign_id)])
+            db.commit()
+        except ValueError:
+            db.rollback()
+            raise
+        except Exception as e:
+            db.rollback()
+            raise ValueError(f"Error replacing payouts: {str(e)}")
+        for country in changed_countries:
+            payout_cache.invalidate(campaign_id, country)
+        if changed_countries:
+            sync_indexes(db, [campaign_id], version)
+        return self.get_campaign_payouts(db, campaign_id)
+
     def get_payout(self, db: Session, payout_id: int) -> Optional[Payout]:
         return db.query(Payout).filter(Payout.id == payout_id).first()
 
     def get_campaign_payouts(self, db: Session, campaign_id: int) -> List[Payout]:
         return db.query(Payout).filter(Payout.campaign_id == campaign_id).all()
 
+    def get_campaign_payout_rows(self, db: Session, campaign_id: int) -> List[dict]:
+        """get_campaign_payouts as plain dicts in the Payout schema's shape"""
+        rows = db.connection().execute(_payout_rows().where(Payout.campaign_id == campaign_id))
+        return [_payout_dict(row) for row in rows]
+
+    def get_country_payout(self, db: Session, campaign_id: int, country: Country) -> Optional[PayoutSchema]:
+        """Payout of a campaign for one country, served from payout_cache when possible"""
+        cached = payout_cache.get(campaign_id, country)
+        if cached is not MISSING:
+            return cached
+
+        generation = payout_cache.generation
+        db_payout = db.query(Payout).filter(
+            and_(Payout.campaign_id == campaign_id, Payout.country == country)
+        ).first()
+        # Cache a detached snapshot (or None) rather than the session-bound ORM object
+        payout = PayoutSchema.model_validate(db_payout) if db_payout else None
+        payout_cache.set(campaign_id, country, payout, generation)
+        return payout
+
     def delete_payout(self, db: Session, payout_id: int) -> bool:
         db_payout = self.get_payout(db, payout_id)
         if not db_payout:
@@ -184,9 +678,19 @@ class PayoutService:
         if len(campaign_payouts) <= 1:
             raise ValueError("Cannot delete the last payout from a campaign")
             
+        campaign_id, country = db_payout.campaign_id, db_payout.country
         try:
+            is_running = db.scalar(select(Campaign.is_running).where(Campaign.id == campaign_id))
             db.delete(db_payout)
+            if is_running is not None:
+                stats = PayoutStatsDelta()
+                stats.remove(country, is_running, db_payout.amount)
+                payout_analytics.apply(db, stats)
+            version = bump_versions(db, [campaign_id])
+            outbox.record(db, [(PAYOUT_DELETED, campaign_id, {"id": payout_id, "campaign_id": campaign_id, "country": country})])
             db.commit()
+            payout_cache.invalidate(campaign_id, country)
+            sync_indexes(db, [campaign_id], version)
             return True
         except Exception as e:
             db.rollback()
@@ -0,0 +1,75 @@
+import contextvars
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session
+
+from models.models import Campaign, CollectionVersion
+
+CAMPAIGNS_COLLECTION = "campaigns"
+
+# Session.info key: the collection version this transaction bumped to
+_PENDING_VERSION = "collection_version_pending"
+
+# Set to a dict by ReadYourWritesMiddleware for the length of a request;
+# commits record the highest collection version they produced under
+# "version". Like the metrics context it reaches the threadpool and
+# run_sync greenlets, and the dict itself is shared.
+committed_version: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar(
+    "committed_collection_version", default=None
+)
+
+
+def bump_versions(db: Session, campaign_ids: Iterable[int] = ()) -> int:
+    """
+    Bump the version of the given campaigns and of the campaign collection
+    and return the new collection version.
+
+    Runs inside the caller's transaction so the new versions become visible
+    together with the write they describe.
+    """
+    campaign_ids = list(campaign_ids)
+    if campaign_ids:
+        db.execute(
+            update(Campaign)
+            .where(Campaign.id.in_(campaign_ids))
+            .values(version=Campaign.version + 1, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+    version = db.scalar(
+        update(CollectionVersion)
+        .where(CollectionVersion.name == CAMPAIGNS_COLLECTION)
+        .values(version=CollectionVersion.version + 1)
+        .returning(CollectionVersion.version)
+    )
+    if version is None:
+        db.execute(insert(CollectionVersion).values(name=CAMPAIGNS_COLLECTION, version=1))
+        version = 1
+    db.info[_PENDING_VERSION] = version
+    return version
+
+
+def get_collection_version(db: Session) -> int:
+    version = db.scalar(
+        select(CollectionVersion.version).where(CollectionVersion.name == CAMPAIGNS_COLLECTION)
+    )
+    return version or 0
+
+
+def get_campaign_version(db: Session, campaign_id: int) -> Optional[int]:
+    """Version of one campaign, or None if it doesn't exist"""
+    return db.scalar(select(Campaign.version).where(Campaign.id == campaign_id))
+
+
+@event.listens_for(Session, "after_commit")
+def _report_committed_version(session):
+    version = session.info.pop(_PENDING_VERSION, None)
+    sink = committed_version.get()
+    if version is not None and sink is not None:
+        sink["version"] = max(sink.get("version", 0), version)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_pending_version(session):
+    session.info.pop(_PENDING_VERSION, None)
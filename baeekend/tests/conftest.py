@@ -0,0 +1,135 @@
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+
+# The app uses top-level imports (``from database.database import ...``), so the
+# baeekend directory has to be importable the same way uvicorn sees it.
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+# Point the engine at a throwaway database before database.database is imported
+_TEST_DB_DIR = tempfile.mkdtemp(prefix="baeekend-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TEST_DB_DIR, 'test.db')}"
+# Cheap bcrypt for tests; the hashing pool still runs in a worker process
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "1")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event, text  # noqa: E402
+
+from api.async_routes import router as async_router  # noqa: E402
+from database.async_database import async_engine  # noqa: E402
+from database.database import COUNTRY_CODES, Base, SessionLocal, engine  # noqa: E402
+from models.models import Campaign, Payout  # noqa: E402
+from main import app  # noqa: E402
+from auth.jwt_handler import token_cache, user_cache  # noqa: E402
+from service.cache import payout_cache  # noqa: E402
+from api.metrics import metrics  # noqa: E402
+from service.currency import currency_service  # noqa: E402
+from service.routing import offer_index  # noqa: E402
+from api.health import startup_state  # noqa: E402
+from service.outbox import change_feed  # noqa: E402
+from database.replica import replica  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+CODES = sorted(COUNTRY_CODES)
+
+
+def new_campaign(**overrides):
+    """Body for POST /api/campaigns/, with `overrides` replacing its fields"""
+    campaign = {
+        "title": "Campaign",
+        "landing_url": "https://example.com",
+        "country": "USA",
+        "payouts": [{"country": "USA", "amount": 10.0}, {"country": "GBR", "amount": 5.0}],
+    }
+    campaign.update(overrides)
+    return campaign
+
+
+def create_campaign(client, payouts=None, **overrides):
+    """Create a new_campaign() through the API; `payouts` as (country, amount) pairs"""
+    if payouts is not None:
+        overrides["payouts"] = [{"country": c, "amount": a} for c, a in payouts]
+    response = client.post("/api/campaigns/", json=new_campaign(**overrides))
+    assert response.status_code == 200
+    return response.json()
+
+
+def seed_campaigns(db, count, payouts_per_campaign=3):
+    for i in range(count):
+        campaign = Campaign(
+            title=f"Campaign {i}",
+            landing_url=f"https://example.com/{i}",
+            is_running=i % 2 == 0,
+            country="AFG",
+        )
+        campaign.payouts = [
+            Payout(country=CODES[j], amount=10.0 + j) for j in range(payouts_per_campaign)
+        ]
+        db.add(campaign)
+    db.commit()
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def query_plan(db, query):
+    sql = str(query.statement.compile(db.bind, compile_kwargs={"literal_binds": True}))
+    rows = db.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return " | ".join(row[-1] for row in rows)
+
+
+@pytest.fixture(autouse=True)
+def reset_schema():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    payout_cache.clear()
+    token_cache.clear()
+    user_cache.clear()
+    metrics.clear()
+    currency_service.clear()
+    offer_index.clear()
+    startup_state.reset()
+    change_feed.clear()
+    replica.configure(None)
+    yield
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def async_client():
+    async_app = FastAPI()
+    async_app.include_router(async_router)
+    with TestClient(async_app) as client:
+        yield client
+        # Pooled aiosqlite connections belong to this client's event loop
+        client.portal.call(async_engine.dispose)
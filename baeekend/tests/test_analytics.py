@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from manage import main as manage
+from schemas.schema import CampaignCreate, CampaignUpdate
+from service.analytics import payout_analytics
+from service.service import campaign_service
+from tests.conftest import create_campaign
+
+CODES = ["USA", "GBR", "DEU", "FRA", "ESP"]
+
+
+def stats_by_country(client, **params):
+    response = client.get("/api/analytics/payouts", params=params)
+    assert response.status_code == 200
+    return {entry["country"]: entry for entry in response.json()}
+
+
+def snapshot(db):
+    return {
+        entry["country"]: {
+            state: {key: (pytest.approx(value) if isinstance(value, float) else value) for key, value in stats.items()}
+            for state, stats in entry.items() if state != "country"
+        }
+        for entry in payout_analytics.get_payout_stats(db)
+    }
+
+
+def test_stats_split_by_running_and_paused(client):
+    create_campaign(client, [("USA", 10.0), ("GBR", 4.0)], is_running=True)
+    create_campaign(client, [("USA", 2.0)], is_running=True)
+    create_campaign(client, [("USA", 7.0)])
+
+    usa = stats_by_country(client)["USA"]
+    assert usa["running"] == {"count": 2, "min": 2.0, "max": 10.0, "avg": 6.0}
+    assert usa["paused"] == {"count": 1, "min": 7.0, "max": 7.0, "avg": 7.0}
+    gbr = stats_by_country(client, country="GBR")
+    assert list(gbr) == ["GBR"]
+    assert gbr["GBR"]["paused"] == {"count": 0, "min": None, "max": None, "avg": None}
+
+
+def test_removing_the_minimum_finds_the_next_one(client):
+    cheap = create_campaign(client, [("USA", 1.0), ("GBR", 1.0)])
+    create_campaign(client, [("USA", 5.0)])
+    create_campaign(client, [("USA", 9.0)])
+
+    usa_payout = next(p for p in cheap["payouts"] if p["country"] == "USA")
+    client.delete(f"/api/campaigns/payouts/{usa_payout['id']}")
+    assert stats_by_country(client)["USA"]["paused"]["min"] == 5.0
+
+    client.patch(f"/api/campaigns/{cheap['id']}/toggle")
+    gbr = stats_by_country(client)["GBR"]
+    assert gbr["running"]["count"] == 1
+    assert gbr["paused"]["count"] == 0
+
+
+def test_incremental_stats_match_a_full_rebuild(client, db):
+    rng = random.Random(7)
+    campaigns = [
+        create_campaign(client, [(c, float(rng.randint(1, 50))) for c in rng.sample(CODES, 3)], is_running=rng.random() < 0.5)
+        for _ in range(8)
+    ]
+    campaign_service.import_campaigns(db, [
+        CampaignCreate(title="Imported", landing_url="https://example.com", country="USA", is_running=True,
+                       payouts=[{"country": "USA", "amount": 3.5}, {"country": "ESP", "amount": 60.0}])
+    ])
+
+    for _ in range(60):
+        campaign = rng.choice(campaigns)
+        url = f"/api/campaigns/{campaign['id']}"
+        action = rng.randrange(7)
+        if action == 0:
+            client.patch(f"{url}/toggle")
+        elif action == 1:
+            used = {p["country"] for p in client.get(f"{url}/payouts").json()}
+            unused = [c for c in CODES if c not in used]
+            if unused:
+                client.post(f"{url}/payouts", json={"country": rng.choice(unused), "amount": float(rng.randint(1, 50))})
+        elif action == 2:
+            payouts = client.get(f"{url}/payouts").json()
+            payout = rng.choice(payouts)
+            client.put(f"/api/campaigns/payouts/{payout['id']}",
+                       json={"country": payout["country"], "amount": float(rng.randint(1, 50))})
+        elif action == 3:
+            payouts = client.get(f"{url}/payouts").json()
+            client.delete(f"/api/campaigns/payouts/{rng.choice(payouts)['id']}")
+        elif action == 4:
+            client.put(f"{url}/payouts", json=[
+                {"country": c, "amount": float(rng.randint(1, 50))} for c in rng.sample(CODES, rng.randint(1, 4))
+            ])
+        elif action == 5:
+            client.patch("/api/campaigns/state", json={"is_running": rng.random() < 0.5, "country": "USA"})
+        else:
+            campaign_service.update_campaign(db, campaign["id"], CampaignUpdate(
+                is_running=rng.random() < 0.5,
+                payouts=[{"country": c, "amount": float(rng.randint(1, 50))} for c in rng.sample(CODES, 2)],
+            ))
+    client.delete(f"/api/campaigns/{campaigns[0]['id']}")
+
+    incremental = snapshot(db)
+    manage(["rebuild-payout-stats"])
+    db.expire_all()
+    assert snapshot(db) == incremental
@@ -0,0 +1,189 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, update
+from sqlalchemy.exc import OperationalError
+
+from database.database import engine
+from models.models import ArchivedCampaign, ArchivedPayout, Campaign
+from service.analytics import payout_analytics
+from service.archive import archive_service
+from service.outbox import outbox
+from service.service import campaign_service
+from tests.conftest import create_campaign, query_plan
+
+
+def age(db, campaign_ids, days):
+    db.query(Campaign).filter(Campaign.id.in_(campaign_ids)).update(
+        {Campaign.updated_at: datetime.utcnow() - timedelta(days=days)}
+    )
+    db.commit()
+
+
+def titles(client, **params):
+    response = client.get("/api/campaigns/", params=params)
+    assert response.status_code == 200
+    return [campaign["title"] for campaign in response.json()]
+
+
+def paused_count(client, country="USA"):
+    stats = client.get("/api/analytics/payouts", params={"country": country}).json()
+    return stats[0]["paused"]["count"] if stats else 0
+
+
+def seed(client, db):
+    """Old A and B, old but running C, and recently stopped D"""
+    campaigns = [
+        create_campaign(client, title="A"),
+        create_campaign(client, title="B", country="GBR"),
+        create_campaign(client, title="C", is_running=True),
+        create_campaign(client, title="D"),
+    ]
+    age(db, [c["id"] for c in campaigns if c["title"] != "D"], days=100)
+    return {c["title"]: c for c in campaigns}
+
+
+def test_archive_moves_stale_stopped_campaigns_in_batches(client, db):
+    campaigns = seed(client, db)
+    assert paused_count(client) == 3
+
+    assert archive_service.archive_stale(db, days=30, batch_size=1) == 2
+
+    assert titles(client) == ["C", "D"]
+    archived = {c.title: c for c in db.query(ArchivedCampaign)}
+    assert set(archived) == {"A", "B"}
+    assert archived["A"].id == campaigns["A"]["id"]
+    assert {p.id for p in db.query(ArchivedPayout)} == {
+        p["id"] for title in "AB" for p in campaigns[title]["payouts"]
+    }
+    assert campaign_service.get_campaign(db, campaigns["A"]["id"]) is None
+    assert client.get(f"/api/campaigns/{campaigns['A']['id']}/payouts").json() == []
+    assert paused_count(client) == 1
+    events = [event_type for _, event_type, _ in outbox.read(db, 0)]
+    assert events.count("campaign.archived") == 2
+
+    assert archive_service.archive_stale(db, days=30) == 0
+
+
+def test_include_archived_lists_archived_campaigns_last(client, db):
+    campaigns = seed(client, db)
+    archive_service.archive_stale(db, days=30)
+
+    assert titles(client, include_archived=True) == ["C", "D", "A", "B"]
+    assert titles(client, include_archived=True, skip=1, limit=2) == ["D", "A"]
+    assert titles(client, include_archived=True, skip=3) == ["B"]
+    assert titles(client, include_archived=True, country="GBR") == ["B"]
+    assert titles(client, include_archived=True, title="A") == ["A"]
+
+    listed = client.get("/api/campaigns/", params={"include_archived": True, "skip": 2, "limit": 1}).json()
+    assert listed[0]["payouts"] == sorted(campaigns["A"]["payouts"], key=lambda p: p["id"])
+
+
+def test_restore_puts_campaign_back(client, db):
+    campaigns = seed(client, db)
+    archive_service.archive_stale(db, days=30)
+    campaign_id = campaigns["A"]["id"]
+
+    response = client.post(f"/api/campaigns/{campaign_id}/restore")
+    assert response.status_code == 200
+    restored = response.json()
+    assert restored["title"] == "A"
+    assert sorted(p["id"] for p in restored["payouts"]) == sorted(p["id"] for p in campaigns["A"]["payouts"])
+    assert titles(client) == ["A", "C", "D"]
+    assert paused_count(client) == 2
+    assert db.query(ArchivedPayout).filter(ArchivedPayout.campaign_id == campaign_id).count() == 0
+    assert outbox.read(db, 0)[-1][1] == "campaign.restored"
+
+    # Restoring counts as a change, so the next run leaves it alone
+    assert archive_service.archive_stale(db, days=30) == 0
+    assert client.post(f"/api/campaigns/{campaign_id}/restore").status_code == 404
+
+
+def test_archived_ids_are_not_handed_out_again(client, db):
+    campaigns = seed(client, db)
+    archive_service.archive_stale(db, days=30)
+    # Archive the newest campaign too, then delete what is left on top
+    age(db, [campaigns["D"]["id"]], days=100)
+    archive_service.archive_stale(db, days=30)
+    assert client.delete(f"/api/campaigns/{campaigns['C']['id']}").status_code == 200
+
+    created = create_campaign(client, title="F")
+    assert created["id"] > campaigns["D"]["id"]
+    assert min(p["id"] for p in created["payouts"]) > max(p["id"] for p in campaigns["D"]["payouts"])
+    assert client.post(f"/api/campaigns/{campaigns['A']['id']}/restore").status_code == 200
+    listed = client.get("/api/campaigns/", params={"include_archived": True}).json()
+    assert len({c["id"] for c in listed}) == len(listed) == 4
+
+
+def test_campaign_started_mid_batch_stays_hot(client, db):
+    campaigns = seed(client, db)
+    started = campaigns["A"]["id"]
+    raced = []
+
+    def start_a(conn, cursor, statement, parameters, context, executemany):
+        # Another writer starts A between the candidate SELECT and the move
+        if statement.startswith("INSERT INTO archived_campaigns") and not raced:
+            raced.append(statement)
+            with engine.begin() as other:
+                other.execute(update(Campaign).where(Campaign.id == started).values(is_running=True))
+
+    event.listen(engine, "before_cursor_execute", start_a)
+    try:
+        assert archive_service.archive_stale(db, days=30) == 1
+    finally:
+        event.remove(engine, "before_cursor_execute", start_a)
+
+    assert {c.title for c in db.query(ArchivedCampaign)} == {"B"}
+    assert sorted(titles(client)) == ["A", "C", "D"]
+    assert len(client.get(f"/api/campaigns/{started}/payouts").json()) == 2
+    assert [event_type for _, event_type, _ in outbox.read(db, 0)].count("campaign.archived") == 1
+
+
+def test_batch_losing_a_lock_is_retried(client, db, monkeypatch):
+    seed(client, db)
+    monkeypatch.setattr("service.archive.ARCHIVE_RETRY_DELAY", 0)
+    groups = payout_analytics.campaign_payout_groups
+    calls = []
+
+    def locked_once(session, campaign_ids):
+        calls.append(campaign_ids)
+        if len(calls) == 1:
+            raise OperationalError("SELECT", {}, sqlite3.OperationalError("database is locked"))
+        return groups(session, campaign_ids)
+
+    monkeypatch.setattr(payout_analytics, "campaign_payout_groups", locked_once)
+    assert archive_service.archive_stale(db, days=30) == 2
+    assert archive_service.count_archived(db) == 2
+    assert paused_count(client) == 1
+
+
+def test_archive_route_runs_after_response(client, db):
+    seed(client, db)
+    response = client.post("/api/campaigns/archive", params={"days": 30, "batch_size": 10})
+    assert response.status_code == 202
+    assert response.json() == {"scheduled": True, "days": 30, "batch_size": 10}
+    # TestClient runs background tasks before returning
+    assert archive_service.count_archived(db) == 2
+
+
+def test_async_restore(async_client, client, db):
+    campaigns = seed(client, db)
+    archive_service.archive_stale(db, days=30)
+
+    response = async_client.post(f"/api/campaigns/{campaigns['B']['id']}/restore")
+    assert response.status_code == 200
+    assert response.json()["country"] == "GBR"
+    listed = async_client.get("/api/campaigns/", params={"include_archived": True}).json()
+    assert [c["title"] for c in listed] == ["B", "C", "D", "A"]
+
+
+def test_archive_candidates_use_state_updated_at_index(db):
+    query = (
+        db.query(Campaign.id)
+        .filter(Campaign.is_running.is_(False), Campaign.updated_at < datetime(2020, 1, 1))
+        .order_by(Campaign.updated_at)
+        .limit(500)
+    )
+    plan = query_plan(db, query)
+    assert "ix_campaigns_is_running_updated_at" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,56 @@
+from database.async_database import to_async_url
+from tests.conftest import new_campaign
+
+
+def test_to_async_url():
+    assert to_async_url("sqlite:///./sql_app.db") == "sqlite+aiosqlite:///./sql_app.db"
+    assert to_async_url("postgresql+psycopg2://u:p@h/db") == "postgresql+psycopg://u:p@h/db"
+    assert to_async_url("mysql+aiomysql://u@h/db") == "mysql+aiomysql://u@h/db"
+
+
+def test_async_campaign_crud(async_client):
+    created = async_client.post("/api/campaigns/", json=new_campaign())
+    assert created.status_code == 200
+    campaign = created.json()
+    assert len(campaign["payouts"]) == 2
+
+    listed = async_client.get("/api/campaigns/").json()
+    assert [c["id"] for c in listed] == [campaign["id"]]
+    page = async_client.get("/api/campaigns/page", params={"limit": 1}).json()
+    assert page["items"][0]["payouts"] == campaign["payouts"]
+
+    toggled = async_client.patch(f"/api/campaigns/{campaign['id']}/toggle").json()
+    assert toggled["is_running"] is True
+
+    assert async_client.delete(f"/api/campaigns/{campaign['id']}").status_code == 200
+    assert async_client.delete(f"/api/campaigns/{campaign['id']}").status_code == 404
+    assert async_client.patch(f"/api/campaigns/{campaign['id']}/toggle").status_code == 404
+
+
+def test_async_payout_routes(async_client):
+    campaign = async_client.post("/api/campaigns/", json=new_campaign()).json()
+    campaign_id = campaign["id"]
+
+    added = async_client.post(f"/api/campaigns/{campaign_id}/payouts", json={"country": "DEU", "amount": 2.0})
+    assert added.status_code == 200
+    payout_id = added.json()["id"]
+
+    updated = async_client.put(f"/api/campaigns/payouts/{payout_id}", json={"country": "DEU", "amount": 3.0})
+    assert updated.json()["amount"] == 3.0
+    country = async_client.get(f"/api/campaigns/{campaign_id}/payouts/country/DEU")
+    assert country.json()["amount"] == 3.0
+
+    assert async_client.delete(f"/api/campaigns/payouts/{payout_id}").status_code == 200
+    assert len(async_client.get(f"/api/campaigns/{campaign_id}/payouts").json()) == 2
+    assert async_client.get(f"/api/campaigns/{campaign_id}/payouts/country/DEU").status_code == 404
+
+    replaced = async_client.put(f"/api/campaigns/{campaign_id}/payouts", json=[{"country": "USA", "amount": 11.0}])
+    assert [(p["country"], p["amount"]) for p in replaced.json()] == [("USA", 11.0)]
+
+
+def test_async_router_keeps_shared_routes(async_client):
+    assert "USA" in async_client.get("/api/campaigns/countries").json()
+    imported = async_client.post("/api/campaigns/import", content='{"title": "x", "landing_url": "y", "country": "USA", "payouts": []}')
+    assert imported.json()["imported"] == 1
+    assert async_client.get("/api/campaigns/export").text.count("\n") == 1
+    assert async_client.get("/api/campaigns/routing/USA").json() == {"country": "USA", "offers": []}
@@ -0,0 +1,86 @@
+from auth.passwords import hash_password, hash_rounds, password_hasher
+from models.models import User
+
+CREDENTIALS = {"email": "user@example.com", "password": "s3cret-pass"}
+
+
+def test_register_and_login(client, db):
+    registered = client.post("/auth/register", json=CREDENTIALS)
+    assert registered.status_code == 200
+    assert registered.json()["token_type"] == "bearer"
+
+    user = db.query(User).filter(User.email == CREDENTIALS["email"]).one()
+    assert user.hashed_password.startswith("$2b$04$")
+    assert user.check_password(CREDENTIALS["password"])
+
+    login = client.post("/auth/token", json=CREDENTIALS)
+    assert login.status_code == 200
+    assert login.json()["access_token"]
+
+
+def test_login_rejects_bad_credentials(client):
+    client.post("/auth/register", json=CREDENTIALS)
+
+    wrong = client.post("/auth/token", json={**CREDENTIALS, "password": "nope"})
+    unknown = client.post("/auth/token", json={**CREDENTIALS, "email": "other@example.com"})
+    assert wrong.status_code == unknown.status_code == 400
+
+
+def test_login_rehashes_when_work_factor_changes(client, db):
+    db.add(User(email=CREDENTIALS["email"], hashed_password=hash_password(CREDENTIALS["password"], 5)))
+    db.commit()
+
+    assert client.post("/auth/token", json=CREDENTIALS).status_code == 200
+
+    db.expire_all()
+    user = db.query(User).filter(User.email == CREDENTIALS["email"]).one()
+    assert hash_rounds(user.hashed_password) == password_hasher.rounds
+    assert user.check_password(CREDENTIALS["password"])
+
+
+def test_full_hashing_queue_returns_503(client, monkeypatch):
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+
+    response = client.post("/auth/register", json=CREDENTIALS)
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert client.get("/auth/hashing").json()["rejected"] >= 1
+
+
+def bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_current_user_uses_token_and_user_caches(client):
+    token = client.post("/auth/register", json=CREDENTIALS).json()["access_token"]
+    before = client.get("/auth/cache").json()
+
+    first = client.get("/auth/me", headers=bearer(token))
+    second = client.get("/auth/me", headers=bearer(token))
+
+    assert first.status_code == second.status_code == 200
+    assert second.json()["email"] == CREDENTIALS["email"]
+    after = client.get("/auth/cache").json()
+    assert after["tokens"]["hits"] - before["tokens"]["hits"] == 1
+    assert after["users"]["hits"] - before["users"]["hits"] == 1
+
+
+def test_invalid_and_expired_tokens_are_rejected(client, monkeypatch):
+    import auth.jwt_handler as jwt_handler
+
+    assert client.get("/auth/me", headers=bearer("garbage")).status_code == 401
+
+    monkeypatch.setattr(jwt_handler, "ACCESS_TOKEN_EXPIRE_MINUTES", -1)
+    expired = jwt_handler.create_access_token({"sub": CREDENTIALS["email"]})
+    assert client.get("/auth/me", headers=bearer(expired)).status_code == 401
+
+
+def test_user_cache_is_invalidated_on_registration(client):
+    from auth.jwt_handler import create_access_token
+
+    token = create_access_token({"sub": CREDENTIALS["email"]})
+    assert client.get("/auth/me", headers=bearer(token)).status_code == 401
+
+    client.post("/auth/register", json=CREDENTIALS)
+    assert client.get("/auth/me", headers=bearer(token)).status_code == 200
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+from models.models import Campaign, User
+from tests.conftest import count_queries, new_campaign, seed_campaigns
+
+
+def set_state(client, **body):
+    return client.patch("/api/campaigns/state", json=body)
+
+
+def test_stop_by_country_is_one_update(client, db):
+    seed_campaigns(db, 10)  # even indexes are running, all in AFG
+    db.add(Campaign(title="Other", landing_url="https://other.example", is_running=True, country="USA"))
+    db.commit()
+    stale = datetime.utcnow() - timedelta(days=1)
+    db.query(Campaign).update({Campaign.updated_at: stale})
+    db.commit()
+
+    with count_queries() as statements:
+        response = set_state(client, is_running=False, country="AFG")
+    assert response.status_code == 200
+    assert response.json() == {"updated": 5}
+    assert len([s for s in statements if s.startswith("UPDATE campaigns")]) == 1
+
+    db.expire_all()
+    campaigns = db.query(Campaign).order_by(Campaign.id).all()
+    assert [c.is_running for c in campaigns] == [False] * 10 + [True]
+    # Only the rows that changed move updated_at and version
+    assert [c.updated_at > stale for c in campaigns] == [i % 2 == 0 for i in range(10)] + [False]
+    assert [c.version for c in campaigns] == [2 if i % 2 == 0 else 1 for i in range(10)] + [1]
+
+
+def test_select_by_ids_title_and_owner(client, db):
+    seed_campaigns(db, 6)  # ids 1, 3, 5 are running
+    owner = User(email="ops@example.com")
+    db.add(owner)
+    db.commit()
+    db.query(Campaign).filter(Campaign.id.in_([2, 4])).update({Campaign.owner_id: owner.id})
+    db.commit()
+
+    assert set_state(client, is_running=True, ids=[1, 2, 3]).json() == {"updated": 1}
+    assert set_state(client, is_running=True, owner_id=owner.id).json() == {"updated": 1}
+    assert set_state(client, is_running=False, title="Campaign 5").json() == {"updated": 0}
+    assert set_state(client, is_running=True, title="Campaign 5", ids=[1]).json() == {"updated": 0}
+    assert set_state(client, is_running=True, title="Campaign 5").json() == {"updated": 1}
+
+    db.expire_all()
+    assert [c.is_running for c in db.query(Campaign).order_by(Campaign.id)] == [True] * 6
+
+
+def test_bulk_state_needs_a_selector(client):
+    response = set_state(client, is_running=False)
+    assert response.status_code == 400
+
+
+def test_bulk_state_changes_list_etag(client):
+    client.post("/api/campaigns/", json=new_campaign(is_running=True))
+    etag = client.get("/api/campaigns/").headers["etag"]
+    assert set_state(client, is_running=False, country="USA").json() == {"updated": 1}
+    assert client.get("/api/campaigns/", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_async_bulk_state(async_client):
+    async_client.post("/api/campaigns/", json=new_campaign())
+    response = async_client.patch("/api/campaigns/state", json={"is_running": True, "country": "USA"})
+    assert response.json() == {"updated": 1}
+    assert async_client.get("/api/campaigns/").json()[0]["is_running"] is True
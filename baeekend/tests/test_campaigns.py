@@ -0,0 +1,127 @@
+from models.models import Campaign
+from tests.conftest import count_queries, seed_campaigns
+
+
+def test_list_campaigns_query_count_is_constant(client, db):
+    seed_campaigns(db, 50)
+
+    counts = {}
+    for limit in (1, 10, 50):
+        with count_queries() as statements:
+            response = client.get("/api/campaigns/", params={"limit": limit})
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body) == limit
+        assert all(len(campaign["payouts"]) == 3 for campaign in body)
+        # The ETag version check is one primary-key lookup on top of the row loading
+        counts[limit] = len([statement for statement in statements if "collection_versions" not in statement])
+
+    assert counts[1] == counts[10] == counts[50]
+    assert counts[50] <= 2
+
+
+def test_get_campaign_loads_payouts_eagerly(db):
+    from service.service import campaign_service
+
+    seed_campaigns(db, 1, payouts_per_campaign=5)
+    campaign_id = db.query(Campaign.id).scalar()
+    db.expunge_all()
+
+    with count_queries() as statements:
+        campaign = campaign_service.get_campaign(db, campaign_id)
+        assert len(campaign.payouts) == 5
+    assert len(statements) == 2
+
+
+def crawl(client, **params):
+    seen, cursor, pages = [], None, 0
+    while True:
+        query = dict(params)
+        if cursor:
+            query["cursor"] = cursor
+        response = client.get("/api/campaigns/page", params=query)
+        assert response.status_code == 200
+        body = response.json()
+        seen.extend(campaign["id"] for campaign in body["items"])
+        pages += 1
+        cursor = body["next_cursor"]
+        if not cursor:
+            return seen, pages
+
+
+def test_cursor_pagination_walks_every_campaign_once(client, db):
+    seed_campaigns(db, 25, payouts_per_campaign=1)
+
+    for sort in ("id", "created_at"):
+        seen, pages = crawl(client, limit=10, sort=sort)
+        assert len(seen) == 25
+        assert len(set(seen)) == 25
+        assert pages == 3
+
+
+def test_cursor_pagination_respects_filters(client, db):
+    seed_campaigns(db, 25, payouts_per_campaign=1)
+
+    seen, _ = crawl(client, limit=4, is_running=True)
+    expected = [c.id for c in db.query(Campaign).filter(Campaign.is_running.is_(True)).order_by(Campaign.id)]
+    assert seen == expected
+
+
+def test_cursor_is_stable_under_inserts(client, db):
+    seed_campaigns(db, 10, payouts_per_campaign=1)
+
+    first = client.get("/api/campaigns/page", params={"limit": 5}).json()
+    seed_campaigns(db, 3, payouts_per_campaign=1)
+    second = client.get(
+        "/api/campaigns/page", params={"limit": 5, "cursor": first["next_cursor"]}
+    ).json()
+
+    assert [c["id"] for c in second["items"]] == [6, 7, 8, 9, 10]
+
+
+def test_invalid_cursor_is_rejected(client, db):
+    seed_campaigns(db, 3, payouts_per_campaign=1)
+
+    response = client.get("/api/campaigns/page", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+    cursor = client.get("/api/campaigns/page", params={"limit": 1}).json()["next_cursor"]
+    response = client.get("/api/campaigns/page", params={"cursor": cursor, "sort": "created_at"})
+    assert response.status_code == 400
+
+
+def test_create_campaign_accepts_any_registered_country(client):
+    response = client.post("/api/campaigns/", json={
+        "title": "Multi-country",
+        "landing_url": "https://example.com",
+        "country": "USA",
+        "payouts": [
+            {"country": "USA", "amount": 10.0},
+            {"country": "GBR", "amount": 8.5},
+            {"country": "DEU", "amount": 9.0},
+        ],
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body["country"] == "USA"
+    assert sorted(p["country"] for p in body["payouts"]) == ["DEU", "GBR", "USA"]
+
+
+def test_create_campaign_rejects_unknown_country(client):
+    response = client.post("/api/campaigns/", json={
+        "title": "Bad",
+        "landing_url": "https://example.com",
+        "country": "USA",
+        "payouts": [{"country": "XXX", "amount": 10.0}],
+    })
+    assert response.status_code == 422
+
+
+def test_country_registry():
+    from database.database import COUNTRY_CODES, Country, get_country_currency, get_country_details
+
+    assert "-" not in COUNTRY_CODES
+    assert {country.value for country in Country} == COUNTRY_CODES
+    assert get_country_details("GBR")["COUNTRY"] == "UNITED KINGDOM"
+    assert get_country_currency("JPN") == "JPY"
+    assert get_country_details("XXX") is None
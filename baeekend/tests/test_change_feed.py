@@ -0,0 +1,195 @@
+import asyncio
+import json
+from contextlib import aclosing
+from datetime import datetime, timedelta
+
+from schemas.schema import CampaignUpdate
+from service.outbox import CAMPAIGN_CREATED, change_feed, outbox
+from service.service import campaign_service
+from tests.conftest import count_queries, create_campaign, new_campaign
+
+
+def parse(body):
+    """(id, event, data) for every event in an SSE body, comments and retry skipped"""
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n") if not line.startswith((":", "retry")))
+        if fields:
+            events.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def backlog(client, after=0, **kwargs):
+    response = client.get("/api/events", params={"after": after, "follow": False}, **kwargs)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    return parse(response.text)
+
+
+def test_writes_append_events(client, db):
+    campaign = create_campaign(client, title="Feed", is_running=True)
+    campaign_id = campaign["id"]
+    usa = next(p for p in campaign["payouts"] if p["country"] == "USA")
+    client.patch(f"/api/campaigns/{campaign_id}/toggle")
+    client.post(f"/api/campaigns/{campaign_id}/payouts", json={"country": "DEU", "amount": 3.0})
+    client.put(f"/api/campaigns/payouts/{usa['id']}", json={"country": "USA", "amount": 12.0})
+    client.delete(f"/api/campaigns/payouts/{usa['id']}")
+    client.put(f"/api/campaigns/{campaign_id}/payouts", json=[{"country": "FRA", "amount": 1.0}])
+    campaign_service.update_campaign(db, campaign_id, CampaignUpdate(title="Renamed"))
+    client.patch("/api/campaigns/state", json={"ids": [campaign_id], "is_running": True})
+    client.delete(f"/api/campaigns/{campaign_id}")
+
+    events = backlog(client)
+    assert [event_type for _, event_type, _ in events] == [
+        "campaign.created",
+        "campaign.updated",
+        "payout.created",
+        "payout.updated",
+        "payout.deleted",
+        "payouts.replaced",
+        "campaign.updated",
+        "campaign.updated",
+        "campaign.deleted",
+    ]
+    assert [event_id for event_id, _, _ in events] == list(range(1, 10))
+    created, toggled = events[0][2], events[1][2]
+    assert created["title"] == "Feed"
+    assert sorted((p["country"], p["amount"]) for p in created["payouts"]) == [("GBR", 5.0), ("USA", 10.0)]
+    assert toggled["is_running"] is False
+    assert events[3][2] == {"id": usa["id"], "campaign_id": campaign_id, "country": "USA", "amount": 12.0}
+    assert [p["country"] for p in events[5][2]["payouts"]] == ["FRA"]
+    assert events[6][2]["title"] == "Renamed"
+    assert events[7][2]["is_running"] is True
+    assert events[8][2] == {"id": campaign_id}
+
+
+def test_import_records_one_event_per_campaign(client):
+    body = "\n".join(json.dumps(new_campaign(title=f"Imported {i}")) for i in range(3))
+    assert client.post("/api/campaigns/import", content=body).json()["imported"] == 3
+
+    events = backlog(client)
+    assert [(event_type, data["title"]) for _, event_type, data in events] == [
+        (CAMPAIGN_CREATED, f"Imported {i}") for i in range(3)
+    ]
+    for _, _, data in events:
+        assert all(payout["campaign_id"] == data["id"] and payout["id"] for payout in data["payouts"])
+
+
+def test_events_are_recorded_after_the_version_bump(client, db):
+    """Event ids are taken under the collection_versions row lock, so they commit in id order"""
+    with count_queries() as statements:
+        campaign = create_campaign(client, title="Feed", is_running=True)
+        payout = campaign["payouts"][0]
+        client.patch(f"/api/campaigns/{campaign['id']}/toggle")
+        campaign_service.update_campaign(db, campaign["id"], CampaignUpdate(title="Renamed"))
+        client.put(f"/api/campaigns/payouts/{payout['id']}", json={"country": "ITA", "amount": 3.0})
+        client.post(f"/api/campaigns/{campaign['id']}/payouts", json={"country": "DEU", "amount": 1.0})
+        client.delete(f"/api/campaigns/payouts/{payout['id']}")
+        client.put(f"/api/campaigns/{campaign['id']}/payouts", json=[{"country": "FRA", "amount": 2.0}])
+        client.patch("/api/campaigns/state", json={"is_running": True, "ids": [campaign["id"]]})
+        client.post("/api/campaigns/import", content=json.dumps(new_campaign()))
+        client.delete(f"/api/campaigns/{campaign['id']}")
+
+    writes = [
+        "bump" if statement.startswith("UPDATE collection_versions") else "record"
+        for statement in statements
+        if statement.startswith(("UPDATE collection_versions", "INSERT INTO change_events"))
+    ]
+    assert writes == ["bump", "record"] * 10
+
+
+def test_resume_after_offset_and_last_event_id(client):
+    for i in range(3):
+        create_campaign(client, title=f"Feed {i}")
+
+    assert [event_id for event_id, _, _ in backlog(client, after=1)] == [2, 3]
+    # Last-Event-ID wins over `after`, as sent by a reconnecting EventSource
+    resumed = backlog(client, after=0, headers={"Last-Event-ID": "2"})
+    assert [(event_id, data["title"]) for event_id, _, data in resumed] == [(3, "Feed 2")]
+
+    response = client.get("/api/events", headers={"Last-Event-ID": "nope"})
+    assert response.status_code == 400
+
+
+def test_reset_after_prune(client, db):
+    create_campaign(client)
+    create_campaign(client)
+    assert outbox.prune(db, datetime.utcnow() + timedelta(seconds=1)) == 2
+    assert client.get("/api/events/offset").json() == {"offset": 2, "pruned_through": 2}
+
+    create_campaign(client, title="After prune")
+    events = backlog(client, after=1)
+    assert events[0] == (3, "reset", {"offset": 3})
+    assert backlog(client, after=2)[0][2]["title"] == "After prune"
+
+
+def test_rollback_records_nothing(db):
+    outbox.record(db, [(CAMPAIGN_CREATED, 1, {"id": 1})])
+    db.rollback()
+    assert outbox.read(db, 0) == []
+    assert outbox.latest_offset(db) == 0
+
+
+def test_async_writes_append_events(async_client, client):
+    async_client.post("/api/campaigns/", json=new_campaign())
+    assert [event_type for _, event_type, _ in backlog(client)] == [CAMPAIGN_CREATED]
+
+
+def create_in_thread(title):
+    from database.database import SessionLocal
+    from schemas.schema import CampaignCreate
+
+    with SessionLocal() as db:
+        campaign_service.create_campaign(db, CampaignCreate(**new_campaign(title=title)))
+
+
+async def collect(count, after=0):
+    rows = []
+    async with aclosing(change_feed.events(after, heartbeat=5)) as events:
+        async for row in events:
+            if row is not None:
+                rows.append(row)
+            if len(rows) == count:
+                return rows
+
+
+async def wait_for_subscribers(count):
+    while len(change_feed.subscriptions) < count:
+        await asyncio.sleep(0.01)
+
+
+def test_live_events_fan_out_from_one_tail():
+    async def run():
+        readers = [asyncio.create_task(collect(3)) for _ in range(5)]
+        await wait_for_subscribers(5)
+        tail = change_feed._task
+        for i in range(3):
+            await asyncio.to_thread(create_in_thread, f"Live {i}")
+        results = await asyncio.wait_for(asyncio.gather(*readers), 10)
+        assert change_feed._task is tail
+        return results
+
+    results = asyncio.run(run())
+    titles = [[json.loads(payload)["title"] for _, _, payload in rows] for rows in results]
+    assert titles == [["Live 0", "Live 1", "Live 2"]] * 5
+    assert not change_feed.subscriptions
+
+
+def test_slow_subscriber_is_disconnected(monkeypatch):
+    monkeypatch.setattr(change_feed, "buffer_size", 2)
+
+    async def run():
+        reader = asyncio.create_task(collect(3))
+        await wait_for_subscribers(1)
+        # Subscribed but never read from
+        stalled = change_feed.subscribe()
+        for i in range(3):
+            await asyncio.to_thread(create_in_thread, f"Live {i}")
+        rows = await asyncio.wait_for(reader, 10)
+        return stalled, rows
+
+    stalled, rows = asyncio.run(run())
+    assert [event_id for event_id, _, _ in rows] == [1, 2, 3]
+    assert stalled.closed
+    assert stalled not in change_feed.subscriptions
+    assert change_feed.disconnected_slow == 1
@@ -0,0 +1,134 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+import service.currency as currency
+from service.currency import RateTable, currency_service
+from tests.conftest import count_queries, create_campaign
+
+
+@pytest.fixture
+def rates_file(tmp_path, monkeypatch):
+    path = tmp_path / "rates.json"
+
+    def write(rates, version="1"):
+        path.write_text(json.dumps({"base": "USD", "version": version, "rates": rates}))
+        # Force a distinct mtime even on coarse filesystem clocks
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000 * len(version)))
+
+    write({"USD": 1.0, "EUR": 0.5, "DEM": 1.0, "GBP": 0.8})
+    monkeypatch.setattr(currency, "EXCHANGE_RATES_FILE", str(path))
+    monkeypatch.setattr(currency, "_rate_table", None)
+    return write
+
+
+def test_rate_table_converts_batches():
+    table = RateTable("USD", {"USD": 1.0, "DEM": 2.0, "IDR": 10000.0}, "v1")
+    converted = table.normalize(["USA", "DEU", "TMP", "AGO"], [10.0, 10.0, 50000.0, 1.0])
+    # TMP lists 'TPE / IDR' and falls back to IDR; AGO's currency has no rate
+    assert converted[:3].tolist() == [10.0, 5.0, 5.0]
+    assert np.isnan(converted[3])
+    assert table.country_currency["TMP"] == "IDR"
+
+
+def test_shipped_rates_cover_most_countries():
+    table = RateTable.from_file(currency.EXCHANGE_RATES_FILE)
+    assert table.base == "USD"
+    assert np.count_nonzero(np.isnan(table.country_rates)) < 20
+
+
+def test_normalized_payouts_are_cached_per_version(client, rates_file):
+    campaign = create_campaign(client, [("USA", 10.0), ("DEU", 4.0)])
+    url = f"/api/campaigns/{campaign['id']}/payouts/normalized"
+
+    body = client.get(url).json()
+    assert body["base"] == "USD"
+    assert {p["country"]: (p["currency"], p["amount_base"]) for p in body["payouts"]} == {
+        "USA": ("USD", 10.0), "DEU": ("DEM", 4.0)
+    }
+
+    with count_queries() as statements:
+        assert client.get(url).json() == body
+    # Only the campaign version lookup
+    assert len(statements) == 1
+
+    usa = next(p for p in campaign["payouts"] if p["country"] == "USA")
+    client.put(f"/api/campaigns/payouts/{usa['id']}", json={"country": "USA", "amount": 20.0})
+    assert {p["country"]: p["amount_base"] for p in client.get(url).json()["payouts"]}["USA"] == 20.0
+
+    rates_file({"USD": 1.0, "DEM": 2.0}, version="2")
+    refreshed = client.get(url).json()
+    assert refreshed["rates_version"] != body["rates_version"]
+    assert {p["country"]: p["amount_base"] for p in refreshed["payouts"]}["DEU"] == 2.0
+
+    assert client.get("/api/campaigns/999/payouts/normalized").status_code == 404
+
+
+def test_campaigns_sorted_and_filtered_by_best_payout(client, rates_file):
+    low = create_campaign(client, [("USA", 3.0), ("DEU", 2.0)])           # best 3.0
+    high = create_campaign(client, [("GBR", 8.0)], is_running=True)        # best 10.0
+    middle = create_campaign(client, [("DEU", 6.0), ("USA", 1.0)])         # best 6.0
+    create_campaign(client, [("AGO", 100.0)])                              # no rate, left out
+
+    def ids(**params):
+        body = client.get("/api/campaigns/by-payout", params=params).json()
+        return [(item["campaign"]["id"], item["best_payout_base"]) for item in body["items"]], body["total"]
+
+    assert ids() == ([(high["id"], 10.0), (middle["id"], 6.0), (low["id"], 3.0)], 3)
+    assert ids(order="asc", limit=2) == ([(low["id"], 3.0), (middle["id"], 6.0)], 3)
+    assert ids(min_payout=4, max_payout=8) == ([(middle["id"], 6.0)], 1)
+    assert ids(is_running=True) == ([(high["id"], 10.0)], 1)
+    assert ids(skip=1, limit=1) == ([(middle["id"], 6.0)], 3)
+
+    # Writes retire the index
+    client.put(f"/api/campaigns/{low['id']}/payouts", json=[{"country": "USA", "amount": 50.0}])
+    assert ids(limit=1) == ([(low["id"], 50.0)], 3)
+
+
+def test_index_build_spans_batches(client, db, rates_file, monkeypatch):
+    monkeypatch.setattr(currency, "NORMALIZE_BATCH_SIZE", 2)
+    expected = [create_campaign(client, [("USA", float(i)), ("DEU", float(i))])["id"] for i in range(1, 6)]
+
+    _, index = currency_service.get_index()
+    assert index.campaign_ids.tolist() == expected[::-1]
+    assert index.best.tolist() == [5.0, 4.0, 3.0, 2.0, 1.0]
+
+
+def test_writes_update_the_index_in_place(client, rates_file, monkeypatch):
+    first = create_campaign(client, [("USA", 3.0)])
+    second = create_campaign(client, [("DEU", 4.0)])
+    _, index = currency_service.get_index()
+    assert index.campaign_ids.tolist() == [second["id"], first["id"]]
+
+    def no_full_build(*args):
+        raise AssertionError("full build")
+
+    monkeypatch.setattr(currency.NormalizedPayoutIndex, "build", no_full_build)
+    third = create_campaign(client, [("GBR", 2.0)], is_running=True)
+    client.put(f"/api/campaigns/{first['id']}/payouts", json=[{"country": "USA", "amount": 1.0}])
+    client.patch(f"/api/campaigns/{second['id']}/toggle")
+    _, updated = currency_service.get_index()
+    assert updated.campaign_ids.tolist() == [second["id"], third["id"], first["id"]]
+    assert updated.best.tolist() == [4.0, 2.5, 1.0]
+    assert updated.is_running.tolist() == [True, True, False]
+    # The previous index is left as it was for lookups still holding it
+    assert index.best.tolist() == [4.0, 3.0]
+
+    client.delete(f"/api/campaigns/{third['id']}")
+    assert currency_service.get_index()[1].campaign_ids.tolist() == [second["id"], first["id"]]
+
+
+def test_new_rates_rebuild_in_the_background(client, rates_file):
+    campaign = create_campaign(client, [("DEU", 4.0)])
+    rates, _ = currency_service.get_index()
+
+    rates_file({"USD": 1.0, "DEM": 2.0}, version="2")
+    currency_service.get_index()
+    assert currency.normalized_index.wait(10)
+    refreshed, rebuilt = currency_service.get_index()
+    assert refreshed.version != rates.version
+    assert rebuilt.campaign_ids.tolist() == [campaign["id"]]
+    assert rebuilt.best.tolist() == [2.0]
@@ -0,0 +1,50 @@
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool, SingletonThreadPool
+
+from database.database import SQLITE_PRAGMAS, create_db_engine, engine, engine_options
+
+
+def pragma(connection, name):
+    return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_sqlite_connections_get_pragma_profile():
+    with engine.connect() as connection:
+        assert pragma(connection, "journal_mode") == "wal"
+        assert pragma(connection, "synchronous") == 1  # NORMAL
+        assert pragma(connection, "busy_timeout") == SQLITE_PRAGMAS["busy_timeout"]
+        assert pragma(connection, "cache_size") == SQLITE_PRAGMAS["cache_size"]
+
+
+def test_async_engine_gets_pragma_profile():
+    import asyncio
+
+    from database.async_database import async_engine
+
+    async def read_pragmas():
+        async with async_engine.connect() as connection:
+            result = (
+                (await connection.execute(text("PRAGMA journal_mode"))).scalar(),
+                (await connection.execute(text("PRAGMA synchronous"))).scalar(),
+            )
+        await async_engine.dispose()
+        return result
+
+    assert asyncio.run(read_pragmas()) == ("wal", 1)
+
+
+def test_engine_pool_profile(tmp_path):
+    file_engine = create_db_engine(f"sqlite:///{tmp_path / 'pool.db'}", pool_size=3)
+    assert isinstance(file_engine.pool, QueuePool)
+    assert file_engine.pool.size() == 3
+    assert file_engine.pool._pre_ping is True
+
+    memory_engine = create_db_engine("sqlite://")
+    assert isinstance(memory_engine.pool, SingletonThreadPool)
+    assert engine_options("sqlite:///:memory:") == {}
+
+
+def test_pragmas_can_be_disabled(tmp_path):
+    plain = create_db_engine(f"sqlite:///{tmp_path / 'plain.db'}", sqlite_pragmas=False)
+    with plain.connect() as connection:
+        assert pragma(connection, "journal_mode") == "delete"
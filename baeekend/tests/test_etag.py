@@ -0,0 +1,71 @@
+from models.models import Campaign
+from tests.conftest import count_queries, new_campaign, seed_campaigns
+
+
+def test_list_returns_304_without_loading_rows(client, db):
+    seed_campaigns(db, 5)
+
+    first = client.get("/api/campaigns/", params={"limit": 5})
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+
+    with count_queries() as statements:
+        cached = client.get("/api/campaigns/", params={"limit": 5}, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+    assert len(statements) == 1
+    assert "campaigns " not in statements[0] and "payouts" not in statements[0]
+
+    # Other parameters validate separately
+    other = client.get("/api/campaigns/", params={"limit": 2})
+    assert other.headers["etag"] != etag
+    assert client.get("/api/campaigns/page", params={"limit": 5}).headers["etag"] != etag
+
+
+def test_every_write_changes_the_list_etag(client):
+    campaign = client.post("/api/campaigns/", json=new_campaign()).json()
+    payout = campaign["payouts"][0]
+    payout_id = payout["id"]
+
+    seen = {client.get("/api/campaigns/").headers["etag"]}
+    writes = [
+        lambda: client.patch(f"/api/campaigns/{campaign['id']}/toggle"),
+        lambda: client.post(f"/api/campaigns/{campaign['id']}/payouts", json={"country": "DEU", "amount": 1.0}),
+        lambda: client.put(f"/api/campaigns/payouts/{payout_id}", json={"country": payout["country"], "amount": 99.0}),
+        lambda: client.delete(f"/api/campaigns/payouts/{payout_id}"),
+        lambda: client.delete(f"/api/campaigns/{campaign['id']}"),
+    ]
+    for write in writes:
+        previous = client.get("/api/campaigns/").headers["etag"]
+        assert write().status_code == 200
+        response = client.get("/api/campaigns/", headers={"If-None-Match": previous})
+        assert response.status_code == 200
+        assert response.headers["etag"] not in seen
+        seen.add(response.headers["etag"])
+
+
+def test_payout_etag_follows_its_campaign_only(client, db):
+    first = client.post("/api/campaigns/", json=new_campaign()).json()
+    second = client.post("/api/campaigns/", json=new_campaign(title="Other")).json()
+
+    first_etag = client.get(f"/api/campaigns/{first['id']}/payouts").headers["etag"]
+    second_etag = client.get(f"/api/campaigns/{second['id']}/payouts").headers["etag"]
+
+    client.post(f"/api/campaigns/{first['id']}/payouts", json={"country": "DEU", "amount": 1.0})
+
+    assert db.get(Campaign, first["id"]).version == 2
+    refreshed = client.get(f"/api/campaigns/{first['id']}/payouts", headers={"If-None-Match": first_etag})
+    assert refreshed.status_code == 200
+    assert len(refreshed.json()) == 3
+    unchanged = client.get(f"/api/campaigns/{second['id']}/payouts", headers={"If-None-Match": second_etag})
+    assert unchanged.status_code == 304
+
+
+def test_async_routes_send_etags(async_client):
+    async_client.post("/api/campaigns/", json=new_campaign())
+    etag = async_client.get("/api/campaigns/").headers["etag"]
+    assert async_client.get("/api/campaigns/", headers={"If-None-Match": etag}).status_code == 304
+    async_client.post("/api/campaigns/", json=new_campaign(title="Second"))
+    assert async_client.get("/api/campaigns/", headers={"If-None-Match": etag}).status_code == 200
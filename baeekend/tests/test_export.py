@@ -0,0 +1,36 @@
+import csv
+import io
+import json
+
+from tests.conftest import seed_campaigns
+
+
+def test_export_ndjson_streams_every_campaign(client, db, monkeypatch):
+    import service.service
+
+    monkeypatch.setattr(service.service, "EXPORT_BATCH_SIZE", 4)
+    seed_campaigns(db, 10, payouts_per_campaign=2)
+
+    response = client.get("/api/campaigns/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [c["id"] for c in lines] == list(range(1, 11))
+    assert all(len(c["payouts"]) == 2 for c in lines)
+    assert lines[0]["country"] == "AFG"
+    # Same shape as the list endpoint
+    listed = client.get("/api/campaigns/", params={"limit": 1}).json()[0]
+    assert lines[0] == listed
+
+
+def test_export_csv_has_one_row_per_payout(client, db):
+    seed_campaigns(db, 3, payouts_per_campaign=2)
+
+    response = client.get("/api/campaigns/export", params={"format": "csv", "is_running": True})
+
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 4
+    assert {row["campaign_id"] for row in rows} == {"1", "3"}
+    assert rows[0]["payout_country"] == "ABW"
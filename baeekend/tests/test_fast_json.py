@@ -0,0 +1,91 @@
+from fastapi.encoders import jsonable_encoder
+
+from schemas.schema import Campaign as CampaignSchema, Payout as PayoutSchema
+from service.service import campaign_service, payout_service
+from tests.conftest import create_campaign
+
+
+def create(client, index, countries=("USA", "DEU", "GBR")):
+    return create_campaign(
+        client,
+        [(c, 1.5 + i) for i, c in enumerate(countries)],
+        title=f"Campaign {index}",
+        landing_url=f"https://example.com/{index}",
+        is_running=index % 2 == 0,
+        country="FRA",
+    )
+
+
+def by_payout_id(campaigns):
+    # The ORM path returns payouts in whatever order the IN query yields
+    for campaign in campaigns:
+        campaign["payouts"].sort(key=lambda payout: payout["id"])
+    return campaigns
+
+
+def test_rows_match_the_validated_schema(client, db):
+    for i in range(5):
+        create(client, i)
+    filters = {"title": "Campaign", "is_running": True}
+
+    expected = jsonable_encoder([CampaignSchema.model_validate(c) for c in campaign_service.get_campaigns(db, 1, 3)])
+    assert client.get("/api/campaigns/", params={"skip": 1, "limit": 3}).json() == by_payout_id(expected)
+    ranked = jsonable_encoder([CampaignSchema.model_validate(c) for c in campaign_service.get_campaigns(db, filters=filters)])
+    assert jsonable_encoder(campaign_service.get_campaign_rows(db, filters=filters)) == by_payout_id(ranked)
+
+    payouts = jsonable_encoder([PayoutSchema.model_validate(p) for p in payout_service.get_campaign_payouts(db, 1)])
+    assert client.get("/api/campaigns/1/payouts").json() == sorted(payouts, key=lambda payout: payout["id"])
+    assert client.get("/api/campaigns/999/payouts").json() == []
+
+
+def test_large_bodies_are_gzipped_when_accepted(client):
+    for i in range(20):
+        create(client, i)
+
+    response = client.get("/api/campaigns/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"]
+    assert len(response.json()) == 20
+
+    # httpx decodes transparently; Content-Length is the compressed size
+    assert int(response.headers["content-length"]) < len(response.content)
+
+    for accept in ("identity", "gzip;q=0"):
+        plain = client.get("/api/campaigns/", headers={"Accept-Encoding": accept})
+        assert "content-encoding" not in plain.headers
+        assert plain.json() == response.json()
+
+    small = client.get("/api/campaigns/", params={"limit": 1}, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+    # Revalidation still works on the fast path
+    cached = client.get("/api/campaigns/", headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+
+
+def test_gzipped_bodies_get_their_own_etag(client):
+    for i in range(20):
+        create(client, i)
+
+    gzipped = client.get("/api/campaigns/", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+    plain = client.get("/api/campaigns/", headers={"Accept-Encoding": "identity"}).headers["etag"]
+    assert gzipped != plain
+    assert gzipped == plain[:-1] + '-gzip"'
+
+    # Either tag revalidates, under either encoding, and the 304 says which it matched
+    for etag in (gzipped, plain, f"W/{gzipped}"):
+        for accept in ("gzip", "identity"):
+            cached = client.get("/api/campaigns/", headers={"If-None-Match": etag, "Accept-Encoding": accept})
+            assert cached.status_code == 304
+            assert cached.headers["etag"] == etag.removeprefix("W/")
+            assert cached.headers["vary"] == "Accept-Encoding"
+
+
+def test_async_routes_use_the_fast_path(async_client):
+    campaign = create(async_client, 0)
+    listed = async_client.get("/api/campaigns/")
+    assert listed.headers["etag"]
+    assert listed.json() == by_payout_id([campaign])
+    assert async_client.get(f"/api/campaigns/{campaign['id']}/payouts").json() == campaign["payouts"]
+
@@ -0,0 +1,63 @@
+import threading
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+import api.health as health
+from api.health import startup_state
+from main import app
+from manage import main as manage
+
+
+def test_healthz_needs_nothing(client):
+    assert client.get("/healthz").json() == {"status": "ok"}
+
+
+def test_readyz_waits_for_startup_and_warm_ups(client, monkeypatch):
+    # Outside the lifespan (plain TestClient) the app never started
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["checks"]["started"] is False
+
+    release = threading.Event()
+    startup_state.started = True
+    startup_state.warm_up("slow", lambda: release.wait(10))
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["warming"] == ["slow"]
+
+    release.set()
+    assert startup_state.wait(timeout=10)
+    assert client.get("/readyz").status_code == 200
+
+    def broken():
+        raise RuntimeError("boom")
+
+    # A failed warm-up is reported, but lookups rebuild lazily so it doesn't block
+    startup_state.warm_up("broken", broken)
+    assert startup_state.wait(timeout=10)
+    response = client.get("/readyz")
+    assert response.status_code == 200
+    assert response.json()["warm_up_errors"] == {"broken": "boom"}
+
+    monkeypatch.setattr(health, "engine", create_engine("sqlite:////nonexistent/dir/db.sqlite"))
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["checks"]["database"] is False
+
+
+def test_lifespan_marks_the_app_ready():
+    with TestClient(app) as client:
+        assert startup_state.wait(timeout=10)
+        assert client.get("/readyz").json()["status"] == "ready"
+    assert startup_state.started is False
+
+
+def test_migrate_command(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    manage(["migrate", "--url", url])
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        tables = {row[0] for row in connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type='table'")}
+    engine.dispose()
+    assert {"campaigns", "payouts", "alembic_version"} <= tables
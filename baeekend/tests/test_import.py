@@ -0,0 +1,64 @@
+import json
+
+from models.models import Campaign, Payout
+
+
+def ndjson(*rows):
+    return "\n".join(row if isinstance(row, str) else json.dumps(row) for row in rows)
+
+
+def campaign(title, payouts=(("USA", 10.0),), country="USA"):
+    return {
+        "title": title,
+        "landing_url": f"https://example.com/{title}",
+        "country": country,
+        "payouts": [{"country": c, "amount": a} for c, a in payouts],
+    }
+
+
+def test_import_inserts_campaigns_and_payouts(client, db):
+    body = ndjson(
+        campaign("a", payouts=[("USA", 10.0), ("GBR", 5.0)]),
+        campaign("b"),
+        campaign("c", payouts=[("DEU", 7.5)]),
+    )
+    response = client.post("/api/campaigns/import", content=body)
+
+    assert response.status_code == 200
+    assert response.json() == {"imported": 3, "failed": 0, "errors": []}
+    assert db.query(Campaign).count() == 3
+    assert db.query(Payout).count() == 4
+    a = db.query(Campaign).filter(Campaign.title == "a").one()
+    assert sorted(p.country.value for p in a.payouts) == ["GBR", "USA"]
+    assert a.created_at is not None
+
+
+def test_import_reports_bad_lines_without_aborting(client, db):
+    body = ndjson(
+        campaign("ok-1"),
+        "{not json",
+        campaign("bad-country", country="XXX"),
+        "",
+        campaign("dup", payouts=[("USA", 1.0), ("USA", 2.0)]),
+        campaign("ok-2"),
+    )
+    response = client.post("/api/campaigns/import", content=body)
+
+    result = response.json()
+    assert result["imported"] == 2
+    assert result["failed"] == 3
+    assert [e["line"] for e in result["errors"]] == [2, 3, 5]
+    assert "Duplicate payout country" in result["errors"][2]["error"]
+    assert sorted(c.title for c in db.query(Campaign)) == ["ok-1", "ok-2"]
+
+
+def test_import_spans_multiple_batches(client, db, monkeypatch):
+    import api.routes
+
+    monkeypatch.setattr(api.routes, "IMPORT_BATCH_SIZE", 7)
+    body = ndjson(*(campaign(f"c{i}") for i in range(30)))
+    response = client.post("/api/campaigns/import", content=body)
+
+    assert response.json()["imported"] == 30
+    assert db.query(Campaign).count() == 30
+    assert db.query(Payout).count() == 30
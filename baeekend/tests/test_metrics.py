@@ -0,0 +1,68 @@
+import re
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.metrics import MetricsMiddleware, MetricsRegistry, instrument_engine
+from database.async_database import async_engine
+from tests.conftest import new_campaign, seed_campaigns
+
+
+def metric_value(text, name, **labels):
+    label_text = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf"^{re.escape(name)}\{{{re.escape(label_text)}\}} (\S+)$", text, re.M)
+    assert match, f"{name}{{{label_text}}} not found"
+    return float(match.group(1))
+
+
+def debug_app(router, registry):
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(MetricsMiddleware, registry=registry, debug_headers=True)
+    return app
+
+
+def test_metrics_endpoint_reports_per_route_queries(client, db):
+    seed_campaigns(db, 5)
+    for _ in range(2):
+        assert client.get("/api/campaigns/").status_code == 200
+    client.get("/api/campaigns/does/not/exist")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+
+    route = {"method": "GET", "route": "/api/campaigns/"}
+    assert metric_value(text, "http_requests_total", **route, status="200") == 2
+    assert metric_value(text, "http_request_duration_seconds_count", **route) == 2
+    # Version check, campaigns page, payouts IN query
+    assert metric_value(text, "db_queries_per_request_sum", **route) == 6
+    assert metric_value(text, "db_queries_per_request_bucket", **route, le="3.0") == 2
+    assert metric_value(text, "db_time_seconds_sum", **route) > 0
+    assert metric_value(text, "http_requests_total", method="GET", route="<unmatched>", status="404") == 1
+
+
+def test_debug_headers_expose_query_count(db):
+    from api.routes import router
+
+    seed_campaigns(db, 20)
+    registry = MetricsRegistry()
+    client = TestClient(debug_app(router, registry))
+
+    response = client.get("/api/campaigns/", params={"limit": 20})
+    assert response.headers["x-db-query-count"] == "3"
+    assert float(response.headers["x-db-time-ms"]) > 0
+    assert "http_requests_total" in registry.render()
+
+
+def test_async_routes_are_counted():
+    from api.async_routes import router
+
+    instrument_engine(async_engine.sync_engine)
+    registry = MetricsRegistry()
+    with TestClient(debug_app(router, registry)) as client:
+        client.post("/api/campaigns/", json=new_campaign())
+        response = client.get("/api/campaigns/")
+        assert int(response.headers["x-db-query-count"]) == 3
+        client.portal.call(async_engine.dispose)
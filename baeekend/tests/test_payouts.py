@@ -0,0 +1,140 @@
+from schemas.schema import CampaignUpdate
+from service.cache import MISSING, PayoutCache
+from service.service import campaign_service
+from tests.conftest import count_queries, create_campaign
+
+
+def country_payout(client, campaign_id, country):
+    return client.get(f"/api/campaigns/{campaign_id}/payouts/country/{country}")
+
+
+def test_country_payout_is_served_from_cache(client):
+    campaign = create_campaign(client)
+    before = client.get("/api/campaigns/payouts/cache").json()
+
+    first = country_payout(client, campaign["id"], "USA")
+    second = country_payout(client, campaign["id"], "USA")
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert first.json()["amount"] == 10.0
+    after = client.get("/api/campaigns/payouts/cache").json()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+
+
+def test_missing_country_payout_is_404(client):
+    campaign = create_campaign(client)
+
+    assert country_payout(client, campaign["id"], "DEU").status_code == 404
+    assert country_payout(client, campaign["id"], "DEU").status_code == 404
+
+
+def test_payout_writes_invalidate_cache(client):
+    campaign = create_campaign(client)
+    campaign_id = campaign["id"]
+    usa = next(p for p in campaign["payouts"] if p["country"] == "USA")
+
+    assert country_payout(client, campaign_id, "DEU").status_code == 404
+    client.post(f"/api/campaigns/{campaign_id}/payouts", json={"country": "DEU", "amount": 3.0})
+    assert country_payout(client, campaign_id, "DEU").json()["amount"] == 3.0
+
+    assert country_payout(client, campaign_id, "USA").json()["amount"] == 10.0
+    client.put(f"/api/campaigns/payouts/{usa['id']}", json={"country": "FRA", "amount": 12.0})
+    assert country_payout(client, campaign_id, "USA").status_code == 404
+    assert country_payout(client, campaign_id, "FRA").json()["amount"] == 12.0
+
+    client.delete(f"/api/campaigns/payouts/{usa['id']}")
+    assert country_payout(client, campaign_id, "FRA").status_code == 404
+
+
+def test_campaign_writes_invalidate_cache(client, db):
+    campaign = create_campaign(client)
+    campaign_id = campaign["id"]
+    assert country_payout(client, campaign_id, "GBR").json()["amount"] == 5.0
+
+    campaign_service.update_campaign(
+        db, campaign_id, CampaignUpdate(payouts=[{"country": "GBR", "amount": 6.0}])
+    )
+    assert country_payout(client, campaign_id, "GBR").json()["amount"] == 6.0
+
+    client.delete(f"/api/campaigns/{campaign_id}")
+    assert country_payout(client, campaign_id, "GBR").status_code == 404
+
+
+def test_replace_payouts_writes_only_the_diff(client):
+    campaign = create_campaign(client, payouts=(("USA", 10.0), ("GBR", 5.0), ("DEU", 1.0)))
+    campaign_id = campaign["id"]
+    ids = {p["country"]: p["id"] for p in campaign["payouts"]}
+    assert country_payout(client, campaign_id, "GBR").json()["amount"] == 5.0
+
+    with count_queries() as statements:
+        response = client.put(f"/api/campaigns/{campaign_id}/payouts", json=[
+            {"country": "USA", "amount": 10.0},
+            {"country": "GBR", "amount": 7.5},
+            {"country": "FRA", "amount": 2.0},
+        ])
+    assert response.status_code == 200
+    payouts = {p["country"]: p for p in response.json()}
+    assert set(payouts) == {"USA", "GBR", "FRA"}
+    assert payouts["USA"]["id"] == ids["USA"]
+    assert payouts["GBR"]["id"] == ids["GBR"]
+    assert payouts["GBR"]["amount"] == 7.5
+    assert country_payout(client, campaign_id, "GBR").json()["amount"] == 7.5
+
+    payout_writes = [
+        statement.split()[0] for statement in statements
+        if statement.split()[0] in ("INSERT", "UPDATE", "DELETE") and "payouts" in statement.split("(")[0]
+    ]
+    assert sorted(payout_writes) == ["DELETE", "INSERT", "UPDATE"]
+
+
+def test_replace_payouts_enforces_rules(client):
+    campaign = create_campaign(client)
+    url = f"/api/campaigns/{campaign['id']}/payouts"
+
+    duplicate = client.put(url, json=[{"country": "USA", "amount": 1.0}, {"country": "USA", "amount": 2.0}])
+    assert duplicate.status_code == 400
+    assert "Duplicate" in duplicate.json()["detail"]
+    assert client.put(url, json=[]).status_code == 400
+    assert client.put("/api/campaigns/999/payouts", json=[{"country": "USA", "amount": 1.0}]).status_code == 404
+
+    stored = client.get(url).json()
+    assert sorted((p["country"], p["amount"]) for p in stored) == [("GBR", 5.0), ("USA", 10.0)]
+
+
+def test_update_campaign_keeps_unchanged_payout_ids(client, db):
+    campaign = create_campaign(client)
+    ids = {p["country"]: p["id"] for p in campaign["payouts"]}
+
+    updated = campaign_service.update_campaign(
+        db, campaign["id"], CampaignUpdate(payouts=[{"country": "USA", "amount": 10.0}, {"country": "FRA", "amount": 1.0}])
+    )
+    payouts = {p.country.value: p for p in updated.payouts}
+    assert set(payouts) == {"USA", "FRA"}
+    assert payouts["USA"].id == ids["USA"]
+
+
+def test_cache_evicts_least_recently_used_and_expires():
+    cache = PayoutCache(maxsize=2, ttl=60)
+    cache.set(1, "USA", "a", cache.generation)
+    cache.set(2, "USA", "b", cache.generation)
+    cache.get(1, "USA")
+    cache.set(3, "USA", "c", cache.generation)
+
+    assert cache.get(2, "USA") is MISSING
+    assert cache.get(1, "USA") == "a"
+    assert cache.stats()["evictions"] == 1
+
+    expired = PayoutCache(maxsize=2, ttl=-1)
+    expired.set(1, "USA", "a", expired.generation)
+    assert expired.get(1, "USA") is MISSING
+
+
+def test_stale_read_is_not_cached_after_invalidation():
+    cache = PayoutCache()
+    generation = cache.generation
+    cache.invalidate(1, "USA")
+    cache.set(1, "USA", "stale", generation)
+
+    assert cache.stats()["size"] == 0
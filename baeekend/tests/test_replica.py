@@ -0,0 +1,130 @@
+import os
+import tempfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+from database.replica import READ_AFTER_COOKIE, replica
+import service.currency as currency
+from main import app
+from manage import main as manage
+from schemas.schema import CampaignCreate
+from service.service import campaign_service
+from tests.conftest import new_campaign
+
+
+@pytest.fixture
+def replica_url():
+    """A second SQLite file standing in for the replica, synced on demand"""
+    directory = tempfile.mkdtemp(prefix="baeekend-replica-")
+    url = f"sqlite:///{os.path.join(directory, 'replica.db')}"
+    yield url
+    replica.configure(None)
+
+
+def sync(url):
+    manage(["sync-replica", "--url", url])
+    replica.configure(url)
+
+
+def titles(client, path="/api/campaigns/"):
+    response = client.get(path)
+    assert response.status_code == 200
+    return sorted(campaign["title"] for campaign in response.json())
+
+
+def test_reads_go_to_replica_and_writers_read_their_writes(client, db, replica_url):
+    client.post("/api/campaigns/", json=new_campaign(title="A"))
+    sync(replica_url)
+    # Written behind the replica's back, by someone with no cookie in play
+    campaign_service.create_campaign(db, CampaignCreate(**new_campaign(title="B")))
+
+    reader = TestClient(app)
+    assert titles(reader) == ["A"]
+    assert replica.counts["replica"] == 1
+
+    created = client.post("/api/campaigns/", json=new_campaign(title="C"))
+    assert created.cookies[READ_AFTER_COOKIE] == "3"
+    # The replica is at version 1, so the writer's reads go to the primary
+    assert titles(client) == ["A", "B", "C"]
+    assert replica.counts["lagging"] == 1
+    assert titles(reader) == ["A"]
+
+    sync(replica_url)
+    assert titles(client) == ["A", "B", "C"]
+    assert replica.counts["replica"] == 1
+
+
+def test_cookie_only_set_by_committed_writes(client):
+    created = client.post("/api/campaigns/", json=new_campaign())
+    assert READ_AFTER_COOKIE in created.headers["set-cookie"]
+
+    assert "set-cookie" not in client.get("/api/campaigns/").headers
+    failed = client.post("/api/campaigns/", json=new_campaign(country="XXX"))
+    assert failed.status_code == 422
+    assert "set-cookie" not in failed.headers
+    duplicate = client.post(
+        "/api/campaigns/",
+        json=new_campaign(payouts=[{"country": "USA", "amount": 1.0}, {"country": "USA", "amount": 2.0}]),
+    )
+    assert duplicate.status_code == 400
+    assert "set-cookie" not in duplicate.headers
+
+
+def test_unavailable_replica_falls_back_to_primary(client, replica_url):
+    client.post("/api/campaigns/", json=new_campaign(title="A"))
+    # An empty database: connects fine, but has no schema
+    replica.configure(replica_url)
+
+    assert titles(TestClient(app)) == ["A"]
+    assert replica.counts["replica"] == 0
+    # Marked down, so the next read doesn't even try it
+    assert titles(TestClient(app)) == ["A"]
+    assert replica.counts["down"] == 1
+
+
+def test_export_and_analytics_read_the_replica(client, db, replica_url):
+    client.post("/api/campaigns/", json=new_campaign(title="A"))
+    sync(replica_url)
+    campaign_service.create_campaign(db, CampaignCreate(**new_campaign(title="B")))
+
+    reader = TestClient(app)
+    exported = reader.get("/api/campaigns/export").text.strip().splitlines()
+    assert len(exported) == 1
+    stats = reader.get("/api/analytics/payouts", params={"country": "USA"}).json()
+    assert stats[0]["paused"]["count"] == 1
+
+
+def test_async_reads_go_to_replica(async_client, client, db, replica_url):
+    client.post("/api/campaigns/", json=new_campaign(title="A"))
+    sync(replica_url)
+    campaign_service.create_campaign(db, CampaignCreate(**new_campaign(title="B")))
+
+    assert titles(async_client) == ["A"]
+    async_client.cookies.set(READ_AFTER_COOKIE, "2")
+    assert titles(async_client) == ["A", "B"]
+    assert replica.counts["lagging"] == 1
+    async_client.portal.call(replica.dispose_async)
+
+
+def test_normalized_index_is_shared_by_replica_and_primary_readers(client, db, replica_url, monkeypatch):
+    client.post("/api/campaigns/", json=new_campaign(title="A"))
+    sync(replica_url)
+    client.post("/api/campaigns/", json=new_campaign(title="B"))
+    reader = TestClient(app)
+
+    def by_payout(http):
+        response = http.get("/api/campaigns/by-payout")
+        assert response.status_code == 200
+        return sorted(item["campaign"]["title"] for item in response.json()["items"])
+
+    assert by_payout(reader) == ["A"]
+    builds = []
+    build = currency.NormalizedPayoutIndex.build
+    monkeypatch.setattr(currency.NormalizedPayoutIndex, "build", lambda *args: builds.append(1) or build(*args))
+    # Readers alternate between the lagging replica and the primary
+    for _ in range(3):
+        assert by_payout(client) == ["A", "B"]
+        assert by_payout(reader) == ["A"]
+    assert replica.counts["lagging"] == 3
+    assert builds == []
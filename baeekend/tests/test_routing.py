@@ -0,0 +1,180 @@
+import threading
+
+import pytest
+
+import service.routing as routing
+from database.database import Country
+from models.models import Payout
+from schemas.schema import CampaignUpdate
+from service.indexing import CampaignIndex
+from service.outbox import PAYOUT_UPDATED, outbox
+from service.routing import offer_index
+from service.service import campaign_service
+from service.versions import bump_versions, get_collection_version
+from tests.conftest import count_queries, create_campaign
+
+
+def offers(client, country="USA", limit=10):
+    response = client.get(f"/api/campaigns/routing/{country}", params={"limit": limit})
+    assert response.status_code == 200
+    return [(offer["campaign_id"], offer["amount"]) for offer in response.json()["offers"]]
+
+
+def payout_id(campaign, country):
+    return next(p["id"] for p in campaign["payouts"] if p["country"] == country)
+
+
+def test_top_offers_for_running_campaigns(client):
+    low = create_campaign(client, [("USA", 1.0), ("DEU", 9.0)], is_running=True)
+    high = create_campaign(client, [("USA", 5.0)], is_running=True, landing_url="https://example.com/high")
+    tied = create_campaign(client, [("USA", 5.0)], is_running=True)
+    create_campaign(client, [("USA", 50.0)], is_running=False)
+
+    assert offers(client) == [(high["id"], 5.0), (tied["id"], 5.0), (low["id"], 1.0)]
+    assert offers(client, limit=1) == [(high["id"], 5.0)]
+    assert offers(client, "DEU") == [(low["id"], 9.0)]
+    assert offers(client, "FRA") == []
+    body = client.get("/api/campaigns/routing/USA", params={"limit": 1}).json()
+    assert body == {
+        "country": "USA",
+        "offers": [{"campaign_id": high["id"], "landing_url": "https://example.com/high", "amount": 5.0}],
+    }
+    assert client.get("/api/campaigns/routing/USA", params={"limit": 0}).status_code == 422
+    assert client.get("/api/campaigns/routing/XXX").status_code == 422
+
+
+def test_writes_update_the_index(client, db):
+    first = create_campaign(client, [("USA", 2.0), ("DEU", 1.0)], is_running=True)
+    second = create_campaign(client, [("USA", 3.0)], is_running=True)
+    assert offers(client) == [(second["id"], 3.0), (first["id"], 2.0)]
+
+    # Once built, every write path keeps it current without a rebuild
+    version = offer_index.version
+    client.patch(f"/api/campaigns/{second['id']}/toggle")
+    assert offers(client) == [(first["id"], 2.0)]
+    client.patch(f"/api/campaigns/{second['id']}/toggle")
+    assert offers(client) == [(second["id"], 3.0), (first["id"], 2.0)]
+
+    client.put(f"/api/campaigns/payouts/{payout_id(first, 'USA')}", json={"country": "USA", "amount": 4.0})
+    assert offers(client) == [(first["id"], 4.0), (second["id"], 3.0)]
+    client.put(f"/api/campaigns/payouts/{payout_id(first, 'DEU')}", json={"country": "FRA", "amount": 6.0})
+    assert offers(client, "DEU") == []
+    assert offers(client, "FRA") == [(first["id"], 6.0)]
+
+    added = client.post(f"/api/campaigns/{second['id']}/payouts", json={"country": "FRA", "amount": 7.0}).json()
+    assert offers(client, "FRA") == [(second["id"], 7.0), (first["id"], 6.0)]
+    client.delete(f"/api/campaigns/payouts/{added['id']}")
+    assert offers(client, "FRA") == [(first["id"], 6.0)]
+
+    client.put(f"/api/campaigns/{second['id']}/payouts", json=[{"country": "USA", "amount": 10.0}])
+    assert offers(client) == [(second["id"], 10.0), (first["id"], 4.0)]
+    campaign_service.update_campaign(db, first["id"], CampaignUpdate(landing_url="https://example.com/new"))
+    routed = client.get("/api/campaigns/routing/USA").json()["offers"]
+    assert routed[1]["landing_url"] == "https://example.com/new"
+
+    client.patch("/api/campaigns/state", json={"is_running": False, "ids": [first["id"]]})
+    assert offers(client) == [(second["id"], 10.0)]
+    client.delete(f"/api/campaigns/{second['id']}")
+    assert offers(client) == []
+
+    third = create_campaign(client, [("USA", 1.5)], is_running=True)
+    assert offers(client) == [(third["id"], 1.5)]
+    assert offer_index.version > version
+
+
+def test_lookups_skip_the_database_between_syncs(client, monkeypatch):
+    campaign = create_campaign(client, [("USA", 2.0)], is_running=True)
+    offers(client)
+    monkeypatch.setattr(routing, "ROUTING_SYNC_INTERVAL", 3600)
+    with count_queries() as statements:
+        assert offers(client) == [(campaign["id"], 2.0)]
+    assert statements == []
+
+
+def write_elsewhere(db, campaign_id, amount, record=True):
+    """A write that bypasses this process's services, e.g. from another worker"""
+    db.query(Payout).filter(Payout.campaign_id == campaign_id).update({"amount": amount})
+    if record:
+        outbox.record(db, [(PAYOUT_UPDATED, campaign_id, {"campaign_id": campaign_id})])
+    version = bump_versions(db, [campaign_id])
+    db.commit()
+    return version
+
+
+def test_writes_from_elsewhere_are_caught_up_from_the_outbox(client, db, monkeypatch):
+    campaign = create_campaign(client, [("USA", 2.0)], is_running=True)
+    other = create_campaign(client, [("USA", 1.0)], is_running=True)
+    assert offers(client) == [(campaign["id"], 2.0), (other["id"], 1.0)]
+
+    write_elsewhere(db, campaign["id"], 8.0)
+    monkeypatch.setattr(routing, "ROUTING_SYNC_INTERVAL", 3600)
+    assert offers(client)[0] == (campaign["id"], 2.0)
+
+    # Only the changed campaign is reloaded; no full rebuild
+    monkeypatch.setattr(offer_index, "build", None)
+    monkeypatch.setattr(routing, "ROUTING_SYNC_INTERVAL", 0)
+    with count_queries() as statements:
+        assert offers(client) == [(campaign["id"], 8.0), (other["id"], 1.0)]
+    reloads = [statement for statement in statements if "JOIN payouts" in statement]
+    assert len(reloads) == 1 and "campaigns.id IN" in reloads[0]
+    assert offer_index.version == get_collection_version(db)
+
+    # A local write whose version skips one it never saw fills the gap the same way
+    version = write_elsewhere(db, other["id"], 9.0)
+    client.put(f"/api/campaigns/payouts/{payout_id(campaign, 'USA')}", json={"country": "USA", "amount": 3.0})
+    assert offer_index.ready and offer_index.version == version - 1
+    assert offers(client) == [(other["id"], 9.0), (campaign["id"], 3.0)]
+    assert offer_index.version == version + 1
+
+
+def test_out_of_order_syncs_keep_the_index(client, db):
+    campaign = create_campaign(client, [("USA", 2.0)], is_running=True)
+    offers(client)
+    version = offer_index.version
+    offer_index.sync(db, [campaign["id"]], version + 2)
+    offer_index.sync(db, [campaign["id"]], version + 1)
+    assert offer_index.ready
+    assert offer_index.version == version + 1
+
+
+def test_rebuild_runs_in_the_background(client, db, monkeypatch):
+    campaign = create_campaign(client, [("USA", 2.0)], is_running=True)
+    assert offers(client) == [(campaign["id"], 2.0)]
+
+    # Without events to go on, the index is rebuilt, but lookups don't wait for it
+    write_elsewhere(db, campaign["id"], 8.0, record=False)
+    monkeypatch.setattr(routing, "ROUTING_SYNC_INTERVAL", 0)
+    loading = threading.Event()
+    running_payouts = offer_index._running_payouts
+
+    def slow_running_payouts():
+        loading.wait(10)
+        return running_payouts()
+
+    monkeypatch.setattr(offer_index, "_running_payouts", slow_running_payouts)
+    assert offers(client) == [(campaign["id"], 2.0)]
+    assert offers(client) == [(campaign["id"], 2.0)]
+    loading.set()
+    assert offer_index.wait(10)
+    assert offers(client) == [(campaign["id"], 8.0)]
+
+
+def test_index_is_built_at_startup(client, db):
+    create_campaign(client, [("USA", 2.0)], is_running=True)
+    offer_index.clear()
+    from fastapi.testclient import TestClient
+    from api.health import startup_state
+    from main import app
+    with TestClient(app):
+        assert startup_state.wait(timeout=10)
+        assert offer_index.ready
+    assert offer_index.top(db, Country.USA, 5)[0]["amount"] == 2.0
+
+
+def test_indexes_must_implement_every_hook():
+    class Partial(CampaignIndex):
+        def _load(self, db):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
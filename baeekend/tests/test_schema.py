@@ -0,0 +1,97 @@
+import os
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import and_, create_engine, text
+
+from database.database import Base, Country
+from models.models import CAMPAIGN_SEARCH_TABLE, Campaign, Payout
+from tests.conftest import query_plan
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_campaign_payouts_use_campaign_country_index(db):
+    plan = query_plan(db, db.query(Payout).filter(Payout.campaign_id == 1))
+    assert "USING INDEX uq_payouts_campaign_country" in plan
+
+    plan = query_plan(db, db.query(Payout).filter(Payout.campaign_id.in_([1, 2, 3])))
+    assert "uq_payouts_campaign_country" in plan
+
+
+def test_duplicate_payout_check_uses_campaign_country_index(db):
+    query = db.query(Payout).filter(
+        and_(Payout.campaign_id == 1, Payout.country == Country.USA, Payout.id != 5)
+    )
+    assert "USING INDEX uq_payouts_campaign_country (campaign_id=? AND country=?)" in query_plan(db, query)
+
+
+def test_filtered_listing_uses_campaign_indexes(db):
+    query = db.query(Campaign).filter(Campaign.is_running.is_(True)).order_by(Campaign.id).limit(100)
+    plan = query_plan(db, query)
+    assert "ix_campaigns_is_running_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+    query = db.query(Campaign).filter(Campaign.country == Country.USA).order_by(Campaign.id)
+    assert "ix_campaigns_country_id" in query_plan(db, query)
+
+    query = db.query(Campaign).filter(Campaign.owner_id == 1)
+    assert "ix_campaigns_owner_id" in query_plan(db, query)
+
+    query = db.query(Campaign).order_by(Campaign.created_at, Campaign.id).limit(10)
+    assert "ix_campaigns_created_at_id" in query_plan(db, query)
+
+
+def test_migrations_match_models(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    config = Config(os.path.join(REPO_ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(REPO_ROOT, "baeekend", "alembic"))
+    config.set_main_option("sqlalchemy.url", url)
+
+    command.upgrade(config, "head")
+
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        context = MigrationContext.configure(connection, opts={
+            "include_name": lambda name, type_, parents: not (
+                type_ == "table" and name.startswith(CAMPAIGN_SEARCH_TABLE)
+            ),
+        })
+        diff = compare_metadata(context, Base.metadata)
+    engine.dispose()
+    assert diff == []
+
+    command.downgrade(config, "base")
+
+
+def test_is_running_migration_backfills_nulls(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    config = Config(os.path.join(REPO_ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(REPO_ROOT, "baeekend", "alembic"))
+    config.set_main_option("sqlalchemy.url", url)
+    command.upgrade(config, "1f5f4f59e8de")
+
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        for campaign_id in (1, 2, 3):
+            connection.execute(text(
+                "INSERT INTO campaigns (id, title, landing_url, is_running, country, version) "
+                f"VALUES ({campaign_id}, 'Legacy {campaign_id}', 'https://example.com', NULL, 'USA', 1)"
+            ))
+        connection.execute(text("DELETE FROM campaigns WHERE id = 3"))
+    command.upgrade(config, "head")
+
+    with engine.begin() as connection:
+        assert connection.execute(text("SELECT id, is_running FROM campaigns ORDER BY id")).all() == [(1, 0), (2, 0)]
+        # Still AUTOINCREMENT, past the deleted id, and still searchable
+        connection.execute(text(
+            "INSERT INTO campaigns (title, landing_url, is_running, country, version) "
+            "VALUES ('Fresh', 'https://example.com', 0, 'USA', 1)"
+        ))
+        assert connection.scalar(text("SELECT max(id) FROM campaigns")) == 4
+        assert connection.scalar(text(
+            f"SELECT rowid FROM {CAMPAIGN_SEARCH_TABLE} WHERE {CAMPAIGN_SEARCH_TABLE} MATCH 'Fresh'"
+        )) == 4
+    engine.dispose()
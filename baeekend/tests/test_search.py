@@ -0,0 +1,81 @@
+from sqlalchemy import text
+
+from models.models import Campaign
+from service.search import apply_search
+from tests.conftest import seed_campaigns
+
+
+def add(db, title, landing_url="https://example.com"):
+    campaign = Campaign(title=title, landing_url=landing_url, country="USA")
+    db.add(campaign)
+    db.commit()
+    return campaign
+
+
+def titles(client, **params):
+    return [c["title"] for c in client.get("/api/campaigns/", params=params).json()]
+
+
+def test_title_search_is_case_insensitive_substring(client, db):
+    add(db, "Summer Shoes Sale")
+    add(db, "Winter boots")
+    add(db, "shoestring budget")
+
+    assert sorted(titles(client, title="SHOE")) == ["Summer Shoes Sale", "shoestring budget"]
+    assert titles(client, title="boots") == ["Winter boots"]
+    assert titles(client, title="nothing") == []
+
+
+def test_short_terms_fall_back_to_ilike(client, db):
+    add(db, "ab campaign")
+    add(db, "other")
+
+    assert titles(client, title="ab") == ["ab campaign"]
+
+
+def test_landing_url_and_combined_filters(client, db):
+    add(db, "Shoes", "https://shop.example.com/shoes")
+    add(db, "Shoes", "https://other.test/shoes")
+    add(db, "Boots", "https://shop.example.com/boots")
+
+    result = client.get("/api/campaigns/", params={"title": "shoes", "landing_url": "shop.example"}).json()
+    assert [c["landing_url"] for c in result] == ["https://shop.example.com/shoes"]
+
+    page = client.get("/api/campaigns/page", params={"landing_url": "shop.example"}).json()
+    assert [c["title"] for c in page["items"]] == ["Shoes", "Boots"]
+
+
+def test_index_follows_updates_and_deletes(client, db):
+    campaign = add(db, "Old title")
+    campaign.title = "Fresh title"
+    db.commit()
+    assert titles(client, title="old") == []
+    assert titles(client, title="fresh") == ["Fresh title"]
+
+    db.delete(campaign)
+    db.commit()
+    assert titles(client, title="fresh") == []
+
+
+def test_bulk_import_is_indexed(client):
+    body = '{"title": "Imported Thing", "landing_url": "https://x.test", "country": "USA", "payouts": []}'
+    client.post("/api/campaigns/import", content=body)
+
+    assert titles(client, title="imported") == ["Imported Thing"]
+
+
+def test_results_are_ranked(client, db):
+    add(db, "a long title that mentions a shoe only once among many other words")
+    add(db, "shoe shoe shoe")
+
+    assert titles(client, title="shoe")[0] == "shoe shoe shoe"
+
+
+def test_search_uses_fts_index(db):
+    seed_campaigns(db, 3, payouts_per_campaign=1)
+    query = apply_search(db.query(Campaign), {"title": "campaign"})
+    sql = str(query.statement.compile(db.bind, compile_kwargs={"literal_binds": True}))
+    plan = " | ".join(row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+    assert "VIRTUAL TABLE INDEX" in plan
+    assert query.count() == 3